@@ -0,0 +1,78 @@
+# file : my_n8n/bench/bench_get.py :: 0.0.1
+# per-call overhead of Base.get: precompiled statements vs the original per-call build
+#
+#   python -m bench.bench_get --calls 20000
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from rich import print
+
+from model.base import Base
+from connection.db_my_n8n import get_db_app
+
+
+def legacy_get(cls, id: int) -> Optional[Dict[str, Any]]:
+    """Base.get as it was before statements were precompiled (for comparison only)."""
+    instance = cls()
+    query = f"SELECT * FROM {instance.table_name} WHERE id = ?"
+    with get_db_app() as conn:
+        with conn:
+            cur = conn.cursor()
+            cur.execute(query, (id,))
+            result = cur.fetchone()
+    if result:
+        return {col.split()[0]: value for col, value in zip(cls.columns, result)}
+    return None
+
+
+def _time(fn: Callable[[int], Any], ids: list) -> float:
+    start = time.perf_counter()
+    for id in ids:
+        fn(id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Base.get per-call overhead")
+    parser.add_argument("--calls", type=int, default=20_000, help="get() calls per variant")
+    parser.add_argument("--rows", type=int, default=10_000, help="rows in the table")
+    args = parser.parse_args()
+
+    # app.db is opened relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench_get_"))
+    m = Base()
+    m._auto_drop_app_table(m)
+    m._auto_create_app_table(m)
+    now = datetime.now(timezone.utc)
+    Base.bulk_insert({"is_active": True, "created_at": now, "updated_at": now} for _ in range(args.rows))
+
+    ids = [random.randint(1, args.rows) for _ in range(args.calls)]
+    # warm up page cache and statement cache
+    _time(lambda id: Base.get(id), ids[:1000])
+    _time(lambda id: legacy_get(Base, id), ids[:1000])
+
+    # floor: the bare statement on an already checked-out connection
+    with get_db_app() as conn:
+        query = Base._sql().select_by_id
+        floor = _time(lambda id: conn.execute(query, (id,)).fetchone(), ids)
+
+    legacy = _time(lambda id: legacy_get(Base, id), ids)
+    current = _time(lambda id: Base.get(id), ids)
+    print(f"Base.get over {args.calls:,} calls on {args.rows:,} rows")
+    print(f"  raw sqlite execute:      {floor:8.2f} us/call")
+    print(f"  legacy (per-call build): {legacy:8.2f} us/call  (+{legacy - floor:.2f} overhead)")
+    print(f"  precompiled:             {current:8.2f} us/call  (+{current - floor:.2f} overhead)")
+    print(f"  overhead reduction:      {(1 - (current - floor) / (legacy - floor)) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# file : my_n8n/bench/bench_hydrate.py :: 0.0.1
+# time and memory of get_all result modes: dicts, namedtuples, constructed and validated models
+#
+#   python -m bench.bench_hydrate --rows 100000
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Tuple
+
+from rich import print
+from rich.table import Table
+
+from model.base import Base, BaseResponse
+
+
+def _measure(fn: Callable[[], Any]) -> Tuple[float, int]:
+    """Seconds and bytes still allocated by the result of ``fn``."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark get_all result modes")
+    parser.add_argument("--rows", type=int, default=100_000, help="rows in the table")
+    args = parser.parse_args()
+
+    # app.db is opened relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench_hydrate_"))
+    m = Base()
+    m._auto_drop_app_table(m)
+    m._auto_create_app_table(m)
+    now = datetime.now(timezone.utc)
+    Base.bulk_insert({"is_active": True, "created_at": now, "updated_at": now} for _ in range(args.rows))
+
+    variants = [
+        ("rows (dict)", lambda: BaseResponse.get_all()),
+        ("tuples (namedtuple)", lambda: BaseResponse.get_all(as_="tuples")),
+        ("models (constructed)", lambda: BaseResponse.get_all(as_="models")),
+        ("Model(**row) per dict", lambda: [BaseResponse.model_validate(r, strict=False)
+                                           for r in BaseResponse.get_all()]),
+    ]
+    table = Table(title=f"get_all result modes, {args.rows:,} rows")
+    table.add_column("mode")
+    table.add_column("seconds", justify="right")
+    table.add_column("MiB", justify="right")
+    table.add_column("bytes/row", justify="right")
+    for name, fn in variants:
+        seconds, size = _measure(fn)
+        table.add_row(name, f"{seconds:.3f}", f"{size / 2**20:.1f}", f"{size / args.rows:.0f}")
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# file : my_n8n/bench/bench_profiles.py :: 0.0.1
+# insert / read throughput of each connection profile on app, source, target
+#
+#   python -m bench.bench_profiles --rows 5000 --dir /tmp/bench_profiles
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from rich import print
+from rich.table import Table
+
+from connection.db_my_n8n import DBConnections, PROFILES
+
+DDL = "CREATE TABLE IF NOT EXISTS bench_trades (id INTEGER PRIMARY KEY, date, activity, symbol, quantity, price)"
+INSERT = "INSERT INTO bench_trades (date, activity, symbol, quantity, price) VALUES (?, ?, ?, ?, ?)"
+SYMBOLS = ("IBM", "META", "MSFT", "AAPL", "NVDA", "AMZN", "GOOG", "TSLA")
+
+
+def _trade(i: int) -> tuple:
+    return (f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}", random.choice(("BUY", "SELL")),
+            random.choice(SYMBOLS), random.randint(1, 1000), round(random.uniform(10, 1000), 2))
+
+
+def bench_database(manager: DBConnections, db_name: str, rows: int, readers: int) -> Dict[str, float]:
+    """Measure single-row commits, one-transaction batch insert and threaded point reads.
+
+    Args:
+        manager: Connection manager configured with the profile under test
+        db_name: Logical database name
+        rows: Number of rows per insert phase
+        readers: Number of reader threads
+
+    Returns:
+        Dict of operations per second per phase
+    """
+    with manager.connection(db_name) as conn:
+        conn.execute("DROP TABLE IF EXISTS bench_trades")
+        conn.execute(DDL)
+        conn.commit()
+
+        # one commit per row, like Base.create
+        start = time.perf_counter()
+        for i in range(rows):
+            conn.execute(INSERT, _trade(i))
+            conn.commit()
+        single = rows / (time.perf_counter() - start)
+
+        # all rows in one transaction
+        start = time.perf_counter()
+        with conn:
+            conn.executemany(INSERT, (_trade(i) for i in range(rows)))
+        batch = rows / (time.perf_counter() - start)
+
+    total = rows * 2
+    ids = [random.randint(1, total) for _ in range(rows)]
+
+    def _read(chunk: List[int]) -> None:
+        with manager.connection(db_name) as conn:
+            for id in chunk:
+                conn.execute("SELECT * FROM bench_trades WHERE id = ?", (id,)).fetchone()
+
+    chunks = [ids[i::readers] for i in range(readers)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=readers) as executor:
+        list(executor.map(_read, chunks))
+    reads = rows / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with manager.connection(db_name) as conn:
+        conn.execute("SELECT * FROM bench_trades").fetchall()
+    scan = total / (time.perf_counter() - start)
+
+    return {"insert_commit": single, "insert_batch": batch, "read_point": reads, "read_scan": scan}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SQLite connection profiles")
+    parser.add_argument("--rows", type=int, default=2000, help="rows per insert phase")
+    parser.add_argument("--readers", type=int, default=4, help="reader threads")
+    parser.add_argument("--dir", default=None, help="directory for the app/source/target files (default: temp)")
+    parser.add_argument("--profiles", nargs="*", default=list(PROFILES), help="profiles to run")
+    args = parser.parse_args()
+
+    workdir = Path(args.dir or tempfile.mkdtemp(prefix="bench_profiles_"))
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    table = Table(title=f"Connection profiles ({args.rows} rows, {args.readers} readers) - rows/sec")
+    for column in ("profile", "database", "insert_commit", "insert_batch", "read_point", "read_scan"):
+        table.add_column(column, justify="right" if column.startswith(("insert", "read")) else "left")
+
+    for profile in args.profiles:
+        # fresh files per profile so journal modes do not carry over
+        db_files = {name: str(workdir / f"{profile}_{name}.db") for name in ("app", "source", "target")}
+        manager = DBConnections(pool_size=args.readers, db_files=db_files,
+                                profiles={name: profile for name in db_files})
+        for db_name in db_files:
+            result = bench_database(manager, db_name, args.rows, args.readers)
+            table.add_row(profile, db_name, *(f"{result[k]:,.0f}" for k in
+                                              ("insert_commit", "insert_batch", "read_point", "read_scan")))
+        manager.close_all()
+
+    print(table)
+    print(f"Database files in {workdir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# file : my_n8n/bench/bench_validate.py :: 0.0.1
+# validation throughput: per-row model construction vs batched TypeAdapter vs trusted ingest
+#
+#   python -m bench.bench_validate --rows 100000
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from rich import print
+from rich.table import Table
+
+from model.base import Base
+from model.validation import validate_batch
+
+
+def _time(fn: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batched validation and ingest")
+    parser.add_argument("--rows", type=int, default=100_000, help="records per variant")
+    parser.add_argument("--chunk", type=int, default=10_000, help="records per batch")
+    args = parser.parse_args()
+
+    # app.db is opened relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench_validate_"))
+    m = Base()
+    m._auto_drop_app_table(m)
+    m._auto_create_app_table(m)
+    now = datetime.now(timezone.utc)
+    records = [{"is_active": i % 2 == 0, "created_at": now, "updated_at": now} for i in range(args.rows)]
+    # warm the cached adapter so its build is not timed
+    validate_batch(Base, records[:1])
+
+    results = [
+        ("per-row Base(**r)", _time(lambda: [Base(**r) for r in records])),
+        ("batched TypeAdapter", _time(lambda: [validate_batch(Base, records[i:i + args.chunk])
+                                               for i in range(0, len(records), args.chunk)])),
+        ("bulk_insert (no validation)", _time(lambda: Base.bulk_insert(records, chunk_size=args.chunk))),
+        ("ingest trusted", _time(lambda: Base.ingest(records, trusted=True, chunk_size=args.chunk))),
+        ("ingest validated", _time(lambda: Base.ingest(records, chunk_size=args.chunk))),
+    ]
+
+    table = Table(title=f"Validation throughput, {args.rows:,} records")
+    table.add_column("variant")
+    table.add_column("seconds", justify="right")
+    table.add_column("rows/s", justify="right")
+    for name, seconds in results:
+        table.add_row(name, f"{seconds:.3f}", f"{args.rows / seconds:,.0f}")
+    print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+# file : my_n8n/bench/suite.py :: 0.0.1
+# CRUD and source -> target benchmarks at several table sizes, written to JSON for comparison across commits
+#
+#   python -m bench.suite --sizes 1000 100000 1000000 --out bench.json
+#   python -m bench.suite --sizes 1000 100000 --out new.json --compare bench.json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from rich import print
+from rich.table import Table
+
+from model._base import _Base
+from model.base import Base
+from model.sync import SyncEngine
+from connection.db_my_n8n import get_db_source
+from bench.tradegen import COLUMNS, iter_trade_rows, trade_records
+
+
+class BenchTrade(Base):
+    """Trades in the app database, for the CRUD benchmarks"""
+    table_name: str = "bench_trade"
+    date: str = ""
+    activity: str = "BUY"
+    symbol: str = ""
+    quantity: int = 0
+    price: float = 0.0
+    columns = (*Base.columns, *COLUMNS)
+
+
+class SourceTrade(_Base):
+    """Trades in the _base_s shape, for the copy benchmark"""
+    table_name: str = "bench_trade"
+    columns = ("id INTEGER PRIMARY KEY", *COLUMNS)
+
+
+def _result(op: str, size: int, latencies: List[float], rows: Optional[int] = None) -> Dict[str, Any]:
+    """Summarize per-call latencies (seconds) of one operation."""
+    lat = np.asarray(latencies)
+    total = float(lat.sum())
+    p50, p99 = np.percentile(lat, [50, 99]) * 1000
+    return {
+        "op": op,
+        "size": size,
+        "count": len(lat),
+        "seconds": round(total, 6),
+        "ops_per_sec": round(len(lat) / total, 1) if total else None,
+        "rows_per_sec": round(rows / total, 1) if rows and total else None,
+        "p50_ms": round(float(p50), 4),
+        "p99_ms": round(float(p99), 4),
+    }
+
+
+def _timed(fn: Callable[[Any], Any], args: List[Any]) -> List[float]:
+    latencies = []
+    clock = time.perf_counter
+    for arg in args:
+        start = clock()
+        fn(arg)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def bench_size(size: int, ops: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Run every benchmark against a table of ``size`` rows.
+
+    Point operations (create/get/update/delete) run ``min(ops, size)``
+    times against the loaded table; bulk operations touch every row.
+    """
+    results = []
+    m = BenchTrade()
+    m._auto_drop_app_table(m)
+    m._auto_create_app_table(m)
+
+    records = trade_records(size, seed=seed)
+    batch = 1_000
+    latencies = _timed(BenchTrade.batch_create, [records[i:i + batch] for i in range(0, size, batch)])
+    results.append(_result("batch_create", size, latencies, rows=size))
+
+    n = min(ops, size)
+    rng = random.Random(seed)
+    ids = [rng.randint(1, size) for _ in range(n)]
+    extra = trade_records(n, seed=seed + 1)
+    results.append(_result("create", size, _timed(
+        lambda r: BenchTrade.create(m.table_name, m.columns, r), extra)))
+    results.append(_result("get", size, _timed(BenchTrade.get, ids)))
+    results.append(_result("update", size, _timed(
+        lambda id: BenchTrade.update(id, {"quantity": 100}), ids)))
+
+    reads = max(1, min(5, 100_000 // size))
+    latencies = _timed(lambda _: BenchTrade.get_all(), range(reads))
+    results.append(_result("get_all", size, latencies, rows=(size + n) * reads))
+    latencies = _timed(lambda _: BenchTrade.get_all(as_="tuples"), range(reads))
+    results.append(_result("get_all_tuples", size, latencies, rows=(size + n) * reads))
+
+    results.append(_result("delete", size, _timed(BenchTrade.delete, sorted(set(ids)))))
+
+    # source -> target copy of generated trades
+    s = SourceTrade()
+    s._auto_drop_source_table(s)
+    s._auto_create_source_table(s)
+    insert = f"INSERT INTO {s.table_s} ({', '.join(COLUMNS)}) VALUES ({', '.join(['?'] * len(COLUMNS))})"
+    start = time.perf_counter()
+    with get_db_source() as conn:
+        for rows in iter_trade_rows(size, seed=seed):
+            conn.executemany(insert, rows)
+    results.append(_result("source_load", size, [time.perf_counter() - start], rows=size))
+
+    s._exec_target_query(f"DROP TABLE IF EXISTS {s.table_t}")
+    s._exec_target_query(s._generate_ddl_create(s.table_t, s.columns))
+    report = SyncEngine(s).run()
+    results.append(_result("copy", size, [report.seconds], rows=report.rows))
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.10) -> Table:
+    """Table of throughput changes against a previous run; drops beyond ``threshold`` are flagged."""
+    before = {(r["op"], r["size"]): r for r in baseline["results"]}
+    table = Table(title=f"vs {baseline['meta'].get('commit') or 'baseline'}")
+    for col in ("op", "size", "ops/s before", "ops/s now", "change", "p99 ms before", "p99 ms now"):
+        table.add_column(col, justify="left" if col == "op" else "right")
+    for r in current["results"]:
+        old = before.get((r["op"], r["size"]))
+        if not old or not old["ops_per_sec"] or not r["ops_per_sec"]:
+            continue
+        change = r["ops_per_sec"] / old["ops_per_sec"] - 1
+        style = "red" if change < -threshold else "green" if change > threshold else ""
+        table.add_row(r["op"], f"{r['size']:,}", f"{old['ops_per_sec']:,.0f}", f"{r['ops_per_sec']:,.0f}",
+                      f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}",
+                      f"{old['p99_ms']:.3f}", f"{r['p99_ms']:.3f}")
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CRUD and sync at several table sizes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--ops", type=int, default=2_000, help="point operations per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench.json", help="JSON results file")
+    parser.add_argument("--compare", help="previous JSON results to compare against")
+    args = parser.parse_args()
+    out = Path(args.out).resolve()
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    # databases are opened relative to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="bench_suite_"))
+    results = []
+    for size in args.sizes:
+        results.extend(bench_size(size, args.ops, args.seed))
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+            "sizes": args.sizes,
+            "ops": args.ops,
+        },
+        "results": results,
+    }
+    out.write_text(json.dumps(report, indent=2))
+
+    table = Table(title=f"Benchmark suite ({report['meta']['commit'] or 'uncommitted'})")
+    for col in ("op", "size", "count", "ops/s", "rows/s", "p50 ms", "p99 ms"):
+        table.add_column(col, justify="left" if col == "op" else "right")
+    for r in results:
+        table.add_row(r["op"], f"{r['size']:,}", str(r["count"]), f"{r['ops_per_sec']:,.0f}",
+                      f"{r['rows_per_sec']:,.0f}" if r["rows_per_sec"] else "",
+                      f"{r['p50_ms']:.3f}", f"{r['p99_ms']:.3f}")
+    print(table)
+    if baseline:
+        print(compare(report, baseline))
+    print(f"Results written to {out}")
+
+
+if __name__ == "__main__":
+    main()
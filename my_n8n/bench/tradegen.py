@@ -0,0 +1,116 @@
+# file : my_n8n/bench/tradegen.py :: 0.0.2
+# vectorized synthetic trades in the _base_s shape: date, activity, symbol, quantity, price
+#
+#   python -m bench.tradegen --rows 1000000
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Iterator, Any, Sequence
+
+import numpy as np
+
+SYMBOLS = ("AAPL", "MSFT", "NVDA", "AMZN", "GOOG", "META", "TSLA", "IBM",
+           "ORCL", "INTC", "AMD", "CSCO", "NFLX", "ADBE", "CRM", "QCOM")
+COLUMNS = ("date", "activity", "symbol", "quantity", "price")
+TRADING_DAYS = 252
+
+
+def _series(n: int, seed: int, start: str,
+            symbols: Sequence[str]) -> Callable[[int, int], Dict[str, np.ndarray]]:
+    """Set up one ``n``-trade series and return ``draw(offset, count)`` for a slice of it.
+
+    The rows per trading day and the per-symbol price paths are drawn once,
+    so slices drawn one after another keep dates ascending and prices
+    continuing across slice boundaries; only per-trade values are drawn per
+    slice.
+    """
+    rng = np.random.default_rng(seed)
+    k = len(symbols)
+    popularity = 1.0 / np.arange(1, k + 1)
+    popularity /= popularity.sum()
+    names = np.asarray(symbols)
+    first = np.datetime64(start, "D")
+    # row r falls on the first day whose cumulative count exceeds r, i.e. sorted uniform days
+    day_ends = np.cumsum(rng.multinomial(n, np.full(TRADING_DAYS, 1 / TRADING_DAYS)))
+    paths = rng.uniform(20, 800, k)[:, None] * np.exp(np.cumsum(rng.normal(0, 0.02, (k, TRADING_DAYS)), axis=1))
+
+    def draw(offset: int, count: int) -> Dict[str, np.ndarray]:
+        sym = rng.choice(k, size=count, p=popularity)
+        day = np.searchsorted(day_ends, np.arange(offset, offset + count), side="right")
+        price = np.round(paths[sym, day] * (1 + rng.normal(0, 0.002, count)), 2)
+
+        lots = np.maximum(1, rng.lognormal(1.0, 0.8, count)).astype(np.int64)
+        odd = rng.integers(1, 100, count)
+        quantity = np.where(rng.random(count) < 0.8, lots * 100, odd)
+
+        return {
+            "date": np.busday_offset(first, day, roll="forward"),
+            "activity": np.where(rng.random(count) < 0.5, "BUY", "SELL"),
+            "symbol": names[sym],
+            "quantity": quantity,
+            "price": price,
+        }
+
+    return draw
+
+
+def generate_trades(n: int, seed: int = 0, start: str = "2024-01-02",
+                    symbols: Sequence[str] = SYMBOLS) -> Dict[str, np.ndarray]:
+    """Generate ``n`` trades as one array per column, without a Python loop per row.
+
+    - symbols follow a Zipf-like popularity, so a few names dominate
+    - dates are business days over one year, in ascending order
+    - prices follow a per-symbol daily log-normal random walk plus intraday noise
+    - quantities are log-normal, mostly round lots of 100 with some odd lots
+
+    Args:
+        n: Number of trades
+        seed: Random seed; the same seed gives the same trades
+        start: First trading day (ISO date)
+        symbols: Ticker universe
+
+    Returns:
+        Dict with ``date`` (datetime64[D]), ``activity``, ``symbol`` (str),
+        ``quantity`` (int64) and ``price`` (float64) arrays
+    """
+    return _series(n, seed, start, symbols)(0, n)
+
+
+def iter_trade_rows(n: int, chunk_size: int = 100_000, seed: int = 0) -> Iterator[List[tuple]]:
+    """Yield trades as lists of plain tuples, ready for ``executemany``.
+
+    The chunks are consecutive slices of one series with the properties of
+    :func:`generate_trades` (ascending dates, continuous price walks), but
+    only one chunk is in memory at a time. Columns are converted with
+    ``tolist`` per chunk, which yields native Python values in C instead of
+    per-element NumPy scalars.
+    """
+    draw = _series(n, seed, "2024-01-02", SYMBOLS)
+    for offset in range(0, n, chunk_size):
+        cols = draw(offset, min(chunk_size, n - offset))
+        yield list(zip(cols["date"].astype(str).tolist(), cols["activity"].tolist(),
+                       cols["symbol"].tolist(), cols["quantity"].tolist(), cols["price"].tolist()))
+
+
+def trade_records(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """``n`` trades as record dicts with timestamps, for ``Base``-style models."""
+    now = datetime.now(timezone.utc)
+    return [{**dict(zip(COLUMNS, row)), "is_active": True, "created_at": now, "updated_at": now}
+            for rows in iter_trade_rows(n, seed=seed) for row in rows]
+
+
+# Example usage:
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic trades")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = sum(len(chunk) for chunk in iter_trade_rows(args.rows))
+    seconds = time.perf_counter() - start
+    print(f"Generated {rows:,} rows in {seconds:.2f}s ({rows / seconds:,.0f} rows/sec)")
+    print(next(iter_trade_rows(3)))
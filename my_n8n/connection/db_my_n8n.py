@@ -1,10 +1,21 @@
-# file : my_n8n/connection/db_my_n8n.py :: 0.0.3
+# file : my_n8n/connection/db_my_n8n.py :: 0.0.16
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
 import os
 import sqlite3
-from contextlib import contextmanager
-from typing import Optional, Dict, Any
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional, Dict, Any, Callable, Deque, Iterator, List, Tuple
 from loguru import logger as log
 
+from connection.metrics import METRICS, InstrumentedConnection
+
 class DatabaseError(Exception):
     """Base exception for database operations"""
     pass
@@ -13,20 +24,316 @@ class ConnectionError(DatabaseError):
     """Exception for connection issues"""
     pass
 
-class DBConnections:
-    """Database connection manager for multiple databases"""
+# Named PRAGMA sets applied to every new connection. cache_size is negative
+# KiB (SQLite convention), mmap_size is bytes, busy_timeout is milliseconds.
+# "default" leaves SQLite's stock settings untouched.
+PROFILES: Dict[str, Dict[str, Any]] = {
+    'default': {},
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000,
+    },
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+    'bulk-load': {
+        'journal_mode': 'MEMORY',
+        'synchronous': 'OFF',
+        'cache_size': -256000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000,
+    },
+    'read-mostly': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -128000,
+        'mmap_size': 1073741824,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000,
+    },
+}
+
+def apply_profile(conn: sqlite3.Connection, profile: str) -> None:
+    """Apply a named PRAGMA profile to an open connection.
     
-    def __init__(self):
-        self.connections: Dict[str, Optional[sqlite3.Connection]] = {
-            'app': None,
-            'source': None,
-            'target': None
+    Args:
+        conn: SQLite connection
+        profile: Key of ``PROFILES``
+        
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown connection profile: {profile}")
+    for pragma, value in PROFILES[profile].items():
+        # journal_mode answers with the mode actually in effect
+        row = conn.execute(f"PRAGMA {pragma} = {value}").fetchone()
+        if pragma == 'journal_mode' and row and str(row[0]).upper() != str(value).upper():
+            log.warning(f"journal_mode {value} not applied, database is in {row[0]} mode")
+
+class PoolTimeoutError(ConnectionError):
+    """Exception raised when no pooled connection becomes available in time"""
+    pass
+
+class ConnectionPool:
+    """Bounded checkout/checkin pool of SQLite connections for one database.
+
+    Connections are opened with ``check_same_thread=False`` so that any thread
+    can check one out, but a connection is only ever used by the thread that
+    currently holds it. Checkouts are re-entrant per thread: a nested
+    ``checkout`` on a thread that already holds a connection returns the same
+    one, so nested ``get_db_*`` blocks keep sharing a single handle.
+
+    Attributes:
+        name: Logical database name ('app', 'source', 'target')
+        max_size: Maximum number of open connections
+        idle_timeout: Seconds an idle connection is kept before being closed
+        checkout_timeout: Seconds to wait for a free connection before failing
+    """
+
+    def __init__(self, name: str, factory: Callable[[], sqlite3.Connection],
+                 max_size: int = 5, idle_timeout: float = 300.0,
+                 checkout_timeout: float = 30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.name = name
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._factory = factory
+        self._cond = threading.Condition()
+        self._idle: Deque[Tuple[sqlite3.Connection, float]] = deque()
+        self._size = 0
+        # bumped by close_all(); connections from an older generation close on checkin
+        self._generation = 0
+        self._local = threading.local()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'created': 0,
+            'evicted': 0,
+            'recycled': 0,
+            'checkout_time_total': 0.0,
+            'checkout_time_max': 0.0,
         }
-        self.db_files = {
+
+    def _evict_expired(self, now: float) -> List[sqlite3.Connection]:
+        """Pop idle connections past ``idle_timeout``; caller holds the lock."""
+        expired = []
+        # oldest idle connections sit on the left
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            conn, _ = self._idle.popleft()
+            expired.append(conn)
+        self._size -= len(expired)
+        self._stats['evicted'] += len(expired)
+        return expired
+
+    def _close_quietly(self, conns: List[sqlite3.Connection]) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception as e:
+                log.warning(f"Error closing {self.name} connection: {e}")
+
+    def _record_checkout(self, elapsed: float, created: bool) -> None:
+        """Update checkout counters; caller holds the lock."""
+        stats = self._stats
+        stats['checkouts'] += 1
+        stats['created'] += created
+        stats['checkout_time_total'] += elapsed
+        if elapsed > stats['checkout_time_max']:
+            stats['checkout_time_max'] = elapsed
+
+    def checkout(self) -> sqlite3.Connection:
+        """Check out a connection, waiting up to ``checkout_timeout`` seconds.
+
+        Returns:
+            SQLite connection reserved for the calling thread
+
+        Raises:
+            PoolTimeoutError: If the pool stays exhausted past the timeout
+            ConnectionError: If a new connection cannot be opened
+        """
+        held = getattr(self._local, 'conn', None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        start = time.perf_counter()
+        deadline = start + self.checkout_timeout
+        conn = None
+        create = False
+        with self._cond:
+            generation = self._generation
+            expired = self._evict_expired(time.monotonic()) if self._idle else []
+            waited = False
+            while True:
+                if self._idle:
+                    # LIFO keeps the warmest connection (page cache) in use
+                    conn, _ = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    self._close_quietly(expired)
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.checkout_timeout}s waiting for a {self.name} connection")
+                if not waited:
+                    waited = True
+                    self._stats['waits'] += 1
+                self._cond.wait(remaining)
+                generation = self._generation
+            if not create:
+                self._record_checkout(time.perf_counter() - start, False)
+        if expired:
+            self._close_quietly(expired)
+
+        if create:
+            try:
+                conn = self._factory()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._record_checkout(time.perf_counter() - start, True)
+        self._local.conn = conn
+        self._local.depth = 1
+        self._local.generation = generation
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection) -> None:
+        """Return a connection previously obtained from :meth:`checkout`.
+
+        Args:
+            conn: Connection to return to the pool
+        """
+        if getattr(self._local, 'conn', None) is not conn:
+            raise ConnectionError(f"Connection was not checked out from the {self.name} pool by this thread")
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+        if conn.in_transaction:
+            conn.rollback()
+        with self._cond:
+            stale = self._local.generation != self._generation
+            if stale:
+                # checked out before close_all(): its PRAGMAs/factory are outdated
+                self._size -= 1
+                self._stats['recycled'] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        if stale:
+            self._close_quietly([conn])
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of a ``with`` block."""
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def evict_idle(self) -> int:
+        """Close idle connections past ``idle_timeout``.
+
+        Returns:
+            Number of connections closed
+        """
+        with self._cond:
+            expired = self._evict_expired(time.monotonic())
+            self._cond.notify_all()
+        self._close_quietly(expired)
+        return len(expired)
+
+    def close_all(self) -> None:
+        """Close every idle connection; checked-out ones close on checkin."""
+        with self._cond:
+            self._generation += 1
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        self._close_quietly(idle)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of pool counters.
+
+        Returns:
+            Dict with size, in_use, idle, checkouts, waits, timeouts, created,
+            evicted, recycled (closed on checkin after close_all) and average/max checkout latency in milliseconds
+        """
+        with self._cond:
+            s = dict(self._stats)
+            idle = len(self._idle)
+            size = self._size
+        total = s.pop('checkout_time_total')
+        return {
+            'name': self.name,
+            'max_size': self.max_size,
+            'size': size,
+            'in_use': size - idle,
+            'idle': idle,
+            **{k: v for k, v in s.items() if k != 'checkout_time_max'},
+            'checkout_ms_avg': (total / s['checkouts'] * 1000) if s['checkouts'] else 0.0,
+            'checkout_ms_max': s['checkout_time_max'] * 1000,
+        }
+
+class DBConnections:
+    """Database connection manager for multiple databases.
+
+    Keeps one :class:`ConnectionPool` per logical database. Pool sizing can be
+    passed in or taken from the ``MY_N8N_POOL_SIZE``, ``MY_N8N_POOL_IDLE_TIMEOUT``
+    and ``MY_N8N_POOL_TIMEOUT`` environment variables.
+
+    Each database gets a connection profile (see ``PROFILES``) from the
+    ``profiles`` argument, else ``MY_N8N_DB_PROFILE_<NAME>`` (e.g.
+    ``MY_N8N_DB_PROFILE_SOURCE=bulk-load``), else ``MY_N8N_DB_PROFILE``,
+    else ``default``.
+    """
+    
+    def __init__(self, pool_size: Optional[int] = None, idle_timeout: Optional[float] = None,
+                 checkout_timeout: Optional[float] = None,
+                 db_files: Optional[Dict[str, str]] = None,
+                 profiles: Optional[Dict[str, str]] = None):
+        self.db_files = db_files or {
             'app': 'app.db',
             'source': 'source.db',
             'target': 'target.db'
         }
+        default_profile = os.environ.get('MY_N8N_DB_PROFILE', 'default')
+        self.profiles = {
+            name: os.environ.get(f'MY_N8N_DB_PROFILE_{name.upper()}', default_profile)
+            for name in self.db_files
+        }
+        self.profiles.update(profiles or {})
+        for profile in self.profiles.values():
+            if profile not in PROFILES:
+                raise ValueError(f"Unknown connection profile: {profile}")
+        self.pool_size = pool_size or int(os.environ.get('MY_N8N_POOL_SIZE', 5))
+        self.idle_timeout = idle_timeout or float(os.environ.get('MY_N8N_POOL_IDLE_TIMEOUT', 300))
+        self.checkout_timeout = checkout_timeout or float(os.environ.get('MY_N8N_POOL_TIMEOUT', 30))
+        self.pools: Dict[str, ConnectionPool] = {}
+        self._lock = threading.Lock()
 
     def _create_connection(self, db_name: str) -> sqlite3.Connection:
         """Create a new database connection.
@@ -41,35 +348,99 @@ class DBConnections:
             ConnectionError: If connection fails
         """
         try:
-            conn = sqlite3.connect(self.db_files[db_name])
+            # statement timing only costs anything on connections opened while metrics are on
+            factory = InstrumentedConnection if METRICS.enabled else sqlite3.Connection
+            conn = sqlite3.connect(self.db_files[db_name], check_same_thread=False, factory=factory)
+            if METRICS.enabled:
+                conn.db_name = db_name
             conn.row_factory = sqlite3.Row
+            apply_profile(conn, self.profiles[db_name])
             return conn
         except Exception as e:
             log.error(f"Failed to connect to {db_name} database: {e}")
             raise ConnectionError(f"Could not connect to {db_name} database") from e
 
-    def get_connection(self, db_name: str) -> sqlite3.Connection:
-        """Get a database connection, creating it if necessary.
+    def get_pool(self, db_name: str) -> ConnectionPool:
+        """Get the connection pool for a database, creating it if necessary.
         
         Args:
             db_name: Name of the database to connect to
             
         Returns:
-            SQLite connection object
+            Connection pool for the database
+        """
+        pool = self.pools.get(db_name)
+        if pool is None:
+            with self._lock:
+                pool = self.pools.get(db_name)
+                if pool is None:
+                    if db_name not in self.db_files:
+                        raise ConnectionError(f"Unknown database: {db_name}")
+                    pool = ConnectionPool(
+                        db_name,
+                        lambda: self._create_connection(db_name),
+                        max_size=self.pool_size,
+                        idle_timeout=self.idle_timeout,
+                        checkout_timeout=self.checkout_timeout)
+                    self.pools[db_name] = pool
+        return pool
+
+    def configure_pool(self, db_name: str, **kwargs) -> ConnectionPool:
+        """Replace the pool for a database with one using new settings.
+        
+        Args:
+            db_name: Name of the database
+            **kwargs: ``max_size``, ``idle_timeout`` and/or ``checkout_timeout``
+            
+        Returns:
+            The new connection pool
+        """
+        with self._lock:
+            old = self.pools.pop(db_name, None)
+        if old is not None:
+            old.close_all()
+        pool = self.get_pool(db_name)
+        for key, value in kwargs.items():
+            if not hasattr(pool, key):
+                raise ValueError(f"Unknown pool setting: {key}")
+            setattr(pool, key, value)
+        return pool
+
+    def set_profile(self, db_name: str, profile: str) -> None:
+        """Switch a database to another connection profile.
+        
+        Idle connections are closed so that new checkouts use the profile;
+        connections currently checked out keep their settings until closed.
+        
+        Args:
+            db_name: Name of the database
+            profile: Key of ``PROFILES``
         """
-        if self.connections[db_name] is None:
-            self.connections[db_name] = self._create_connection(db_name)
-        return self.connections[db_name]
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown connection profile: {profile}")
+        self.profiles[db_name] = profile
+        pool = self.pools.get(db_name)
+        if pool is not None:
+            pool.close_all()
+
+    @contextmanager
+    def connection(self, db_name: str) -> Iterator[sqlite3.Connection]:
+        """Check out a pooled connection for a ``with`` block.
+        
+        Args:
+            db_name: Name of the database to connect to
+        """
+        with self.get_pool(db_name).connection() as conn:
+            yield conn
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get pool statistics for every database with an open pool"""
+        return {name: pool.stats() for name, pool in list(self.pools.items())}
 
     def close_all(self):
-        """Close all open database connections"""
-        for name, conn in self.connections.items():
-            if conn is not None:
-                try:
-                    conn.close()
-                    self.connections[name] = None
-                except Exception as e:
-                    log.warning(f"Error closing {name} connection: {e}")
+        """Close all idle pooled database connections"""
+        for pool in list(self.pools.values()):
+            pool.close_all()
 
     def __del__(self):
         """Ensure connections are closed when object is destroyed"""
@@ -77,48 +448,407 @@ class DBConnections:
 
 # Global connection manager
 _db_manager = DBConnections()
+METRICS.bind_pools(_db_manager.close_all, _db_manager.stats)
+
+def set_profile(db_name: str, profile: str) -> None:
+    """Switch a database of the global manager to another connection profile"""
+    _db_manager.set_profile(db_name, profile)
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get connection pool statistics for all databases"""
+    return _db_manager.stats()
+
+def db_path(db_name: str) -> str:
+    """Get the file path of a database of the global manager"""
+    return _db_manager.db_files[db_name]
+
+class _TxDepth(threading.local):
+    """Per-thread nesting depth of transaction() blocks, by database name.
+
+    Class-level zeros make the lookup in every get_db_* block a plain
+    attribute read; ``getattr`` with a default on a missing thread-local
+    attribute raises and swallows an AttributeError each time.
+    """
+    app = 0
+    source = 0
+    target = 0
+
+_tx_depth = _TxDepth()
+
+# per-thread stack of after-commit callbacks, one list per open transaction() block
+_tx_callbacks = threading.local()
+
+def in_transaction(db_name: str = 'app') -> bool:
+    """Whether this thread is inside a transaction() block on the database"""
+    return getattr(_tx_depth, db_name, 0) > 0
+
+def after_commit(callback: Callable[[], Any], db_name: str = 'app') -> None:
+    """Run ``callback`` once the writes made so far on this thread are committed.
+    
+    Inside a transaction() block the callback is deferred until the
+    outermost block commits, and discarded if the block it was registered
+    in (or any enclosing one) rolls back. Outside a block it runs at once.
+    Used to invalidate caches only after the new data is visible.
+    
+    Args:
+        callback: Function without arguments
+        db_name: ``app``, ``source`` or ``target``
+    """
+    stack = getattr(_tx_callbacks, db_name, None)
+    if stack:
+        stack[-1].append(callback)
+    else:
+        _run_callbacks([callback])
+
+def _run_callbacks(callbacks: List[Callable[[], Any]]) -> None:
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception as e:
+            log.error(f"After-commit callback {callback!r} failed: {e}")
+
+@contextmanager
+def transaction(db_name: str = 'app'):
+    """Unit of work: every get_db_* block on this thread shares one connection and one commit.
+    
+    The outermost block issues ``BEGIN`` and commits on exit or rolls back
+    on an exception; get_db_* blocks inside it neither commit nor roll
+    back. Nested transaction() blocks become savepoints, so an inner
+    failure can be caught and only its own writes are undone. Opened
+    inside a plain get_db_* block that already has pending writes, the
+    block is a savepoint too and the enclosing block commits.
+    
+    Args:
+        db_name: ``app``, ``source`` or ``target``
+        
+    Yields:
+        The shared connection
+        
+    Raises:
+        DatabaseError: If BEGIN/COMMIT fails
+    """
+    pool = _db_manager.get_pool(db_name)
+    conn = pool.checkout()
+    depth = getattr(_tx_depth, db_name, 0)
+    savepoint = f"sp_{depth}" if depth or conn.in_transaction else None
+    start = time.perf_counter() if METRICS.enabled else None
+    try:
+        conn.execute(f"SAVEPOINT {savepoint}" if savepoint else "BEGIN")
+    except Exception as e:
+        pool.checkin(conn)
+        raise DatabaseError(f"Could not begin transaction on {db_name}: {e}") from e
+    setattr(_tx_depth, db_name, depth + 1)
+    if not hasattr(_tx_callbacks, db_name):
+        setattr(_tx_callbacks, db_name, [])
+    stack = getattr(_tx_callbacks, db_name)
+    stack.append([])
+    outcome = 'rollback'
+    try:
+        try:
+            yield conn
+        except BaseException:
+            if savepoint:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
+            raise
+        try:
+            if savepoint:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
+        except Exception as e:
+            if not savepoint:
+                conn.rollback()
+            raise DatabaseError(f"Could not commit transaction on {db_name}: {e}") from e
+        outcome = 'commit'
+    finally:
+        setattr(_tx_depth, db_name, depth)
+        # callbacks of a rolled-back block are dropped here
+        callbacks = stack.pop()
+        pool.checkin(conn)
+        if start is not None and not savepoint:
+            METRICS.transaction(db_name, time.perf_counter() - start, outcome)
+    if stack:
+        # released savepoint: the enclosing block decides
+        stack[-1].extend(callbacks)
+    else:
+        _run_callbacks(callbacks)
 
 @contextmanager
 def get_db_app():
     """Get a connection to the app database"""
-    conn = None
+    pool = _db_manager.get_pool('app')
+    conn = pool.checkout()
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    # inside transaction() the outermost block commits or rolls back
+    owned = not getattr(_tx_depth, 'app', 0)
     try:
-        conn = _db_manager.get_connection('app')
         yield conn
-        conn.commit()
+        if owned:
+            conn.commit()
+        outcome = 'commit'
     except Exception as e:
-        if conn:
+        if owned:
             conn.rollback()
         raise DatabaseError(f"App database error: {e}") from e
+    finally:
+        pool.checkin(conn)
+        if start is not None and owned:
+            METRICS.transaction('app', time.perf_counter() - start, outcome)
 
 @contextmanager
 def get_db_source():
     """Get a connection to the source database"""
-    conn = None
+    pool = _db_manager.get_pool('source')
+    conn = pool.checkout()
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    # inside transaction() the outermost block commits or rolls back
+    owned = not getattr(_tx_depth, 'source', 0)
     try:
-        conn = _db_manager.get_connection('source')
         yield conn
-        conn.commit()
+        if owned:
+            conn.commit()
+        outcome = 'commit'
     except Exception as e:
-        if conn:
+        if owned:
             conn.rollback()
         raise DatabaseError(f"Source database error: {e}") from e
+    finally:
+        pool.checkin(conn)
+        if start is not None and owned:
+            METRICS.transaction('source', time.perf_counter() - start, outcome)
 
 @contextmanager
 def get_db_target():
     """Get a connection to the target database"""
-    conn = None
+    pool = _db_manager.get_pool('target')
+    conn = pool.checkout()
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    # inside transaction() the outermost block commits or rolls back
+    owned = not getattr(_tx_depth, 'target', 0)
     try:
-        conn = _db_manager.get_connection('target')
         yield conn
-        conn.commit()
+        if owned:
+            conn.commit()
+        outcome = 'commit'
     except Exception as e:
-        if conn:
+        if owned:
             conn.rollback()
         raise DatabaseError(f"Target database error: {e}") from e
+    finally:
+        pool.checkin(conn)
+        if start is not None and owned:
+            METRICS.transaction('target', time.perf_counter() - start, outcome)
+
+def pg_conninfo() -> Dict[str, str]:
+    """Postgres connection parameters from the POSTGRES_* environment variables"""
+    return {
+        'host': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'port': os.environ.get('POSTGRES_PORT', '5433'),
+        'dbname': os.environ.get('POSTGRES_DB', 'postgres'),
+        'user': os.environ.get('POSTGRES_USER', 'n8n_user'),
+        'password': os.environ.get('POSTGRES_PASSWORD', 'n8n_password'),
+    }
+
+@contextmanager
+def get_db_pg():
+    """Get a dedicated connection to the Postgres database.
+    
+    Opens a new ``psycopg.Connection`` per block, for long-running bulk jobs
+    rather than per-request use (see :func:`get_db_pg_pooled`); it is closed
+    when the block exits.
+    """
+    try:
+        import psycopg
+        conn = psycopg.connect(**pg_conninfo())
+    except Exception as e:
+        log.error(f"Failed to connect to Postgres database: {e}")
+        raise ConnectionError("Could not connect to Postgres database") from e
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    try:
+        yield conn
+        conn.commit()
+        outcome = 'commit'
+    except Exception as e:
+        if not conn.broken:
+            conn.rollback()
+        raise DatabaseError(f"Postgres database error: {e}") from e
+    finally:
+        conn.close()
+        if start is not None:
+            METRICS.transaction('postgres', time.perf_counter() - start, outcome)
+
+class PgPool:
+    """Bounded, thread-safe pool of psycopg ``Connection`` objects.
+
+    The synchronous counterpart of :class:`AsyncPgPool`: at most
+    ``max_size`` connections are open and further checkouts block on a
+    semaphore until one is returned. psycopg is imported lazily so
+    SQLite-only use does not need it.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.environ.get('MY_N8N_PG_POOL_SIZE', 10))
+        self._sem = threading.BoundedSemaphore(self.max_size)
+        self._lock = threading.Lock()
+        self._idle: List[Any] = []
+
+    def checkout(self) -> Any:
+        """Check out an open ``psycopg.Connection``"""
+        self._sem.acquire()
+        try:
+            with self._lock:
+                while self._idle:
+                    conn = self._idle.pop()
+                    if not conn.closed:
+                        return conn
+            import psycopg
+            return psycopg.connect(**pg_conninfo())
+        except Exception as e:
+            self._sem.release()
+            log.error(f"Failed to connect to Postgres database: {e}")
+            raise ConnectionError("Could not connect to Postgres database") from e
+
+    def checkin(self, conn: Any) -> None:
+        """Return a connection to the pool, dropping it if it is broken"""
+        try:
+            if not conn.closed and not conn.broken:
+                with self._lock:
+                    self._idle.append(conn)
+            elif not conn.closed:
+                conn.close()
+        finally:
+            self._sem.release()
+
+    def close_all(self) -> None:
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                conn.close()
+            except Exception as e:
+                log.warning(f"Error closing Postgres connection: {e}")
+
+_pg_pool = PgPool()
+
+@contextmanager
+def get_db_pg_pooled():
+    """Get a pooled connection to the Postgres database, for per-request use.
+
+    Commits when the block exits, rolls back on error, and returns the
+    connection to the pool instead of closing it.
+    """
+    conn = _pg_pool.checkout()
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    try:
+        yield conn
+        conn.commit()
+        outcome = 'commit'
+    except Exception as e:
+        if not conn.broken:
+            conn.rollback()
+        raise DatabaseError(f"Postgres database error: {e}") from e
+    finally:
+        _pg_pool.checkin(conn)
+        if start is not None:
+            METRICS.transaction('postgres', time.perf_counter() - start, outcome)
+
+class AsyncPgPool:
+    """Bounded pool of psycopg ``AsyncConnection`` objects.
+    
+    At most ``max_size`` connections are open; further checkouts wait on a
+    semaphore instead of opening more. A pool must only be used from one
+    event loop; ``get_db_pg_async`` keeps one per loop. psycopg is imported
+    lazily so SQLite-only use does not need it.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size or int(os.environ.get('MY_N8N_PG_POOL_SIZE', 10))
+        self._sem = asyncio.Semaphore(self.max_size)
+        self._idle: List[Any] = []
+
+    async def checkout(self) -> Any:
+        """Check out an open ``psycopg.AsyncConnection``"""
+        await self._sem.acquire()
+        try:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.closed:
+                    return conn
+            import psycopg
+            return await psycopg.AsyncConnection.connect(**pg_conninfo())
+        except Exception as e:
+            self._sem.release()
+            log.error(f"Failed to connect to Postgres database: {e}")
+            raise ConnectionError("Could not connect to Postgres database") from e
+
+    async def checkin(self, conn: Any) -> None:
+        """Return a connection to the pool, dropping it if it is broken"""
+        try:
+            if not conn.closed and not conn.broken:
+                self._idle.append(conn)
+        finally:
+            self._sem.release()
+
+    async def close_all(self) -> None:
+        """Close all idle connections"""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            try:
+                await conn.close()
+            except Exception as e:
+                log.warning(f"Error closing Postgres connection: {e}")
+
+# one pool per event loop, created on first use: its semaphore and connections
+# are bound to that loop, so a later asyncio.run() gets a fresh pool
+_pg_async_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncPgPool]" = weakref.WeakKeyDictionary()
+
+def _pg_async_pool() -> AsyncPgPool:
+    """The running event loop's Postgres pool"""
+    loop = asyncio.get_running_loop()
+    pool = _pg_async_pools.get(loop)
+    if pool is None:
+        pool = _pg_async_pools[loop] = AsyncPgPool()
+    return pool
+
+async def close_pg_async_pool() -> None:
+    """Close the running event loop's idle Postgres connections, e.g. before the loop ends"""
+    pool = _pg_async_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close_all()
+
+@asynccontextmanager
+async def get_db_pg_async():
+    """Get an async connection to the Postgres database from the running loop's pool"""
+    pool = _pg_async_pool()
+    conn = await pool.checkout()
+    start = time.perf_counter() if METRICS.enabled else None
+    outcome = 'rollback'
+    try:
+        yield conn
+        await conn.commit()
+        outcome = 'commit'
+    except Exception as e:
+        if not conn.broken:
+            await conn.rollback()
+        raise DatabaseError(f"Postgres database error: {e}") from e
+    finally:
+        await pool.checkin(conn)
+        if start is not None:
+            METRICS.transaction('postgres', time.perf_counter() - start, outcome)
 
 # Example usage
 if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+
     try:
         # Test app database
         with get_db_app() as app_db:
@@ -141,6 +871,27 @@ if __name__ == "__main__":
             cur.execute("INSERT INTO test (name) VALUES (?)", ("test_name",))
             print("Target database test successful")
 
+        # Test concurrent readers sharing the app pool
+        def _read(_):
+            with get_db_app() as app_db:
+                return app_db.execute("SELECT COUNT(*) FROM test").fetchone()[0]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            counts = list(executor.map(_read, range(100)))
+        print(f"Concurrent reads successful: {len(counts)} reads")
+        print(f"Pool stats: {pool_stats()}")
+
+        # Test metrics: statements, transactions and the slow-query log
+        METRICS.enable(slow_ms=0.5)
+        with get_db_app() as app_db:
+            app_db.execute("WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n WHERE x < 200000) "
+                           "SELECT SUM(x) FROM n").fetchone()
+            app_db.execute("SELECT * FROM test").fetchall()
+        print(f"Slow queries: {[q['ms'] for q in METRICS.slow_queries()]}")
+        print("\n".join(line for line in METRICS.render().splitlines()
+                        if line.startswith("my_n8n_") and "_bucket" not in line and "_pool_" not in line))
+        METRICS.disable()
+
     except DatabaseError as e:
         log.error(f"Database test failed: {e}")
     except Exception as e:
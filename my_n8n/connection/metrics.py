@@ -0,0 +1,358 @@
+# file : my_n8n/connection/metrics.py :: 0.0.2
+# opt-in statement/transaction/operation metrics with a slow-query log and Prometheus text export
+import os
+import sqlite3
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Deque, List, Tuple
+from loguru import logger as log
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+PREFIX = "my_n8n"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """Registry of query metrics, off unless :meth:`enable` is called.
+
+    Three layers are recorded, each keyed by labels:
+
+    - ``statement``: every SQLite ``execute``/``executemany`` on pooled
+      connections, by database and verb (SELECT, INSERT, ...), with rows
+      read or written; statements slower than ``slow_ms`` are logged and
+      kept in :meth:`slow_queries`
+    - ``transaction``: each ``get_db_*`` block, by database and outcome
+    - ``operation``: each model CRUD call, by model and operation
+
+    When disabled nothing is timed: pooled connections are plain
+    ``sqlite3.Connection`` objects and the hooks reduce to one attribute
+    check. Enabling or disabling drops idle pooled connections so new ones
+    are created with or without the instrumented connection class.
+
+    Attributes:
+        enabled: Whether metrics are being recorded
+        slow_ms: Slow-query threshold in milliseconds, None to disable the log
+        buckets: Histogram bucket upper bounds in seconds
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.slow_ms: Optional[float] = None
+        self.buckets = DEFAULT_BUCKETS
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, Tuple[str, ...]], Histogram] = {}
+        self._counters: Dict[Tuple[str, Tuple[str, ...]], float] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._recycle: Optional[Callable[[], None]] = None
+        self._pool_stats: Optional[Callable[[], Dict[str, Dict[str, Any]]]] = None
+
+    def bind_pools(self, recycle: Callable[[], None], stats: Callable[[], Dict[str, Dict[str, Any]]]) -> None:
+        """Hook up the connection manager: idle-pool recycling and pool gauges."""
+        self._recycle = recycle
+        self._pool_stats = stats
+
+    def enable(self, slow_ms: Optional[float] = 100.0, buckets: Optional[Tuple[float, ...]] = None) -> None:
+        """Start recording.
+
+        Args:
+            slow_ms: Log statements at or above this many milliseconds
+            buckets: Histogram bucket bounds in seconds
+        """
+        self.slow_ms = slow_ms
+        if buckets:
+            self.buckets = tuple(sorted(buckets))
+        self.enabled = True
+        _install_timing(True)
+        if self._recycle:
+            self._recycle()
+
+    def disable(self) -> None:
+        """Stop recording; collected values are kept until :meth:`reset`."""
+        self.enabled = False
+        _install_timing(False)
+        if self._recycle:
+            self._recycle()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._slow.clear()
+
+    # ---------------------------------------------------------------- record
+    def observe(self, name: str, labels: Tuple[str, ...], seconds: float) -> None:
+        key = (name, labels)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(self.buckets)
+            hist.observe(seconds)
+
+    def inc(self, name: str, labels: Tuple[str, ...], value: float = 1) -> None:
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def statement(self, db: str, sql: str, seconds: float, rows: int = 0) -> None:
+        """Record one statement; ``rows`` written (or read, via the cursor)."""
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else "EMPTY"
+        self.observe("statement_seconds", (db, verb), seconds)
+        if rows > 0:
+            self.inc("statement_rows_total", (db, verb), rows)
+        if self.slow_ms is not None and seconds * 1000 >= self.slow_ms:
+            self.inc("slow_queries_total", (db,))
+            entry = {"db": db, "ms": round(seconds * 1000, 3), "sql": " ".join(sql.split()),
+                     "at": time.time()}
+            with self._lock:
+                self._slow.append(entry)
+            log.warning(f"Slow query {entry['ms']:.1f}ms on {db}: {entry['sql'][:500]}")
+
+    def transaction(self, db: str, seconds: float, outcome: str) -> None:
+        self.observe("transaction_seconds", (db, outcome), seconds)
+
+    def operation(self, model: str, op: str, seconds: float, ok: bool = True) -> None:
+        self.observe("operation_seconds", (model, op), seconds)
+        if not ok:
+            self.inc("operation_errors_total", (model, op))
+
+    def slow_queries(self) -> List[Dict[str, Any]]:
+        """Most recent slow statements, oldest first."""
+        with self._lock:
+            return list(self._slow)
+
+    # ---------------------------------------------------------------- export
+    _LABELS = {
+        "statement_seconds": ("db", "statement"),
+        "statement_rows_total": ("db", "statement"),
+        "slow_queries_total": ("db",),
+        "transaction_seconds": ("db", "outcome"),
+        "operation_seconds": ("model", "operation"),
+        "operation_errors_total": ("model", "operation"),
+    }
+    _HELP = {
+        "statement_seconds": "SQLite statement latency",
+        "statement_rows_total": "Rows read or written by statements",
+        "slow_queries_total": "Statements at or above the slow-query threshold",
+        "transaction_seconds": "Duration of get_db_* blocks from checkout to commit/rollback",
+        "operation_seconds": "Model CRUD operation latency",
+        "operation_errors_total": "Model CRUD operations that raised",
+    }
+
+    def _label_text(self, name: str, values: Tuple[str, ...], extra: str = "") -> str:
+        pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self._LABELS[name], values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> str:
+        """Everything recorded, plus connection pool gauges, in Prometheus text format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        lines: List[str] = []
+        seen = set()
+        for (name, labels), hist in histograms:
+            metric = f"{PREFIX}_{name}"
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {metric} {self._HELP[name]}", f"# TYPE {metric} histogram"]
+            cumulative = 0
+            for bound, count in zip((*hist.buckets, float("inf")), hist.counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{metric}_bucket{self._label_text(name, labels, le)} {cumulative}")
+            lines.append(f"{metric}_sum{self._label_text(name, labels)} {hist.sum}")
+            lines.append(f"{metric}_count{self._label_text(name, labels)} {hist.count}")
+        for (name, labels), value in counters:
+            metric = f"{PREFIX}_{name}"
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {metric} {self._HELP[name]}", f"# TYPE {metric} counter"]
+            lines.append(f"{metric}{self._label_text(name, labels)} {value}")
+        lines += self._pool_lines()
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write :meth:`render` to a file atomically (e.g. for node_exporter's textfile collector)."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        Path(tmp).write_text(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve :meth:`render` at ``/metrics`` from a daemon thread.
+
+        Returns:
+            The running server; call ``shutdown()`` to stop it
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        log.info(f"Serving metrics on http://{host}:{server.server_port}/metrics")
+        return server
+
+    def _pool_lines(self) -> List[str]:
+        """Gauges from the bound connection pools."""
+        if self._pool_stats is None:
+            return []
+        pools = self._pool_stats()
+        lines = []
+        for field, help_ in (("size", "Open connections"), ("in_use", "Checked-out connections"),
+                             ("idle", "Idle connections"), ("waits", "Checkouts that had to wait"),
+                             ("timeouts", "Checkouts that timed out")):
+            metric = f"{PREFIX}_pool_{field}"
+            kind = "counter" if field in ("waits", "timeouts") else "gauge"
+            lines += [f"# HELP {metric} {help_}", f"# TYPE {metric} {kind}"]
+            lines += [f'{metric}{{db="{db}"}} {stats[field]}' for db, stats in pools.items()]
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+METRICS = Metrics()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor that times statements and counts rows for :data:`METRICS`."""
+    db_name = "sqlite"
+
+    def execute(self, sql, parameters=()):
+        if not METRICS.enabled:
+            return super().execute(sql, parameters)
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            METRICS.statement(self.connection.db_name, sql, time.perf_counter() - start, max(self.rowcount, 0))
+
+    def executemany(self, sql, seq_of_parameters):
+        if not METRICS.enabled:
+            return super().executemany(sql, seq_of_parameters)
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            METRICS.statement(self.connection.db_name, sql, time.perf_counter() - start, max(self.rowcount, 0))
+
+    def _read(self, rows: Any, count: int) -> Any:
+        if METRICS.enabled and count:
+            METRICS.inc("statement_rows_total", (self.connection.db_name, "SELECT"), count)
+        return rows
+
+    def fetchone(self):
+        row = super().fetchone()
+        return self._read(row, row is not None)
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        return self._read(rows, len(rows))
+
+    def fetchall(self):
+        rows = super().fetchall()
+        return self._read(rows, len(rows))
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Connection whose cursors (including ``execute`` shortcuts) are instrumented.
+
+    Pass as ``factory`` to ``sqlite3.connect``; set ``db_name`` for labels.
+    """
+    db_name = "sqlite"
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    # the C shortcuts create a plain cursor, so route them through cursor()
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# (module, qualname, plain, timed) of every @timed_operation method
+_TIMED: List[Tuple[str, str, Callable, Callable]] = []
+
+
+def _install_timing(enabled: bool) -> None:
+    """Swap the timed or the plain function of every registered method into its class."""
+    for module, qualname, plain, timed in _TIMED:
+        *path, name = qualname.split(".")
+        if "<locals>" in path:
+            continue
+        owner: Any = sys.modules.get(module)
+        for part in path:
+            owner = getattr(owner, part, None)
+        attr = vars(owner).get(name) if isinstance(owner, type) else None
+        if isinstance(attr, classmethod) and attr.__func__ in (plain, timed):
+            setattr(owner, name, classmethod(timed if enabled else plain))
+        elif attr in (plain, timed):
+            setattr(owner, name, timed if enabled else plain)
+
+
+def timed_operation(op: Optional[str] = None) -> Callable:
+    """Decorator recording a model method's latency under ``(cls.__name__, op)``.
+
+    Apply below ``@classmethod``. While metrics are off the class holds the
+    undecorated function, so the hot path pays nothing;
+    :meth:`Metrics.enable` swaps the timed wrapper in and
+    :meth:`Metrics.disable` swaps it out again. Methods of classes defined
+    inside functions cannot be found again and keep the state at definition.
+    """
+    def decorator(fn: Callable) -> Callable:
+        name = op or fn.__name__
+
+        @wraps(fn)
+        def wrapper(cls, *args, **kwargs):
+            if not METRICS.enabled:
+                return fn(cls, *args, **kwargs)
+            start = time.perf_counter()
+            ok = False
+            try:
+                result = fn(cls, *args, **kwargs)
+                ok = True
+                return result
+            finally:
+                owner = cls if isinstance(cls, type) else type(cls)
+                METRICS.operation(owner.__name__, name, time.perf_counter() - start, ok)
+        _TIMED.append((fn.__module__, fn.__qualname__, fn, wrapper))
+        return wrapper if METRICS.enabled else fn
+    return decorator
@@ -1,4 +1,4 @@
-# file : my_n8n/model/_base.py :: 0.0.5
+# file : my_n8n/model/_base.py :: 0.0.7
 
 from datetime import datetime
 import sys
@@ -8,7 +8,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from pydantic import BaseModel, ConfigDict, Field
 from rich import print
-from connection.db_my_n8n import get_db_app, get_db_source, get_db_target 
+from connection.db_my_n8n import get_db_app, get_db_source, get_db_target, get_db_pg
+from .ddl import columns_ddl, STRICT_SUPPORTED
 from loguru import logger as log
 
 T = TypeVar("T", bound="_Base")
@@ -21,6 +22,35 @@ class TableError(DatabaseError):
     """Exception for table operations"""
     pass
 
+class Index(BaseModel):
+    """Declarative index on a model table.
+    
+    Attributes:
+        columns: Indexed columns, in order (composite when more than one)
+        unique: Create a UNIQUE index
+        where: Optional predicate for a partial index, e.g. ``"is_active"``
+            (valid for SQLite integers and Postgres booleans alike)
+        name: Index name; derived from table and columns when omitted
+    """
+    columns: Tuple[str, ...]
+    unique: bool = False
+    where: Optional[str] = None
+    name: Optional[str] = None
+
+    model_config = ConfigDict(frozen=True)
+
+    def index_name(self, table_name: str) -> str:
+        """Explicit name or ``ix_<table>_<cols>`` (``ux_`` for unique)."""
+        return self.name or f"{'ux' if self.unique else 'ix'}_{table_name}_{'_'.join(self.columns)}"
+
+    def ddl(self, table_name: str) -> str:
+        """CREATE INDEX statement for a table, valid in SQLite and Postgres."""
+        query = (f"CREATE {'UNIQUE ' if self.unique else ''}INDEX IF NOT EXISTS "
+                 f"{self.index_name(table_name)} ON {table_name} ({', '.join(self.columns)})")
+        if self.where:
+            query += f" WHERE {self.where}"
+        return query
+
 class _Base(BaseModel):
     """Base model for database operations with Pydantic V2.
     
@@ -32,12 +62,22 @@ class _Base(BaseModel):
     Attributes:
         table_name: Name of the database table
         columns: Tuple of column names
+        indexes: Tuple of ``Index`` declarations created with the table
+        strict_table: Create SQLite tables as STRICT (when supported)
+        datetime_storage: SQLite storage type for datetime/date fields
         _sample: Sample data for documentation
+    
+    Column types are derived from the pydantic fields named in ``columns``
+    (see ``ddl.columns_ddl``); entries that already spell out a type are
+    used verbatim.
     """
     table_name: str = "base"
     columns: ClassVar[Tuple[str, ...]] = ()
+    indexes: ClassVar[Tuple[Index, ...]] = ()
+    strict_table: ClassVar[bool] = True
+    datetime_storage: ClassVar[str] = "TEXT"
 
-    _sample: Dict[str, Any] = {}
+    _sample: ClassVar[Dict[str, Any]] = {}
 
     model_config = ConfigDict(
         strict=True,
@@ -79,17 +119,60 @@ class _Base(BaseModel):
             print(f'\n{key}:', value)
         print('\n\n')
 
-    def _generate_ddl_create(self, table_name: str, columns: Tuple[str, ...]) -> str:
+    def _generate_ddl_create(self, table_name: str, columns: Tuple[str, ...], strict: bool = False) -> str:
         """Generate DDL CREATE TABLE statement.
         
         Args:
             table_name: Name of the table to create
             columns: Tuple of column definitions
+            strict: Append SQLite's STRICT table option
             
         Returns:
             SQL CREATE TABLE statement
         """
-        return f'CREATE TABLE IF NOT EXISTS {table_name} ({", ".join(columns)})'
+        return f'CREATE TABLE IF NOT EXISTS {table_name} ({", ".join(columns)}){" STRICT" if strict else ""}'
+
+    def _generate_ddl_columns(self, columns: Tuple[str, ...], dialect: str = "sqlite") -> Tuple[str, ...]:
+        """Generate typed column definitions from the model's pydantic fields.
+        
+        Args:
+            columns: Tuple of column names/definitions
+            dialect: ``sqlite`` or ``postgres``
+            
+        Returns:
+            Tuple of typed column definitions, in the same order
+        """
+        return columns_ddl(type(self).model_fields, columns, dialect,
+                           self.datetime_storage, self._use_strict())
+
+    def _use_strict(self) -> bool:
+        """Whether SQLite tables for this model are created STRICT."""
+        return self.strict_table and STRICT_SUPPORTED
+
+    def _generate_ddl_typed(self, table_name: str, dialect: str = "sqlite") -> str:
+        """Generate a typed CREATE TABLE statement for this model.
+        
+        Args:
+            table_name: Name of the table to create
+            dialect: ``sqlite`` (STRICT when enabled) or ``postgres``
+            
+        Returns:
+            SQL CREATE TABLE statement
+        """
+        columns = self._generate_ddl_columns(self.columns, dialect)
+        return self._generate_ddl_create(table_name, columns, strict=dialect == "sqlite" and self._use_strict())
+
+    def _generate_ddl_indexes(self, table_name: str, indexes: Tuple[Index, ...]) -> Tuple[str, ...]:
+        """Generate DDL CREATE INDEX statements.
+        
+        Args:
+            table_name: Name of the indexed table
+            indexes: Tuple of index declarations
+            
+        Returns:
+            Tuple of SQL CREATE INDEX statements
+        """
+        return tuple(index.ddl(table_name) for index in indexes)
     
     def _exec_app_ddl(self, query: str) -> None:
         """Execute DDL statement on app database.
@@ -145,6 +228,22 @@ class _Base(BaseModel):
             log.error(f"Target query execution failed: {e}\nQuery: {query}")
             raise DatabaseError(f"Failed to execute target query: {e}") from e
 
+    def _exec_pg_ddl(self, query: str) -> None:
+        """Execute DDL statement on the Postgres database.
+        
+        Args:
+            query: DDL statement to execute
+            
+        Raises:
+            DatabaseError: If DDL execution fails
+        """
+        try:
+            with get_db_pg() as conn:
+                conn.execute(query)
+        except Exception as e:
+            log.error(f"Postgres DDL execution failed: {e}\nQuery: {query}")
+            raise DatabaseError(f"Failed to execute Postgres DDL: {e}") from e
+
     def _auto_create_app_table(self, model: T) -> None:
         """Create table in app database if it doesn't exist.
         
@@ -154,8 +253,10 @@ class _Base(BaseModel):
         Raises:
             TableError: If table creation fails
         """
-        query = self._generate_ddl_create(model.table_name, model.columns)
+        query = model._generate_ddl_typed(model.table_name)
         self._exec_app_ddl(query)
+        for query in self._generate_ddl_indexes(model.table_name, model.indexes):
+            self._exec_app_ddl(query)
 
     def _auto_drop_app_table(self, model: T) -> None:
         """Drop table from app database if it exists.
@@ -177,8 +278,10 @@ class _Base(BaseModel):
         Raises:
             TableError: If table creation fails
         """
-        query = self._generate_ddl_create(model.table_s, model.columns)
+        query = model._generate_ddl_typed(model.table_s)
         self._exec_source_ddl(query)
+        for query in self._generate_ddl_indexes(model.table_s, model.indexes):
+            self._exec_source_ddl(query)
 
     def _auto_drop_source_table(self, model: T) -> None:
         """Drop table from source database if it exists.
@@ -191,29 +294,31 @@ class _Base(BaseModel):
         """
         self._exec_source_ddl(f'DROP TABLE IF EXISTS {model.table_s}')
 
-    def _auto_create_target_table(self) -> None:
-        """Create base table in target database if it doesn't exist.
+    def _auto_create_target_table(self, dialect: str = "sqlite") -> None:
+        """Create target table if it doesn't exist, typed from the model fields.
+        
+        Args:
+            dialect: ``sqlite`` for the target database, ``postgres`` for Postgres
         
         Raises:
             DatabaseError: If table creation fails
         """
-        ddl = '''
-            CREATE TABLE IF NOT EXISTS base_t (
-                id SERIAL PRIMARY KEY,
-                is_active BOOLEAN,
-                created_at TIMESTAMP,
-                updated_at TIMESTAMP
-            )'''
-        self._exec_target_query(ddl)
-
-    def _auto_drop_target_table(self) -> None:
-        """Drop base table from target database if it exists.
+        execute = self._exec_target_query if dialect == "sqlite" else self._exec_pg_ddl
+        execute(self._generate_ddl_typed(self.table_t, dialect))
+        for query in self._generate_ddl_indexes(self.table_t, self.indexes):
+            execute(query)
+
+    def _auto_drop_target_table(self, dialect: str = "sqlite") -> None:
+        """Drop target table if it exists.
+        
+        Args:
+            dialect: ``sqlite`` for the target database, ``postgres`` for Postgres
         
         Raises:
             DatabaseError: If table drop fails
         """
-        ddl = 'DROP TABLE IF EXISTS base_t'
-        self._exec_target_query(ddl)
+        execute = self._exec_target_query if dialect == "sqlite" else self._exec_pg_ddl
+        execute(f'DROP TABLE IF EXISTS {self.table_t}')
 
 class TimestampSchema(_Base):
     """Schema for models with timestamp fields."""
@@ -0,0 +1,181 @@
+# file: my_n8n/model/async_base.py :: 0.0.2
+# asyncio CRUD: SQLite via a bounded executor, Postgres via psycopg AsyncConnection
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from typing import Optional, TypeVar, Tuple, List, Dict, Any, Callable
+from loguru import logger as log
+
+from .base import Base
+from ._base import DatabaseError, TableError
+from .reference.base_schema import SchemaBase
+from connection.db_my_n8n import _db_manager, get_db_pg_async
+
+T = TypeVar("T", bound="AsyncBase")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared executor for blocking SQLite calls.
+
+    Sized by ``MY_N8N_ASYNC_WORKERS``, defaulting to the connection pool size,
+    so concurrent coroutines queue for a worker instead of each taking a thread.
+    """
+    global _executor
+    if _executor is None:
+        workers = int(os.environ.get('MY_N8N_ASYNC_WORKERS', _db_manager.pool_size))
+        _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="my_n8n-db")
+    return _executor
+
+
+async def run_blocking(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking database call on the shared executor."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), partial(fn, *args, **kwargs))
+
+
+class AsyncBase(Base):
+    """Base with awaitable variants of every CRUD classmethod.
+
+    Each ``a*`` method runs its synchronous counterpart on the shared executor,
+    so the event loop is never blocked by SQLite.
+    """
+
+    @classmethod
+    async def acreate(cls, table: str, columns: Tuple[str, ...], data: dict) -> Optional[dict]:
+        """Awaitable :meth:`Base.create`."""
+        return await run_blocking(cls.create, table, columns, data)
+
+    @classmethod
+    async def aget(cls, id: int) -> Optional[Dict[str, Any]]:
+        """Awaitable :meth:`Base.get`."""
+        return await run_blocking(cls.get, id)
+
+    @classmethod
+    async def aget_all(cls, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`Base.get_all`."""
+        return await run_blocking(cls.get_all, filters)
+
+    @classmethod
+    async def aupdate(cls, id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Awaitable :meth:`Base.update`."""
+        return await run_blocking(cls.update, id, data)
+
+    @classmethod
+    async def adelete(cls, id: int) -> bool:
+        """Awaitable :meth:`Base.delete`."""
+        return await run_blocking(cls.delete, id)
+
+    @classmethod
+    async def abatch_create(cls, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Awaitable :meth:`Base.batch_create`."""
+        return await run_blocking(cls.batch_create, records)
+
+
+class AsyncBaseSchema(SchemaBase):
+    """Async Postgres CRUD with the same interface as ``reference/base_schema.BaseSchema``.
+
+    Statements come from the shared ``SchemaBase`` builders; only execution
+    is async, on pooled psycopg ``AsyncConnection`` objects from
+    ``get_db_pg_async``.
+    """
+
+    @classmethod
+    async def execute_query(cls, query: str, params: tuple = (), fetch: Optional[str] = "one"):
+        """Helper method to execute a query and fetch results."""
+        try:
+            async with get_db_pg_async() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, params)
+                    if fetch == "one":
+                        return await cursor.fetchone()
+                    elif fetch == "all":
+                        return await cursor.fetchall()
+                    return None  # For operations like DELETE or UPDATE
+        except Exception as e:
+            log.error(f"Error executing query on {cls.table_name}: {e}")
+            raise
+
+    @classmethod
+    async def create_record(cls, **kwargs) -> Optional[dict]:
+        """Insert a new record and return it."""
+        result = await cls.execute_query(*cls._insert_query(kwargs))
+        return cls.transform_record(result)
+
+    @classmethod
+    async def get_record(cls, id: int) -> Optional[dict]:
+        """Fetch a single record by ID."""
+        result = await cls.execute_query(*cls._select_query({"id": id}))
+        return cls.transform_record(result)
+
+    @classmethod
+    async def get_all_records(cls) -> list[dict]:
+        """Fetch all records."""
+        results = await cls.execute_query(*cls._select_query(), fetch="all")
+        return [cls.transform_record(record) for record in results]
+
+    @classmethod
+    async def update_record(cls, id: int, **kwargs) -> Optional[dict]:
+        """Update a record by ID."""
+        update = cls._update_query(id, kwargs)
+        if update is None:
+            return None
+        result = await cls.execute_query(*update)
+        return cls.transform_record(result)
+
+    @classmethod
+    async def delete_record(cls, id: int) -> bool:
+        """Delete a record by ID."""
+        await cls.execute_query(*cls._delete_query(id), fetch=None)
+        return True
+
+    @classmethod
+    async def filter_records(cls, **kwargs) -> list[dict]:
+        """Filter records based on criteria."""
+        results = await cls.execute_query(*cls._select_query(kwargs), fetch="all")
+        return [cls.transform_record(record) for record in results]
+
+
+# Example usage:
+if __name__ == "__main__":
+    async def main() -> None:
+        m = AsyncBase()
+        m._auto_drop_app_table(m)
+        m._auto_create_app_table(m)
+
+        now = datetime.now(timezone.utc)
+        data = {"is_active": True, "created_at": now, "updated_at": now}
+
+        # Many concurrent creates share the bounded executor and connection pool
+        created = await asyncio.gather(*(AsyncBase.acreate(m.table_name, m.columns, dict(data))
+                                         for _ in range(200)))
+        print(f"Created {len(created)} records concurrently")
+
+        record = await AsyncBase.aget(created[0]["id"])
+        print(f"Retrieved record: {record}")
+
+        updated = await AsyncBase.aupdate(record["id"], {"is_active": False})
+        print(f"Updated record: {updated}")
+
+        batch = await AsyncBase.abatch_create([dict(data), dict(data)])
+        print(f"Batch created records: {len(batch)}")
+
+        deleted = await AsyncBase.adelete(record["id"])
+        print(f"Record deleted: {deleted}")
+
+        remaining = await AsyncBase.aget_all({"is_active": True})
+        print(f"Active records: {len(remaining)}")
+
+    try:
+        asyncio.run(main())
+    except (DatabaseError, TableError) as e:
+        log.error(f"Database operation failed: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error: {e}")
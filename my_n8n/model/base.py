@@ -1,19 +1,183 @@
-# file: my_n8n/model/base.py :: 0.0.5
+# file: my_n8n/model/base.py :: 0.0.23
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
+import base64
+import json
+import sqlite3
+import time
+from collections import namedtuple
 from datetime import datetime, timezone
-from typing import Optional, TypeVar, Tuple, ClassVar, List, Dict, Any
-from ._base import _Base, DatabaseError, TableError
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, TypeVar, Tuple, ClassVar, List, Dict, Any, Iterable, Iterator, Callable
+from ._base import _Base, DatabaseError, TableError, Index
+from .cache import RecordCache
+from .query import Query
+from .validation import IngestReport, validate_batch
 from pydantic import Field, model_serializer
 from loguru import logger as log
 from contextlib import contextmanager
 
-from connection.db_my_n8n import get_db_app, get_db_source, get_db_target
+from connection.db_my_n8n import (get_db_app, get_db_source, get_db_target, transaction, in_transaction,
+                                  after_commit)
+from connection.metrics import timed_operation
    
 T = TypeVar("T", bound="Base")
 
+# SQLITE_MAX_VARIABLE_NUMBER defaults: 999 before 3.32.0, 32766 since
+_SQLITE_DEFAULT_MAX_PARAMS = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
+
+
+def _max_params(conn: sqlite3.Connection) -> int:
+    """Bound-parameter limit of a connection."""
+    if hasattr(conn, "getlimit"):
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    return _SQLITE_DEFAULT_MAX_PARAMS
+
+
+def _chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split any iterable into lists of at most ``size`` items."""
+    it = iter(records)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _field(record: Any, name: str) -> Any:
+    """Value of ``name`` in a dict or an object with attributes, None if absent."""
+    return record.get(name) if isinstance(record, dict) else getattr(record, name, None)
+
+
+def _encode_cursor(values: Iterable[Any]) -> str:
+    """Opaque pagination cursor for the ordering values of the last row."""
+    return base64.urlsafe_b64encode(json.dumps(list(values), default=str).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> List[Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+class ModelSQL:
+    """Precompiled SQL and column metadata for one table.
+    
+    Built once per model class (see ``Base._sql``) so CRUD calls neither
+    instantiate the model nor rebuild SQL strings and column names.
+    """
+    __slots__ = ("table", "names", "insert_names", "select_by_id", "select_all",
+                 "delete_by_id", "insert", "insert_returning", "row_type", "_updates", "_selects")
+
+    def __init__(self, table: str, columns: Tuple[str, ...]):
+        self.table = table
+        self.names = tuple(col.split()[0] for col in columns)
+        # Skip id column as it's auto-generated
+        self.insert_names = tuple(col.split()[0] for col in columns if not col.startswith('id'))
+        placeholders = ", ".join(["?"] * len(self.insert_names))
+        self.select_by_id = f"SELECT * FROM {table} WHERE id = ?"
+        self.select_all = f"SELECT * FROM {table}"
+        self.delete_by_id = f"DELETE FROM {table} WHERE id = ?"
+        self.insert = f"INSERT INTO {table} ({', '.join(self.insert_names)}) VALUES ({placeholders})"
+        self.insert_returning = self.insert + " RETURNING *"
+        # tuple subclass with named fields: no per-row dict
+        self.row_type = namedtuple(f"{table}_row", self.names)
+        self._updates: Dict[Tuple[str, ...], str] = {}
+        self._selects: Dict[Tuple[str, ...], str] = {}
+
+    def select_where(self, keys: Tuple[str, ...]) -> str:
+        """``SELECT * ... WHERE k = ? AND ...`` for equality filters, cached by column tuple."""
+        query = self._selects.get(keys)
+        if query is None:
+            query = self.select_all
+            if keys:
+                query += " WHERE " + " AND ".join(f"{k} = ?" for k in keys)
+            self._selects[keys] = query
+        return query
+
+    def update_by_id(self, keys: Tuple[str, ...]) -> str:
+        """``UPDATE ... WHERE id = ? RETURNING *`` for a set of columns, cached by column tuple."""
+        query = self._updates.get(keys)
+        if query is None:
+            set_clause = ", ".join(f"{k} = ?" for k in keys)
+            query = self._updates[keys] = f"UPDATE {self.table} SET {set_clause} WHERE id = ? RETURNING *"
+        return query
+
+    def to_dict(self, row: Any) -> Dict[str, Any]:
+        """Map a result row onto the column names."""
+        return dict(zip(self.names, row))
+
+    def hydrator(self, mode: str, model: Optional[type] = None) -> Callable[[Any], Any]:
+        """Row converter for a result mode.
+        
+        Args:
+            mode: ``rows`` (dict), ``tuples`` (``row_type`` namedtuple) or
+                ``models`` (unvalidated instances, see ``_constructor``)
+            model: Model class for ``models``
+            
+        Returns:
+            Callable taking one result row
+        """
+        if mode == "rows":
+            return self.to_dict
+        if mode == "tuples":
+            return self.row_type._make
+        if mode == "models":
+            return _constructor(model, self.names)
+        raise ValueError(f"Unknown result mode: {mode}")
+
+
+def _constructor(model: type, names: Tuple[str, ...]) -> Callable[[Any], Any]:
+    """Build unvalidated model instances from rows, like ``model_construct``.
+    
+    ``model_construct`` resolves aliases and defaults in Python on every
+    call, which costs more than validating. Here the column -> field mapping
+    and the defaults of fields without a column are worked out once, and
+    each row only fills ``__dict__``. Models with private attributes or a
+    post-init hook go through ``model_construct``.
+    """
+    fields = model.model_fields
+    if model.__private_attributes__ or model.__pydantic_post_init__:
+        construct = model.model_construct
+        return lambda row: construct(**{n: v for n, v in zip(names, row) if n in fields})
+    keep = [i for i, name in enumerate(names) if name in fields]
+    kept = tuple(names[i] for i in keep)
+    defaults = {name: f.default for name, f in fields.items() if name not in kept and f.default_factory is None}
+    factories = [(name, f.default_factory) for name, f in fields.items()
+                 if name not in kept and f.default_factory is not None]
+    fields_set = frozenset(kept)
+    new, setattr_ = model.__new__, object.__setattr__
+
+    def construct(row: Any) -> Any:
+        data = dict(defaults)
+        data.update(zip(kept, [row[i] for i in keep]))
+        for name, factory in factories:
+            data[name] = factory()
+        obj = new(model)
+        setattr_(obj, "__dict__", data)
+        setattr_(obj, "__pydantic_fields_set__", set(fields_set))
+        setattr_(obj, "__pydantic_extra__", None)
+        setattr_(obj, "__pydantic_private__", None)
+        return obj
+    return construct
+
+
+@lru_cache(maxsize=None)
+def _statements(table: str, columns: Tuple[str, ...]) -> ModelSQL:
+    return ModelSQL(table, columns)
+
+
+def _run_app_query(query: str, params: List[Any]) -> Tuple[List[str], List[Any]]:
+    """Query runner for ``Query`` objects bound to the app database."""
+    with get_db_app() as conn:
+        cur = conn.execute(query, params)
+        return [d[0] for d in cur.description], cur.fetchall()
+
+
+_MODEL_SQL: Dict[type, ModelSQL] = {}
+_CACHES: Dict[type, RecordCache] = {}
+
 class Base(_Base):
     """Base class for all models with CRUD operations and database management."""
     table_name: str = "base"
@@ -27,6 +191,10 @@ class Base(_Base):
         "created_at", 
         "updated_at",
         *_Base.columns)
+    # keyset paging and incremental sync walk (updated_at, id)
+    indexes: ClassVar[Tuple[Index, ...]] = (
+        Index(columns=("updated_at", "id")),
+        *_Base.indexes)
     _sample = {
         "is_active": True,
         "created_at": "2023-01-01T00:00:00",
@@ -53,7 +221,106 @@ class Base(_Base):
         exclude_fields = exclude_fields or {"id2", "created_at", "updated_at"}
         return self.model_dump(exclude=exclude_fields)
 
+    def validated(self: T) -> T:
+        """Validate an instance built without validation (``as_="models"``).
+        
+        Values are coerced from their stored form (e.g. ISO text to datetime),
+        so the model's strict mode is relaxed for this check.
+        
+        Returns:
+            A new, validated instance
+        
+        Raises:
+            ValidationError: If the stored values do not fit the model
+        """
+        return type(self).model_validate(self.__dict__, strict=False)
+
+    @classmethod
+    def _sql(cls) -> ModelSQL:
+        """Precompiled statements for this model's table, built on first use."""
+        sql = _MODEL_SQL.get(cls)
+        if sql is None:
+            field = cls.model_fields.get("table_name")
+            table = field.default if field is not None else cls.table_name
+            sql = _MODEL_SQL[cls] = _statements(table, cls.columns)
+        return sql
+
+    @classmethod
+    def enable_cache(cls, max_entries: int = 10_000, ttl: Optional[float] = 300.0,
+                     max_bytes: Optional[int] = None) -> RecordCache:
+        """Put a read-through LRU/TTL cache in front of :meth:`get` for this model.
+        
+        ``update``, ``delete``, ``batch_create`` and ``bulk_upsert`` on the
+        model invalidate affected ids after they commit. Misses are not
+        cached, so inserts cannot leave stale entries. Writes from other
+        processes are only picked up once entries expire after ``ttl``.
+        
+        Args:
+            max_entries: Maximum number of cached records
+            ttl: Seconds a record stays valid, None for no expiry
+            max_bytes: Approximate memory budget, None for no limit
+            
+        Returns:
+            The model's cache
+        """
+        cache = _CACHES[cls] = RecordCache(max_entries=max_entries, ttl=ttl, max_bytes=max_bytes)
+        return cache
+
+    @classmethod
+    def disable_cache(cls) -> None:
+        """Remove this model's read-through cache."""
+        _CACHES.pop(cls, None)
+
+    @classmethod
+    def cache_stats(cls) -> Optional[Dict[str, Any]]:
+        """Hit/miss/eviction counters of this model's cache, None when disabled."""
+        cache = _CACHES.get(cls)
+        return cache.stats() if cache is not None else None
+
+    @classmethod
+    def _invalidate(cls, ids: Optional[Iterable[Any]] = None) -> None:
+        """Drop ids (or everything, when None) from this model's cache once the write commits.
+        
+        Inside ``transaction()`` the ids are held until the outermost block
+        commits (and dropped if it rolls back): invalidating earlier would
+        let a concurrent ``get`` re-cache the pre-commit row for good.
+        """
+        cache = _CACHES.get(cls)
+        if cache is not None:
+            if ids is None:
+                after_commit(cache.clear)
+            else:
+                ids = list(ids)
+                after_commit(lambda: cache.invalidate(ids))
+
+    @classmethod
+    def transaction(cls):
+        """Unit of work on the app database, for use as a context manager.
+        
+        Every ``create``/``update``/``delete``/batch call made on this thread
+        inside the block shares one connection and one commit; an exception
+        rolls all of them back. Nested blocks are savepoints::
+        
+            with Base.transaction():
+                for data in records:
+                    Base.create(table, columns, data)
+                try:
+                    with Base.transaction():
+                        Base.delete(old_id)
+                        raise ValueError("undo only the delete")
+                except ValueError:
+                    pass
+        
+        Periodic commits of ``bulk_insert``/``ingest`` are suspended inside
+        the block, and ``get`` does not cache rows it reads there.
+        
+        Returns:
+            Context manager yielding the shared connection
+        """
+        return transaction('app')
+
     @classmethod
+    @timed_operation()
     def create(cls, table: str, columns: Tuple[str, ...], data: dict) -> Optional[dict]:
         """Create a new record in the database.
         
@@ -66,30 +333,24 @@ class Base(_Base):
             Dict containing the created record or None if creation failed
         """
         try:
-            # Skip id column as it's auto-generated
-            insert_columns = [col.split()[0] for col in columns if not col.startswith('id')]
-            query = f"""
-                INSERT INTO {table} ({', '.join(insert_columns)})
-                VALUES ({', '.join(['?'] * len(insert_columns))})
-                RETURNING *"""
-
-            values = tuple(data[col] for col in insert_columns)
+            sql = _statements(table, tuple(columns))
+            values = tuple(data[col] for col in sql.insert_names)
             result = None
             
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, values)
-                    result = cur.fetchone()
+                cur = conn.cursor()
+                cur.execute(sql.insert_returning, values)
+                result = cur.fetchone()
                     
             if result:
-                return {col.split()[0]: value for col, value in zip(columns, result)}
+                return sql.to_dict(result)
             return None
         except Exception as e:
             log.error(f"Error creating record: {e}")
             raise
 
     @classmethod
+    @timed_operation()
     def get(cls, id: int) -> Optional[Dict[str, Any]]:
         """Retrieve a single record by ID.
         
@@ -100,57 +361,201 @@ class Base(_Base):
             Dict containing the record or None if not found
         """
         try:
-            instance = cls()
-            query = f"SELECT * FROM {instance.table_name} WHERE id = ?"
-            result = None
-            
+            # no cache enabled on any model: straight to the statement
+            cache = _CACHES.get(cls) if _CACHES else None
+            if cache is None:
+                sql = cls._sql()
+                with get_db_app() as conn:
+                    result = conn.execute(sql.select_by_id, (id,)).fetchone()
+                return sql.to_dict(result) if result else None
+
+            record = cache.get(id)
+            if record is not None:
+                return record
+            version = cache.version
+            sql = cls._sql()
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, (id,))
-                    result = cur.fetchone()
-                    
+                result = conn.execute(sql.select_by_id, (id,)).fetchone()
             if result:
-                return {col.split()[0]: value for col, value in zip(cls.columns, result)}
+                record = sql.to_dict(result)
+                # uncommitted rows must not outlive a rolled-back transaction
+                if not in_transaction('app'):
+                    cache.put(id, record, version)
+                return record
             return None
         except Exception as e:
             log.error(f"Error retrieving record: {e}")
             raise
 
     @classmethod
-    def get_all(cls, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    @timed_operation()
+    def get_all(cls, filters: Optional[Dict[str, Any]] = None, as_: str = "rows",
+                dtypes: Optional[Dict[str, Any]] = None) -> Any:
         """Retrieve all records with optional filtering.
         
         Args:
             filters: Optional dict of column:value pairs for filtering
+            as_: Result mode:
+                ``rows`` a list of dicts;
+                ``tuples`` a list of per-model namedtuples (``ModelSQL.row_type``),
+                a fraction of the memory of dicts;
+                ``models`` a list of model instances built like
+                ``model_construct``, skipping validation of data we stored
+                ourselves (call ``.validated()`` to check one). Columns
+                without a model field are dropped, so use a model that
+                declares ``id`` (e.g. ``BaseResponse``) to keep it;
+                ``columns`` a dict of NumPy arrays per column (see
+                ``columnar.fetch_columns``)
+            dtypes: Optional column name -> NumPy dtype overrides for ``columns``
             
         Returns:
-            List of dicts containing the matching records
+            List of matching records in the requested form, or a dict of
+            column arrays when ``as_="columns"``
         """
+        if as_ not in ("rows", "tuples", "models", "columns"):
+            raise ValueError(f"Unknown result mode: {as_}")
         try:
-            instance = cls()
-            query = f"SELECT * FROM {instance.table_name}"
-            params = []
-            
-            if filters:
-                conditions = [f"{k} = ?" for k in filters.keys()]
-                query += " WHERE " + " AND ".join(conditions)
-                params = list(filters.values())
+            sql = cls._sql()
+            filters = filters or {}
+            query = sql.select_where(tuple(filters.keys()))
+            params = list(filters.values())
+
+            if as_ == "columns":
+                from .columnar import fetch_columns
+                with get_db_app() as conn:
+                    return fetch_columns(conn, query, tuple(params), dtypes=dtypes)
             
             results = None
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, tuple(params))
-                    results = cur.fetchall()
+                cur = conn.cursor()
+                cur.execute(query, tuple(params))
+                results = cur.fetchall()
                     
-            return [{col.split()[0]: value for col, value in zip(cls.columns, row)} 
-                    for row in results] if results else []
+            hydrate = sql.hydrator(as_, cls)
+            return [hydrate(row) for row in results] if results else []
         except Exception as e:
             log.error(f"Error retrieving records: {e}")
             raise
 
     @classmethod
+    def iter_all(cls, filters: Optional[Dict[str, Any]] = None,
+                 batch_size: int = 1_000, as_: str = "rows") -> Iterator[Any]:
+        """Lazily yield all records with optional filtering.
+        
+        Rows are read ``batch_size`` at a time with ``fetchmany``, so memory
+        stays flat regardless of table size. A pooled connection is held
+        until the generator is exhausted or closed.
+        
+        Args:
+            filters: Optional dict of column:value pairs for filtering
+            batch_size: Rows per ``fetchmany``
+            as_: ``rows``, ``tuples`` or ``models``, as in ``get_all``
+            
+        Yields:
+            Dict (namedtuple, model) per matching record
+        """
+        try:
+            sql = cls._sql()
+            filters = filters or {}
+            query = sql.select_where(tuple(filters.keys()))
+            to_dict = sql.hydrator(as_, cls)
+            with get_db_app() as conn:
+                cur = conn.cursor()
+                cur.execute(query, tuple(filters.values()))
+                while rows := cur.fetchmany(batch_size):
+                    for row in rows:
+                        yield to_dict(row)
+        except Exception as e:
+            log.error(f"Error iterating records: {e}")
+            raise
+
+    @classmethod
+    @timed_operation()
+    def get_page(cls, after: Optional[str] = None, limit: int = 100,
+                 order_by: Tuple[str, ...] = ("id",), filters: Optional[Dict[str, Any]] = None,
+                 descending: bool = False) -> Dict[str, Any]:
+        """Retrieve one page of records using keyset pagination.
+        
+        Seeks past the last row of the previous page with a row-value
+        comparison on ``order_by`` instead of OFFSET, so every page costs
+        the same given an index on the ordering columns. ``id`` is appended
+        as tiebreaker when missing, e.g. ``order_by=("updated_at",)`` pages
+        on ``(updated_at, id)``.
+        
+        Args:
+            after: Cursor returned by the previous page, None for the first page
+            limit: Maximum records per page
+            order_by: Ordering columns
+            filters: Optional dict of column:value pairs for filtering
+            descending: Page from the highest keys down
+            
+        Returns:
+            Dict with ``items`` (list of records) and ``next_cursor`` (None on the last page)
+            
+        Raises:
+            ValueError: If ``limit`` is below 1, ``order_by`` names unknown
+                columns or the cursor does not match ``order_by``
+        """
+        try:
+            if limit < 1:
+                raise ValueError(f"Page limit must be at least 1, got {limit}")
+            sql = cls._sql()
+            order_by = tuple(order_by)
+            if "id" not in order_by:
+                order_by += ("id",)
+            unknown = [col for col in order_by if col not in sql.names]
+            if unknown:
+                raise ValueError(f"Cannot order by unknown columns: {unknown}")
+            filters = filters or {}
+            conditions = [f"{k} = ?" for k in filters.keys()]
+            params = list(filters.values())
+            if after is not None:
+                values = _decode_cursor(after)
+                if len(values) != len(order_by):
+                    raise ValueError("Pagination cursor does not match order_by")
+                conditions.append(f"({', '.join(order_by)}) {'<' if descending else '>'} "
+                                  f"({', '.join(['?'] * len(order_by))})")
+                params.extend(values)
+            direction = " DESC" if descending else ""
+            query = sql.select_all
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
+            query += f" ORDER BY {', '.join(col + direction for col in order_by)} LIMIT ?"
+            # one extra row tells whether another page follows
+            params.append(limit + 1)
+
+            with get_db_app() as conn:
+                rows = conn.execute(query, params).fetchall()
+
+            items = [sql.to_dict(row) for row in rows[:limit]]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = _encode_cursor(items[-1][col] for col in order_by)
+            return {"items": items, "next_cursor": next_cursor}
+        except Exception as e:
+            log.error(f"Error retrieving page: {e}")
+            raise
+
+    @classmethod
+    def select(cls, *exprs: str) -> Query:
+        """Start a query on this model's table that runs in the database engine.
+        
+        Supports ranges, IN lists, prefix matches, NULL checks, ordering,
+        limits and COUNT/SUM aggregates (see ``query.Query``), e.g.
+        ``Base.select().where("created_at", ">=", since).order_by("-id").limit(10).all()``.
+        
+        Args:
+            *exprs: Optional output columns or aggregates; all columns by default
+            
+        Returns:
+            Query bound to the app database
+        """
+        sql = cls._sql()
+        query = Query(sql.table, sql.names, runner=_run_app_query)
+        return query.select(*exprs) if exprs else query
+
+    @classmethod
+    @timed_operation()
     def update(cls, id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a record by ID.
         
@@ -162,30 +567,26 @@ class Base(_Base):
             Dict containing the updated record or None if update failed
         """
         try:
-            instance = cls()
+            sql = cls._sql()
             data["updated_at"] = datetime.now(timezone.utc)
-            set_clause = ", ".join(f"{k} = ?" for k in data.keys())
-            query = f"""
-                UPDATE {instance.table_name}
-                SET {set_clause}
-                WHERE id = ?
-                RETURNING *"""
+            query = sql.update_by_id(tuple(data.keys()))
             
             result = None
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, (*data.values(), id))
-                    result = cur.fetchone()
+                cur = conn.cursor()
+                cur.execute(query, (*data.values(), id))
+                result = cur.fetchone()
+            cls._invalidate((id,))
                     
             if result:
-                return {col.split()[0]: value for col, value in zip(cls.columns, result)}
+                return sql.to_dict(result)
             return None
         except Exception as e:
             log.error(f"Error updating record: {e}")
             raise
 
     @classmethod
+    @timed_operation()
     def delete(cls, id: int) -> bool:
         """Delete a record by ID.
         
@@ -196,23 +597,26 @@ class Base(_Base):
             True if deletion was successful, False otherwise
         """
         try:
-            instance = cls()
-            query = f"DELETE FROM {instance.table_name} WHERE id = ?"
+            query = cls._sql().delete_by_id
             
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, (id,))
-                    rows_affected = cur.rowcount
-                    return rows_affected > 0
+                cur = conn.cursor()
+                cur.execute(query, (id,))
+                rows_affected = cur.rowcount
+            cls._invalidate((id,))
+            return rows_affected > 0
         except Exception as e:
             log.error(f"Error deleting record: {e}")
             raise
 
     @classmethod
+    @timed_operation()
     def batch_create(cls, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Create multiple records in a single transaction.
         
+        Rows are sent as multi-row INSERTs sized to stay under SQLite's
+        bound-parameter limit.
+        
         Args:
             records: List of dicts containing record data
             
@@ -220,31 +624,257 @@ class Base(_Base):
             List of created records
         """
         try:
-            instance = cls()
-            # Skip id column as it's auto-generated
-            insert_columns = [col.split()[0] for col in cls.columns if not col.startswith('id')]
-            placeholders = ", ".join(["(" + ", ".join(["?"] * len(insert_columns)) + ")"] * len(records))
-            query = f"""
-                INSERT INTO {instance.table_name} ({', '.join(insert_columns)})
-                VALUES {placeholders}
-                RETURNING *"""
-            
-            values = []
-            for record in records:
-                values.extend(record.get(col) for col in insert_columns)
-            
-            results = None
+            sql = cls._sql()
+            insert_columns = sql.insert_names
+            results = []
             with get_db_app() as conn:
-                with conn:
-                    cur = conn.cursor()
-                    cur.execute(query, tuple(values))
-                    results = cur.fetchall()
+                cur = conn.cursor()
+                rows_per_chunk = max(1, _max_params(conn) // max(1, len(insert_columns)))
+                for chunk in _chunked(records, rows_per_chunk):
+                    placeholders = ", ".join(["(" + ", ".join(["?"] * len(insert_columns)) + ")"] * len(chunk))
+                    query = f"""
+                        INSERT INTO {sql.table} ({', '.join(insert_columns)})
+                        VALUES {placeholders}
+                        RETURNING *"""
+                    values = [record.get(col) for record in chunk for col in insert_columns]
+                    cur.execute(query, values)
+                    results.extend(cur.fetchall())
+            records = [sql.to_dict(row) for row in results] if results else []
+            cls._invalidate(record["id"] for record in records)
                     
-            return [{col.split()[0]: value for col, value in zip(cls.columns, row)} 
-                    for row in results] if results else []
+            return records
         except Exception as e:
             log.error(f"Error batch creating records: {e}")
             raise
+
+    @classmethod
+    @timed_operation()
+    def bulk_insert(cls, records: Iterable[Dict[str, Any]], chunk_size: int = 10_000,
+                    commit_every: int = 10) -> int:
+        """Insert records from any iterable or generator in chunks.
+        
+        Only one chunk is materialized at a time; each chunk is written with
+        ``executemany`` and the transaction is committed every
+        ``commit_every`` chunks.
+        
+        Args:
+            records: Iterable of dicts containing record data
+            chunk_size: Rows per ``executemany`` call
+            commit_every: Chunks per commit
+            
+        Returns:
+            Number of inserted rows
+        """
+        try:
+            sql = cls._sql()
+            insert_columns = sql.insert_names
+            total = 0
+            with get_db_app() as conn:
+                cur = conn.cursor()
+                for n, chunk in enumerate(_chunked(records, chunk_size), start=1):
+                    cur.executemany(sql.insert, [tuple(record.get(col) for col in insert_columns)
+                                                 for record in chunk])
+                    total += len(chunk)
+                    if n % commit_every == 0 and not in_transaction('app'):
+                        conn.commit()
+            return total
+        except Exception as e:
+            log.error(f"Error bulk inserting records: {e}")
+            raise
+
+    @classmethod
+    @timed_operation()
+    def ingest(cls, records: Iterable[Any], trusted: bool = False, strict: Optional[bool] = None,
+               chunk_size: int = 10_000, commit_every: int = 10,
+               max_rejects: int = 1_000) -> IngestReport:
+        """Validate and insert records in batches, collecting bad rows instead of failing.
+        
+        Each chunk is validated in one call through a cached
+        ``TypeAdapter(List[cls])`` (see ``validation.validate_batch``), so
+        defaults are filled and types checked without constructing models
+        one by one. Rows that fail are reported in ``rejects`` with their
+        input index and errors; the rest are inserted with ``executemany``.
+        Table columns the model has no field for keep the record's own value,
+        as with ``trusted=True``. Only the first ``max_rejects`` rejects are
+        kept in the report; all are counted in ``rejected``.
+        
+        With ``trusted=True`` validation is skipped and dicts are inserted
+        as given, for sources that are already known to be clean (e.g. our
+        own exports).
+        
+        Args:
+            records: Iterable of dicts (or objects with attributes)
+            trusted: Skip validation
+            strict: Override the model's strict mode, e.g. False for text input
+            chunk_size: Rows per validation batch and ``executemany`` call
+            commit_every: Chunks per commit
+            max_rejects: Rejects kept in the report
+            
+        Returns:
+            IngestReport with counts, rejects and timing
+        """
+        try:
+            start = time.perf_counter()
+            sql = cls._sql()
+            insert_columns = sql.insert_names
+            report = IngestReport(table=sql.table, trusted=trusted)
+            with get_db_app() as conn:
+                cur = conn.cursor()
+                for n, chunk in enumerate(_chunked(records, chunk_size), start=1):
+                    if trusted:
+                        rows = [tuple(_field(record, col) for col in insert_columns) for record in chunk]
+                    else:
+                        valid, rejects = validate_batch(cls, chunk, strict, offset=report.received)
+                        report.rejected += len(rejects)
+                        report.rejects.extend(rejects[:max_rejects - len(report.rejects)])
+                        skip = {r.index - report.received for r in rejects}
+                        kept = (record for i, record in enumerate(chunk) if i not in skip)
+                        # model fields win; columns without a field are taken from the record
+                        rows = [tuple(obj.__dict__.get(col, _field(record, col)) for col in insert_columns)
+                                for obj, record in zip(valid, kept)]
+                    cur.executemany(sql.insert, rows)
+                    report.received += len(chunk)
+                    report.inserted += len(rows)
+                    if n % commit_every == 0 and not in_transaction('app'):
+                        conn.commit()
+            report.seconds = time.perf_counter() - start
+            if report.rejected:
+                log.warning(f"Rejected {report.rejected} of {report.received} records for {sql.table}")
+            return report
+        except Exception as e:
+            log.error(f"Error ingesting records: {e}")
+            raise
+
+    @classmethod
+    def bulk_insert_ids(cls, records: Iterable[Dict[str, Any]], chunk_size: Optional[int] = None,
+                        commit_every: int = 10) -> Iterator[int]:
+        """Insert records from any iterable and stream back their generated ids.
+        
+        Each chunk is one multi-row ``INSERT ... RETURNING id``, sized to
+        the bound-parameter limit unless ``chunk_size`` is smaller. Ids are
+        yielded after every ``commit_every`` chunks, so the caller must
+        consume the generator for the insert to run to completion.
+        
+        The generator keeps the thread's pooled connection checked out while
+        suspended, so ``get_db_app`` blocks run by the caller between ids
+        share it. Chunks are therefore committed before their ids are
+        yielded: such a block never commits (or rolls back) a partial batch.
+        Inside ``transaction('app')`` nothing is committed here and the
+        whole unit of work commits together.
+        
+        Args:
+            records: Iterable of dicts containing record data
+            chunk_size: Maximum rows per statement
+            commit_every: Chunks per commit (and per batch of yielded ids)
+            
+        Yields:
+            Generated id of each inserted row, in input order
+        """
+        try:
+            sql = cls._sql()
+            insert_columns = sql.insert_names
+            row_placeholder = "(" + ", ".join(["?"] * len(insert_columns)) + ")"
+            with get_db_app() as conn:
+                cur = conn.cursor()
+                rows_per_chunk = max(1, _max_params(conn) // max(1, len(insert_columns)))
+                if chunk_size:
+                    rows_per_chunk = min(rows_per_chunk, chunk_size)
+                ids: List[int] = []
+                for n, chunk in enumerate(_chunked(records, rows_per_chunk), start=1):
+                    query = f"""
+                        INSERT INTO {sql.table} ({', '.join(insert_columns)})
+                        VALUES {', '.join([row_placeholder] * len(chunk))}
+                        RETURNING id"""
+                    cur.execute(query, [record.get(col) for record in chunk for col in insert_columns])
+                    ids.extend(row[0] for row in cur.fetchall())
+                    if n % commit_every == 0:
+                        # no uncommitted rows of ours while the caller runs
+                        if not in_transaction('app'):
+                            conn.commit()
+                        yield from ids
+                        ids = []
+                if ids:
+                    if not in_transaction('app'):
+                        conn.commit()
+                    yield from ids
+        except Exception as e:
+            log.error(f"Error bulk inserting records: {e}")
+            raise
+        
+    @classmethod
+    @timed_operation()
+    def bulk_upsert(cls, records: Iterable[Dict[str, Any]], conflict_keys: Tuple[str, ...] = ("id",),
+                    update_columns: Optional[Tuple[str, ...]] = None,
+                    chunk_size: int = 10_000) -> Dict[str, int]:
+        """Insert or update records in batches inside one transaction.
+        
+        Compiles to ``INSERT ... ON CONFLICT (conflict_keys) DO UPDATE``. Keys
+        repeated within a batch keep the last record. Existing keys are
+        counted per batch to report inserted vs updated rows. Records with a
+        NULL or missing key column cannot conflict and are inserted as-is.
+        
+        Args:
+            records: Iterable of dicts containing record data
+            conflict_keys: Columns of a unique index/primary key to merge on
+            update_columns: Columns overwritten on conflict; defaults to every
+                inserted column except the keys and ``created_at``
+            chunk_size: Maximum rows per batch
+            
+        Returns:
+            Dict with ``inserted`` and ``updated`` counts
+        """
+        try:
+            sql = cls._sql()
+            insert_columns = [col for col in sql.names if col != 'id' or col in conflict_keys]
+            if update_columns is None:
+                update_columns = tuple(col for col in insert_columns
+                                       if col not in conflict_keys and col != 'created_at')
+            updates = ", ".join(f"{col} = excluded.{col}" for col in update_columns)
+            query = f"""
+                INSERT INTO {sql.table} ({', '.join(insert_columns)})
+                VALUES ({', '.join(['?'] * len(insert_columns))})
+                ON CONFLICT ({', '.join(conflict_keys)})
+                {f'DO UPDATE SET {updates}' if updates else 'DO NOTHING'}"""
+
+            counts = {"inserted": 0, "updated": 0}
+            upserted_ids: List[Any] = []
+            with get_db_app() as conn:
+                cur = conn.cursor()
+                rows_per_chunk = min(chunk_size, max(1, _max_params(conn) // len(conflict_keys)))
+                for chunk in _chunked(records, rows_per_chunk):
+                    batch: Dict[tuple, Dict[str, Any]] = {}
+                    keyless: List[Dict[str, Any]] = []
+                    for record in chunk:
+                        key = tuple(record.get(k) for k in conflict_keys)
+                        if None in key:
+                            keyless.append(record)
+                        else:
+                            batch[key] = record
+                    if keyless:
+                        cur.executemany(query, [tuple(record.get(col) for col in insert_columns)
+                                                for record in keyless])
+                        counts["inserted"] += len(keyless)
+                    if not batch:
+                        continue
+                    if len(conflict_keys) == 1:
+                        match = f"{conflict_keys[0]} IN ({', '.join(['?'] * len(batch))})"
+                    else:
+                        row = "(" + ", ".join(["?"] * len(conflict_keys)) + ")"
+                        match = f"({', '.join(conflict_keys)}) IN (VALUES {', '.join([row] * len(batch))})"
+                    cur.execute(f"SELECT COUNT(*) FROM {sql.table} WHERE {match}",
+                                [v for key in batch for v in key])
+                    existing = cur.fetchone()[0]
+                    cur.executemany(query, [tuple(record.get(col) for col in insert_columns)
+                                            for record in batch.values()])
+                    counts["updated"] += existing
+                    counts["inserted"] += len(batch) - existing
+                    if conflict_keys == ("id",):
+                        upserted_ids.extend(key[0] for key in batch)
+            cls._invalidate(upserted_ids if conflict_keys == ("id",) else None)
+            return counts
+        except Exception as e:
+            log.error(f"Error upserting records: {e}")
+            raise
         
 class BaseResponse(Base):
     """Response model that includes the id after database insertion"""
@@ -300,14 +930,109 @@ if __name__ == "__main__":
         
         batch_created = Base.batch_create(batch_data)
         print(f"Batch created records: {batch_created}")
+
+        # Test streaming bulk insert from a generator
+        rows = ({"is_active": i % 2 == 0,
+                 "created_at": datetime.now(timezone.utc),
+                 "updated_at": datetime.now(timezone.utc)} for i in range(50_000))
+        print(f"Bulk inserted records: {Base.bulk_insert(rows)}")
+
+        rows = ({"is_active": True,
+                 "created_at": datetime.now(timezone.utc),
+                 "updated_at": datetime.now(timezone.utc)} for _ in range(20_000))
+        ids = list(Base.bulk_insert_ids(rows))
+        print(f"Bulk inserted ids: {ids[0]}..{ids[-1]} ({len(ids)} ids)")
         
+        # Test streaming reads
+        streamed = sum(1 for _ in Base.iter_all({"is_active": True}, batch_size=5_000))
+        print(f"Streamed active records: {streamed}")
+
+        # Test keyset pagination
+        page = Base.get_page(limit=1_000, order_by=("updated_at",))
+        pages = 1
+        while page["next_cursor"]:
+            page = Base.get_page(after=page["next_cursor"], limit=1_000, order_by=("updated_at",))
+            pages += 1
+        print(f"Paged through records in {pages} pages")
+
+        # Test read-through cache
+        Base.enable_cache(max_entries=1_000, ttl=60)
+        for _ in range(3):
+            Base.get(ids[0])
+        Base.update(ids[0], {"is_active": True})
+        print(f"Cached record after update: {Base.get(ids[0])}")
+        print(f"Cache stats: {Base.cache_stats()}")
+
+        # Test query builder
+        recent = (Base.select().where("id", ">", ids[0]).where("is_active", "=", True)
+                  .order_by("-id").limit(3))
+        print(f"Query builder: {recent!r} -> {[r['id'] for r in recent.all()]}")
+        print(f"Active count: {Base.select().filter(is_active=True).count()}, "
+              f"id range sum: {Base.select().where('id', 'between', (1, 10)).sum('id')}")
+
+        # Test typed result modes
+        row = Base.get_all({"is_active": True}, as_="tuples")[0]
+        model = next(BaseResponse.iter_all({"is_active": True}, as_="models"))
+        print(f"Tuple row: {row}")
+        print(f"Constructed model: id={model.id} created_at={model.created_at!r} "
+              f"-> validated {model.validated().created_at!r}")
+
+        # Test columnar fetch
+        columns = Base.get_all({"is_active": True}, as_="columns")
+        print(f"Columnar fetch: {', '.join(f'{k}[{v.dtype}]' for k, v in columns.items())}, "
+              f"{len(columns['id'])} rows")
+
+        # Test bulk upsert: two existing ids are updated, one new row inserted
+        now = datetime.now(timezone.utc)
+        upserts = [
+            {"id": ids[0], "is_active": False, "created_at": now, "updated_at": now},
+            {"id": ids[1], "is_active": False, "created_at": now, "updated_at": now},
+            {"id": ids[-1] + 1, "is_active": True, "created_at": now, "updated_at": now},
+        ]
+        print(f"Bulk upserted records: {Base.bulk_upsert(upserts)}")
+
+        # records without an id are plain inserts, not deduplicated on a NULL key
+        before = Base.select().count()
+        counts = Base.bulk_upsert([{"is_active": True, "created_at": now, "updated_at": now}] * 100)
+        assert counts == {"inserted": 100, "updated": 0}, counts
+        assert Base.select().count() - before == 100
+        print(f"Bulk upserted id-less records: {counts}")
+
+        # Test validated ingest: one bad row is rejected, the rest inserted
+        rows = [{"is_active": True, "created_at": now, "updated_at": now} for _ in range(1_000)]
+        rows[10] = {"is_active": "maybe"}
+        report = Base.ingest(rows)
+        print(f"Ingested {report.inserted}/{report.received} records, "
+              f"rejects: {[(r.index, r.errors[0]['msg']) for r in report.rejects]}")
+
+        # Test unit of work: one commit for many creates, savepoint rollback
+        before = Base.select().count()
+        start = time.perf_counter()
+        with Base.transaction():
+            for _ in range(500):
+                Base.create(m.table_name, m.columns, {"is_active": True, "created_at": now, "updated_at": now})
+            try:
+                with Base.transaction():
+                    Base.create(m.table_name, m.columns, {"is_active": False, "created_at": now, "updated_at": now})
+                    raise ValueError("roll back the savepoint only")
+            except ValueError:
+                pass
+        print(f"Transaction added {Base.select().count() - before} records "
+              f"in {time.perf_counter() - start:.3f}s")
+        try:
+            with Base.transaction():
+                Base.create(m.table_name, m.columns, {"is_active": True, "created_at": now, "updated_at": now})
+                raise RuntimeError("roll back everything")
+        except RuntimeError:
+            print(f"Rolled back transaction, count unchanged: {Base.select().count() - before == 500}")
+
         # Test delete
         deleted = Base.delete(record["id"])
         print(f"Record deleted: {deleted}")
         
         # Verify deletion
         remaining = Base.get_all()
-        print(f"Remaining records: {remaining}")
+        print(f"Remaining records: {len(remaining)}")
         
     except (DatabaseError, TableError) as e:
         log.error(f"Database operation failed: {e}")
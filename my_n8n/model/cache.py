@@ -0,0 +1,117 @@
+# file: my_n8n/model/cache.py :: 0.0.1
+# bounded LRU/TTL record cache
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Hashable, Iterable, Tuple
+
+
+def _sizeof(record: Dict[str, Any]) -> int:
+    """Approximate memory footprint of a record dict."""
+    return sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+
+
+class RecordCache:
+    """Thread-safe LRU cache of records with TTL and a byte budget.
+
+    Entries are evicted least-recently-used first once ``max_entries`` or
+    ``max_bytes`` is exceeded, and treated as misses once older than ``ttl``
+    seconds. Every invalidation bumps a version counter; a :meth:`put` that
+    carries the version read before its query started is dropped if an
+    invalidation happened meanwhile, so a slow reader cannot re-insert a
+    row that a concurrent writer just changed.
+
+    Attributes:
+        max_entries: Maximum number of cached records
+        ttl: Seconds a record stays valid, None for no expiry
+        max_bytes: Approximate memory budget, None for no limit
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl: Optional[float] = 300.0,
+                 max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Hashable, Tuple[Dict[str, Any], float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._version = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    @property
+    def version(self) -> int:
+        """Invalidation counter to pass to :meth:`put`."""
+        return self._version
+
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached record, or None on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            record, stored_at, size = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._data[key]
+                self._bytes -= size
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._data.move_to_end(key)
+            self._stats["hits"] += 1
+        # callers may mutate the result, keep the cached dict private
+        return dict(record)
+
+    def put(self, key: Hashable, record: Dict[str, Any], version: Optional[int] = None) -> None:
+        """Cache a record.
+
+        Args:
+            key: Record key (id)
+            record: Record dict; a copy is stored
+            version: :attr:`version` read before the record was fetched
+        """
+        record = dict(record)
+        size = _sizeof(record)
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (record, time.monotonic(), size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or
+                                  (self.max_bytes is not None and self._bytes > self.max_bytes)):
+                _, (_, _, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def invalidate(self, keys: Iterable[Hashable]) -> None:
+        """Drop records by key."""
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                entry = self._data.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[2]
+                    self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Drop every record."""
+        with self._lock:
+            self._version += 1
+            self._stats["invalidations"] += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hit_ratio": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,310 @@
+# file: my_n8n/model/columnar.py :: 0.0.4
+# column-oriented reads into NumPy arrays, memory-mapped snapshots
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Iterable, Union
+
+import numpy as np
+from loguru import logger as log
+
+from connection.db_my_n8n import get_db_source
+
+
+def _batch_array(values: tuple, dtype: Optional[Any]) -> np.ndarray:
+    """Convert one column of a fetched batch to an array."""
+    if dtype is not None:
+        return np.array(values, dtype=dtype)
+    if isinstance(values[0], (str, bytes)):
+        # object keeps strings of any width without re-sizing between batches
+        return np.array(values, dtype=object)
+    return np.array(values)
+
+
+def fetch_columns(conn: sqlite3.Connection, query: str, params: tuple = (),
+                  dtypes: Optional[Dict[str, Any]] = None, batch_size: int = 10_000,
+                  size_hint: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Run a query and return its result as one NumPy array per column.
+
+    Rows are read with ``fetchmany`` and transposed batch by batch straight
+    into preallocated arrays, so no per-row dicts are built. Capacity starts
+    at ``size_hint`` (or one batch) and doubles as needed; arrays are trimmed
+    to the row count at the end.
+
+    Types are inferred from the data: integers -> int64, floats -> float64
+    (an int column is widened if floats appear later), strings and columns
+    with NULLs -> object. Pass ``dtypes`` to force a type, e.g.
+    ``{"price": "float64", "date": "datetime64[D]"}``; NULLs become NaN/NaT
+    in float/datetime columns.
+
+    Args:
+        conn: Open SQLite connection
+        query: SELECT statement
+        params: Query parameters
+        dtypes: Optional column name -> NumPy dtype overrides
+        batch_size: Rows per ``fetchmany``
+        size_hint: Expected number of rows for the initial allocation
+
+    Returns:
+        Dict of column name -> 1-D array, in select order
+    """
+    dtypes = dtypes or {}
+    cur = conn.cursor()
+    cur.row_factory = None
+    cur.execute(query, params)
+    names = [d[0] for d in cur.description]
+    arrays: List[Optional[np.ndarray]] = [None] * len(names)
+    capacity = max(size_hint or batch_size, 1)
+    n = 0
+
+    while rows := cur.fetchmany(batch_size):
+        count = len(rows)
+        if n + count > capacity:
+            while n + count > capacity:
+                capacity *= 2
+            arrays = [np.resize(arr, capacity) if arr is not None else None for arr in arrays]
+        for i, values in enumerate(zip(*rows)):
+            batch = _batch_array(values, dtypes.get(names[i]))
+            arr = arrays[i]
+            if arr is None:
+                arr = arrays[i] = np.empty(capacity, dtype=batch.dtype)
+            elif not np.can_cast(batch.dtype, arr.dtype, "safe"):
+                arr = arrays[i] = arr.astype(np.result_type(arr.dtype, batch.dtype))
+            arr[n:n + count] = batch
+        n += count
+
+    log.debug(f"Fetched {n} rows into {len(names)} columns")
+    return {name: (arr[:n] if arr is not None else np.empty(0, dtype=dtypes.get(name, object)))
+            for name, arr in zip(names, arrays)}
+
+
+MANIFEST = "manifest.json"
+
+
+def _aside(directory: Path) -> Path:
+    """Where the previous snapshot waits while a new one is swapped in."""
+    return directory.with_name(f".{directory.name}.old")
+
+
+def _codes_dtype(cardinality: int) -> np.dtype:
+    """Smallest signed integer type for dictionary codes; -1 is reserved for NULL."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if cardinality < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def export_snapshot(conn: sqlite3.Connection, table: str, directory: Union[str, Path],
+                    dtypes: Optional[Dict[str, Any]] = None,
+                    dictionary: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Write a table as one ``.npy`` file per column plus a manifest.
+
+    String columns listed in ``dictionary`` (by default every string
+    column, e.g. ``symbol``/``activity``) are dictionary-encoded:
+    ``<col>.npy`` holds integer codes (-1 for NULL) and ``<col>.dict.npy``
+    the sorted distinct values. Strings excluded from ``dictionary`` are
+    stored as fixed-width unicode (NULL as ""),
+    numeric columns with NULLs as float64 with NaN. The snapshot
+    is written to a temporary directory and swapped in by renames (old one
+    aside, new one into place, then the old one deleted), so readers never
+    see a half-written one.
+
+    Args:
+        conn: Open SQLite connection
+        table: Table to export
+        directory: Snapshot directory, replaced if it exists
+        dtypes: Column name -> NumPy dtype overrides, as in :func:`fetch_columns`
+        dictionary: Columns to dictionary-encode, None for every string column
+
+    Returns:
+        The manifest
+    """
+    directory = Path(directory)
+    cols = fetch_columns(conn, f"SELECT * FROM {table}", dtypes=dtypes)
+    rows = len(next(iter(cols.values()))) if cols else 0
+    tmp = directory.with_name(f".{directory.name}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    encode = set(dictionary) if dictionary is not None else None
+    manifest: Dict[str, Any] = {"table": table, "rows": rows,
+                                "created_at": datetime.now(timezone.utc).isoformat(), "columns": {}}
+    try:
+        for name, arr in cols.items():
+            entry: Dict[str, Any] = {"file": f"{name}.npy"}
+            nulls = np.array([v is None for v in arr], dtype=bool) if arr.dtype == object else None
+            if nulls is not None and not any(isinstance(v, (str, bytes)) for v in arr):
+                # numbers with NULLs -> float64 with NaN
+                arr = np.where(nulls, np.nan, arr).astype(np.float64)
+            elif nulls is not None:
+                values, codes = np.unique(np.where(nulls, "", arr).astype(str), return_inverse=True)
+                if nulls.any() and not (arr[~nulls] == "").any():
+                    # drop the "" stand-in for NULL
+                    values, codes = values[1:], codes - 1
+                if encode is None or name in encode:
+                    codes = codes.astype(_codes_dtype(len(values)))
+                    codes[nulls] = -1
+                    np.save(tmp / entry["file"], codes)
+                    np.save(tmp / f"{name}.dict.npy", values)
+                    entry.update(encoding="dictionary", dictionary=f"{name}.dict.npy", dtype=str(codes.dtype))
+                    manifest["columns"][name] = entry
+                    continue
+                # NULL strings are stored as ""
+                arr = np.where(nulls, "", arr).astype(str)
+            np.save(tmp / entry["file"], arr)
+            entry.update(encoding="plain", dtype=str(arr.dtype))
+            manifest["columns"][name] = entry
+        (tmp / MANIFEST).write_text(json.dumps(manifest, indent=2))
+        # rename, not delete, the old snapshot first: until the new one is in
+        # place readers fall back to it (see Snapshot)
+        old = _aside(directory)
+        shutil.rmtree(old, ignore_errors=True)
+        if directory.exists():
+            os.replace(directory, old)
+        os.replace(tmp, directory)
+        shutil.rmtree(old, ignore_errors=True)
+    except Exception as e:
+        log.error(f"Failed to export snapshot of {table} to {directory}: {e}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    log.debug(f"Exported {rows} rows of {table} to {directory}")
+    return manifest
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of an exported snapshot.
+
+    Columns are ``np.load(mmap_mode="r")`` arrays: loading only maps the
+    files, pages are read on first touch, and every process mapping the
+    same snapshot shares one copy in the page cache. ``snap[name]`` returns
+    the stored array (codes for dictionary columns); use :meth:`code` to
+    filter on codes and :meth:`decode` to materialize strings::
+
+        snap = load_snapshot("snapshots/trades")
+        ibm = snap["symbol"] == snap.code("symbol", "IBM")
+        notional = (snap["quantity"][ibm] * snap["price"][ibm]).sum()
+
+    Attributes:
+        manifest: Parsed manifest.json
+        rows: Row count
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        if not self.directory.exists() and _aside(self.directory).exists():
+            # caught between the renames of a swap: the previous snapshot is still whole
+            self.directory = _aside(self.directory)
+        self.manifest = json.loads((self.directory / MANIFEST).read_text())
+        self.rows: int = self.manifest["rows"]
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dictionaries: Dict[str, np.ndarray] = {}
+        for name, entry in self.manifest["columns"].items():
+            self._columns[name] = np.load(self.directory / entry["file"], mmap_mode="r")
+            if entry["encoding"] == "dictionary":
+                self._dictionaries[name] = np.load(self.directory / entry["dictionary"])
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def dictionary(self, name: str) -> np.ndarray:
+        """Distinct values of a dictionary-encoded column, indexed by code.
+
+        Raises:
+            KeyError: If the snapshot has no such column
+            ValueError: If the column is stored plain
+        """
+        if name not in self._dictionaries:
+            if name not in self._columns:
+                raise KeyError(f"No column {name} in snapshot {self.directory}")
+            raise ValueError(f"Column {name} of snapshot {self.directory} is not dictionary-encoded")
+        return self._dictionaries[name]
+
+    def code(self, name: str, value: str) -> int:
+        """Code of ``value`` in a dictionary column, -2 (matches nothing) if absent.
+
+        Raises:
+            ValueError: If the column is stored plain; compare ``snap[name] == value`` instead
+        """
+        values = self.dictionary(name)
+        i = int(np.searchsorted(values, value))
+        return i if i < len(values) and values[i] == value else -2
+
+    def decode(self, name: str, index: Any = slice(None)) -> np.ndarray:
+        """Column values as strings (NULL -> None for dictionary columns), optionally a subset."""
+        arr = self._columns[name][index]
+        if name not in self._dictionaries:
+            return np.asarray(arr)
+        values = np.append(self._dictionaries[name].astype(object), None)
+        return values[arr]  # code -1 picks the trailing None
+
+
+def load_snapshot(directory: Union[str, Path]) -> Snapshot:
+    """Memory-map a snapshot written by :func:`export_snapshot`."""
+    try:
+        return Snapshot(directory)
+    except Exception as e:
+        log.error(f"Failed to load snapshot {directory}: {e}")
+        raise
+
+
+def _symbol_notional(directory: str) -> Dict[str, float]:
+    """Worker for the example: per-symbol notional from a shared snapshot."""
+    snap = load_snapshot(directory)
+    codes, notional = snap["symbol"], snap["quantity"] * snap["price"]
+    known = codes >= 0
+    totals = np.bincount(codes[known], weights=notional[known], minlength=len(snap.dictionary("symbol")))
+    return dict(zip(snap.dictionary("symbol").tolist(), totals.tolist()))
+
+
+# Example usage:
+if __name__ == "__main__":
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    # trades in source.db: date, activity, symbol, quantity, price
+    with get_db_source() as conn:
+        table = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%base_s'").fetchone()
+        if table:
+            dtypes = {"quantity": "int64", "price": "float64", "date": "datetime64[D]"}
+            cols = fetch_columns(conn, f"SELECT * FROM {table[0]}", dtypes=dtypes)
+            for name, arr in cols.items():
+                print(f"{name}: {arr.dtype} {arr[:5]}")
+            if len(cols["price"]):
+                notional = cols["quantity"] * cols["price"]
+                print(f"Total notional: {notional.sum():,.2f}")
+
+                start = time.perf_counter()
+                manifest = export_snapshot(conn, table[0], "snapshots/trades", dtypes=dtypes)
+                print(f"Exported {manifest['rows']} rows in {time.perf_counter() - start:.3f}s: "
+                      f"{ {n: c['encoding'] for n, c in manifest['columns'].items()} }")
+
+                start = time.perf_counter()
+                fetch_columns(conn, f"SELECT * FROM {table[0]}", dtypes=dtypes)
+                query_s = time.perf_counter() - start
+                start = time.perf_counter()
+                snap = load_snapshot("snapshots/trades")
+                load_s = time.perf_counter() - start
+                print(f"Re-query {query_s * 1000:.1f}ms vs snapshot load {load_s * 1000:.3f}ms")
+                ibm = snap["symbol"] == snap.code("symbol", "IBM")
+                print(f"IBM notional: {(snap['quantity'][ibm] * snap['price'][ibm]).sum():,.2f}, "
+                      f"first symbols: {snap.decode('symbol', slice(0, 3))}")
+
+                with ProcessPoolExecutor(2) as pool:
+                    totals = list(pool.map(_symbol_notional, ["snapshots/trades"] * 2))
+                print(f"Workers agree: {totals[0] == totals[1]}, total {sum(totals[0].values()):,.2f}")
+        else:
+            print("No trades table in source.db")
@@ -0,0 +1,107 @@
+# file: my_n8n/model/ddl.py :: 0.0.1
+# typed column DDL derived from pydantic fields (sqlite / postgres)
+import enum
+import sqlite3
+import types
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional, Tuple, Dict, Any, Iterable, Union, Literal, get_args, get_origin
+
+from pydantic.fields import FieldInfo
+
+SQLITE_TYPES = {
+    bool: "INTEGER",
+    int: "INTEGER",
+    float: "REAL",
+    str: "TEXT",
+    bytes: "BLOB",
+    datetime: "TEXT",
+    date: "TEXT",
+    time: "TEXT",
+    Decimal: "TEXT",
+}
+POSTGRES_TYPES = {
+    bool: "BOOLEAN",
+    int: "BIGINT",
+    float: "DOUBLE PRECISION",
+    str: "TEXT",
+    bytes: "BYTEA",
+    datetime: "TIMESTAMPTZ",
+    date: "DATE",
+    time: "TIME",
+    Decimal: "NUMERIC",
+}
+# STRICT tables need SQLite 3.37.0+
+STRICT_SUPPORTED = sqlite3.sqlite_version_info >= (3, 37, 0)
+
+
+def unwrap(annotation: Any) -> Tuple[Any, bool]:
+    """Reduce an annotation to its base Python type and whether it admits None.
+
+    ``Optional[X]``/``X | None`` -> (X, True); ``Literal["a", "b"]`` -> (str, False);
+    enums map to the type of their values; anything unknown comes back as is.
+    """
+    nullable = False
+    origin = get_origin(annotation)
+    if origin is Union or (hasattr(types, "UnionType") and origin is types.UnionType):
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        nullable = len(args) < len(get_args(annotation))
+        annotation = args[0] if len(args) == 1 else Any
+        origin = get_origin(annotation)
+    if origin is Literal:
+        values = get_args(annotation)
+        annotation = type(values[0]) if values else str
+    if isinstance(annotation, type) and issubclass(annotation, enum.Enum):
+        members = list(annotation)
+        annotation = type(members[0].value) if members else str
+    return annotation, nullable
+
+
+def column_type(annotation: Any, dialect: str = "sqlite", datetime_storage: str = "TEXT") -> Optional[str]:
+    """SQL type for a Python annotation, or None when there is no mapping."""
+    base, _ = unwrap(annotation)
+    types_ = SQLITE_TYPES if dialect == "sqlite" else POSTGRES_TYPES
+    if not isinstance(base, type):
+        return None
+    # most specific first: bool is an int, datetime is a date
+    for py_type in (bool, datetime, date, time, Decimal, int, float, str, bytes):
+        if issubclass(base, py_type):
+            if dialect == "sqlite" and py_type in (datetime, date, time):
+                return datetime_storage
+            return types_[py_type]
+    return None
+
+
+def column_ddl(definition: str, field: Optional[FieldInfo], dialect: str = "sqlite",
+               datetime_storage: str = "TEXT", strict: bool = True) -> str:
+    """Typed definition for one entry of a model's ``columns``.
+
+    Entries that already carry a type (``"id INTEGER PRIMARY KEY"``) are kept
+    for SQLite; for Postgres an integer primary key becomes an identity column.
+    Bare names are typed from the pydantic field: NOT NULL unless the
+    annotation is Optional. Names without a field become ``ANY`` in a STRICT
+    SQLite table, stay untyped in a regular one, and ``TEXT`` in Postgres.
+    """
+    parts = definition.split(maxsplit=1)
+    name = parts[0]
+    if len(parts) > 1:
+        if dialect == "postgres" and "PRIMARY KEY" in parts[1].upper() and "INT" in parts[1].upper():
+            return f"{name} BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY"
+        return definition
+    # outside STRICT tables a type named ANY would get NUMERIC affinity
+    untyped = "TEXT" if dialect == "postgres" else "ANY" if strict else None
+    sql_type = column_type(field.annotation, dialect, datetime_storage) if field is not None else None
+    if sql_type is None:
+        return f"{name} {untyped}" if untyped else name
+    _, nullable = unwrap(field.annotation)
+    return f"{name} {sql_type}" + ("" if nullable else " NOT NULL")
+
+
+def columns_ddl(fields: Dict[str, FieldInfo], columns: Iterable[str], dialect: str = "sqlite",
+                datetime_storage: str = "TEXT", strict: bool = True) -> Tuple[str, ...]:
+    """Typed column definitions in ``columns`` order.
+
+    The order is kept so ``SELECT *`` still lines up with the model columns.
+    """
+    return tuple(column_ddl(col, fields.get(col.split()[0]), dialect, datetime_storage, strict)
+                 for col in columns)
@@ -0,0 +1,390 @@
+# file: my_n8n/model/etl.py :: 0.0.2
+# partitioned source -> target ETL across processes
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import multiprocessing
+import os
+import sqlite3
+import time
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Optional, Tuple, List, Any, Iterator, Callable
+from pydantic import BaseModel
+from loguru import logger as log
+
+from ._base import _Base, DatabaseError, TableError
+from .sync import SyncEngine, SyncReport, T
+from connection.db_my_n8n import get_db_source, get_db_target, get_db_pg, apply_profile, db_path
+
+# transform(columns, rows) -> rows with the same columns; must be a module-level
+# function so it can be pickled to the worker processes
+Transform = Callable[[Tuple[str, ...], List[tuple]], List[tuple]]
+
+
+class PartitionReport(BaseModel):
+    """Timing of one key range."""
+    index: int
+    lo: int
+    hi: int
+    rows: int = 0
+    pid: Optional[int] = None
+    extract_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+
+class EtlReport(BaseModel):
+    """Outcome of a partitioned run."""
+    source_table: str
+    target_table: str
+    backend: str
+    strategy: str
+    workers: int
+    rows: int = 0
+    seconds: float = 0.0
+    merge_seconds: float = 0.0
+    partitions: List[PartitionReport] = []
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _extract_partition(source_table: str, columns: Optional[Tuple[str, ...]], key: str,
+                       part: PartitionReport, chunk_size: int,
+                       transform: Optional[Transform]) -> Iterator[Tuple[Tuple[str, ...], List[tuple]]]:
+    """Yield transformed chunks of one key range, using this process's own source pool."""
+    select = ", ".join(columns) if columns else "*"
+    with get_db_source() as conn:
+        cur = conn.cursor()
+        cur.row_factory = None
+        cur.execute(f"SELECT {select} FROM {source_table} WHERE {key} BETWEEN ? AND ?", (part.lo, part.hi))
+        names = tuple(d[0] for d in cur.description)
+        while rows := cur.fetchmany(chunk_size):
+            yield names, (transform(names, rows) if transform else rows)
+
+
+def _run_partition(source_table: str, columns: Optional[Tuple[str, ...]], key: str,
+                   part: PartitionReport, chunk_size: int, transform: Optional[Transform],
+                   sink: str, target: str) -> Tuple[PartitionReport, Tuple[str, ...], Optional[List[tuple]]]:
+    """Worker: extract and transform one partition, then hand rows back or write them.
+
+    Args:
+        sink: ``return`` to send rows to the single writer, ``sqlite`` to
+            write a staging database at ``target``, ``postgres`` to COPY
+            into the ``target`` staging table on this worker's own connection
+
+    Returns:
+        Partition timing, column names and the rows (``return`` only)
+    """
+    part.pid = os.getpid()
+    start = time.perf_counter()
+    chunks = _extract_partition(source_table, columns, key, part, chunk_size, transform)
+    first = next(chunks, None)
+    if first is None:
+        part.extract_seconds = time.perf_counter() - start
+        return part, (), [] if sink == "return" else None
+    names = first[0]
+    chunks = (chunk for _, chunk in chain([first], chunks))
+
+    if sink == "return":
+        rows: List[tuple] = [row for chunk in chunks for row in chunk]
+        part.rows = len(rows)
+        part.extract_seconds = time.perf_counter() - start
+        return part, names, rows
+
+    if sink == "sqlite":
+        conn = sqlite3.connect(target)
+        try:
+            # scratch file, deleted after the merge: durability does not matter
+            apply_profile(conn, "bulk-load")
+            conn.execute(f"CREATE TABLE rows ({', '.join(names)})")
+            insert = f"INSERT INTO rows VALUES ({', '.join(['?'] * len(names))})"
+            for chunk in chunks:
+                conn.executemany(insert, chunk)
+                part.rows += len(chunk)
+            conn.commit()
+        finally:
+            conn.close()
+    else:
+        with get_db_pg() as pg:
+            with pg.cursor() as cur:
+                with cur.copy(f"COPY {target} ({', '.join(names)}) FROM STDIN") as copy:
+                    for chunk in chunks:
+                        for row in chunk:
+                            copy.write_row(row)
+                        part.rows += len(chunk)
+    part.extract_seconds = time.perf_counter() - start
+    return part, names, None
+
+
+class PartitionedSync(SyncEngine):
+    """Run a full source -> target copy in parallel processes over key ranges.
+
+    The source table is split into ``partitions`` contiguous ranges of
+    ``key`` (``id``, or ``rowid`` for tables without an integer key), and
+    each range is read and transformed in a ``ProcessPoolExecutor`` worker.
+    Workers are started with ``spawn`` so every process opens its own
+    connection pools instead of inheriting the parent's SQLite handles.
+    Use more partitions than workers to keep every core busy when ranges
+    are uneven.
+
+    Write strategies:
+
+    - ``single_writer``: workers return transformed rows and the parent
+      writes them, as partitions complete, through the regular
+      :class:`SyncEngine` loader in one target transaction
+    - ``staging``: workers write in parallel to scratch storage the target
+      never sees, and the parent moves everything into the target with one
+      ``INSERT ... SELECT`` in one transaction. For ``sqlite`` each worker
+      writes its own staging database next to the target, which the parent
+      folds into a combined staging database as partitions complete; for
+      ``postgres`` each worker COPYs its range into a shared ``UNLOGGED``
+      staging table on its own connection
+
+    Both strategies are atomic: a failed run leaves the target unchanged.
+
+    Attributes:
+        workers: Worker processes, defaults to the CPU count
+        partitions: Number of key ranges, defaults to four per worker
+        key: Integer column the ranges are taken over
+        transform: Module-level ``transform(columns, rows) -> rows`` run in
+            the workers, e.g. parsing and normalizing values
+        strategy: ``single_writer`` or ``staging``
+    """
+    strategies = ("single_writer", "staging")
+
+    def __init__(self, model: T, backend: str = "sqlite", chunk_size: int = 10_000,
+                 columns: Optional[Tuple[str, ...]] = None,
+                 source_table: Optional[str] = None, target_table: Optional[str] = None,
+                 workers: Optional[int] = None, partitions: Optional[int] = None, key: str = "id",
+                 transform: Optional[Transform] = None, strategy: str = "staging"):
+        super().__init__(model, backend, chunk_size, columns, source_table, target_table)
+        if strategy not in self.strategies:
+            raise ValueError(f"Unknown strategy: {strategy}, expected one of {self.strategies}")
+        self.workers = workers or os.cpu_count() or 1
+        self.partitions = partitions or self.workers * 4
+        self.key = key
+        self.transform = transform
+        self.strategy = strategy
+
+    def key_ranges(self) -> List[Tuple[int, int]]:
+        """Split ``[MIN(key), MAX(key)]`` of the source table into inclusive ranges."""
+        with get_db_source() as conn:
+            lo, hi = conn.execute(f"SELECT MIN({self.key}), MAX({self.key}) FROM {self.source_table}").fetchone()
+        if lo is None:
+            return []
+        step = max(1, -(-(hi - lo + 1) // self.partitions))
+        return [(start, min(start + step - 1, hi)) for start in range(lo, hi + 1, step)]
+
+    def _staging_path(self, index: Optional[int] = None) -> str:
+        """Staging database of one partition, or the combined one without ``index``."""
+        suffix = "" if index is None else f"_{index}"
+        return str(Path(db_path("target")).parent / f"_stage_{self.target_table}{suffix}.db")
+
+    @property
+    def staging_table(self) -> str:
+        return f"_stage_{self.target_table}"
+
+    def _fold_staging(self, part: PartitionReport) -> None:
+        """Append one partition's staging database to the combined one."""
+        path = self._staging_path(part.index)
+        start = time.perf_counter()
+        try:
+            if part.rows:
+                conn = sqlite3.connect(self._staging_path())
+                try:
+                    apply_profile(conn, "bulk-load")
+                    conn.execute("ATTACH DATABASE ? AS part", (path,))
+                    exists = conn.execute("SELECT 1 FROM main.sqlite_master WHERE name = 'rows'").fetchone()
+                    conn.execute("INSERT INTO rows SELECT * FROM part.rows" if exists
+                                 else "CREATE TABLE rows AS SELECT * FROM part.rows")
+                    conn.commit()
+                    conn.execute("DETACH DATABASE part")
+                finally:
+                    conn.close()
+        finally:
+            Path(path).unlink(missing_ok=True)
+        part.write_seconds = time.perf_counter() - start
+
+    def _merge_sqlite(self, names: Tuple[str, ...]) -> None:
+        """Insert the combined staging database into the target in one transaction."""
+        cols = ", ".join(names)
+        with get_db_target() as conn:
+            # ATTACH/DETACH are not allowed inside a transaction
+            conn.commit()
+            conn.execute("ATTACH DATABASE ? AS stage", (self._staging_path(),))
+            try:
+                conn.execute(f"INSERT INTO {self.target_table} ({cols}) SELECT {cols} FROM stage.rows")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.execute("DETACH DATABASE stage")
+
+    def _create_pg_staging(self) -> None:
+        # UNLOGGED: scratch rows need no WAL; committed so every worker sees it
+        with get_db_pg() as conn:
+            conn.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+            conn.execute(f"CREATE UNLOGGED TABLE {self.staging_table} "
+                         f"(LIKE {self.target_table} INCLUDING DEFAULTS)")
+
+    def _merge_postgres(self, names: Tuple[str, ...]) -> None:
+        """Insert the staging table into the target and drop it, in one transaction."""
+        cols = ", ".join(names)
+        with get_db_pg() as conn:
+            conn.execute(f"INSERT INTO {self.target_table} ({cols}) SELECT {cols} FROM {self.staging_table}")
+            conn.execute(f"DROP TABLE {self.staging_table}")
+
+    def _drop_staging(self, parts: List[PartitionReport]) -> None:
+        if self.backend == "sqlite":
+            for path in [self._staging_path()] + [self._staging_path(part.index) for part in parts]:
+                Path(path).unlink(missing_ok=True)
+        else:
+            with get_db_pg() as conn:
+                conn.execute(f"DROP TABLE IF EXISTS {self.staging_table}")
+
+    def run(self) -> EtlReport:
+        """Copy every source row into the target table using all workers.
+
+        The target is written in a single transaction, so on failure it is
+        left as it was and any staging data is removed.
+
+        Returns:
+            EtlReport with per-partition row counts, pids and timings
+
+        Raises:
+            DatabaseError: If a worker or the writer fails
+        """
+        report = EtlReport(source_table=self.source_table, target_table=self.target_table,
+                           backend=self.backend, strategy=self.strategy, workers=self.workers)
+        start = time.perf_counter()
+        parts = [PartitionReport(index=i, lo=lo, hi=hi) for i, (lo, hi) in enumerate(self.key_ranges())]
+        if self.strategy == "single_writer":
+            sink = "return"
+        else:
+            sink = self.backend
+        try:
+            if sink == "sqlite":
+                self._drop_staging(parts)
+            elif sink == "postgres":
+                self._create_pg_staging()
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx) as pool:
+                futures = [pool.submit(_run_partition, self.source_table, self.columns, self.key, part,
+                                       self.chunk_size, self.transform, sink,
+                                       self._staging_path(part.index) if sink == "sqlite" else self.staging_table)
+                           for part in parts]
+                if sink == "return":
+                    self._write_single(futures, report)
+                else:
+                    names: Tuple[str, ...] = ()
+                    for future in as_completed(futures):
+                        part, part_names, _ = future.result()
+                        names = names or part_names
+                        if sink == "sqlite":
+                            self._fold_staging(part)
+                        report.partitions.append(part)
+            if sink != "return":
+                merge_start = time.perf_counter()
+                if names and sink == "sqlite":
+                    self._merge_sqlite(names)
+                elif names:
+                    self._merge_postgres(names)
+                report.merge_seconds = time.perf_counter() - merge_start
+        except Exception as e:
+            log.error(f"Partitioned sync {self.source_table} -> {self.target_table} failed: {e}")
+            if sink != "return":
+                self._drop_staging(parts)
+            raise
+        if sink == "sqlite":
+            self._drop_staging(parts)
+        report.partitions.sort(key=lambda p: p.index)
+        report.rows = sum(p.rows for p in report.partitions)
+        report.seconds = time.perf_counter() - start
+        log.info(f"Synced {report.rows} rows {self.source_table} -> {self.target_table} "
+                 f"with {self.workers} workers ({self.strategy}) in {report.seconds:.2f}s "
+                 f"({report.rows_per_sec:,.0f} rows/sec)")
+        return report
+
+    def _write_single(self, futures: List[Any], report: EtlReport) -> None:
+        """Feed partitions to the regular loader in completion order."""
+        if not futures:
+            return
+        results = (future.result() for future in as_completed(futures))
+        first = next(results)
+        # empty partitions come back without column names
+        names = first[1] or self.columns
+        sync_report = SyncReport(source_table=self.source_table, target_table=self.target_table,
+                                 backend=self.backend)
+
+        def chunks() -> Iterator[List[tuple]]:
+            for part, _, rows in chain([first], results):
+                write_start = time.perf_counter()
+                for i in range(0, len(rows), self.chunk_size):
+                    yield rows[i:i + self.chunk_size]
+                part.write_seconds = time.perf_counter() - write_start
+                report.partitions.append(part)
+
+        load = self._load_sqlite if self.backend == "sqlite" else self._load_postgres
+        load(names, chunks(), sync_report)
+
+
+def _normalize_trades(columns: Tuple[str, ...], rows: List[tuple]) -> List[tuple]:
+    """Example transform: ISO dates, upper-case symbols, prices to cents precision."""
+    di, si, pi = columns.index("date"), columns.index("symbol"), columns.index("price")
+    out = []
+    for row in rows:
+        row = list(row)
+        row[di] = datetime.fromisoformat(row[di]).date().isoformat()
+        row[si] = row[si].strip().upper()
+        row[pi] = round(float(row[pi]), 2)
+        out.append(tuple(row))
+    return out
+
+
+# Example usage:
+if __name__ == "__main__":
+    import random
+
+    class Trade(_Base):
+        """Trade rows as stored in source.db"""
+        table_name: str = "trade"
+        columns = ("id INTEGER PRIMARY KEY", "date", "activity", "symbol", "quantity", "price")
+
+    try:
+        m = Trade()
+        m._auto_drop_source_table(m)
+        m._auto_create_source_table(m)
+        with get_db_source() as conn:
+            conn.executemany(
+                f"INSERT INTO {m.table_s} (date, activity, symbol, quantity, price) VALUES (?, ?, ?, ?, ?)",
+                ((f"2024-01-{i % 28 + 1:02d}T09:30:00", random.choice(("BUY", "SELL")),
+                  random.choice((" ibm", "meta ", "MSFT")), random.randint(1, 1000),
+                  random.uniform(10, 1000)) for i in range(400_000)))
+        print("Source table loaded")
+
+        cores = max(2, os.cpu_count() or 1)
+        for workers, strategy in ((1, "staging"), (cores, "staging"), (cores, "single_writer")):
+            m._exec_target_query(f"DROP TABLE IF EXISTS {m.table_t}")
+            m._exec_target_query(m._generate_ddl_create(m.table_t, m.columns))
+            report = PartitionedSync(m, workers=workers, strategy=strategy,
+                                     transform=_normalize_trades).run()
+            slowest = max(report.partitions, key=lambda p: p.extract_seconds)
+            print(f"{strategy:13} workers={workers}: {report.rows} rows in {report.seconds:.2f}s "
+                  f"({report.rows_per_sec:,.0f} rows/sec), slowest partition {slowest.index} "
+                  f"{slowest.extract_seconds:.2f}s + {slowest.write_seconds:.2f}s write, "
+                  f"merge {report.merge_seconds:.2f}s")
+
+        with get_db_target() as conn:
+            count = conn.execute(f"SELECT COUNT(*) FROM {m.table_t}").fetchone()[0]
+            print(f"Target rows: {count}, first: "
+                  f"{tuple(conn.execute(f'SELECT * FROM {m.table_t} ORDER BY id LIMIT 1').fetchone())}")
+
+    except (DatabaseError, TableError) as e:
+        log.error(f"Database operation failed: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error: {e}")
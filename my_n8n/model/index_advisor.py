@@ -0,0 +1,179 @@
+# file: my_n8n/model/index_advisor.py :: 0.0.2
+# EXPLAIN-based check of the queries a model generates
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import re
+from typing import Optional, Tuple, List, Any, Iterable, Sequence
+from pydantic import BaseModel
+from loguru import logger as log
+
+from ._base import _Base, Index
+from connection.db_my_n8n import get_db_app, get_db_source, get_db_target, get_db_pg_pooled
+
+# "SCAN base" / "SCAN TABLE base" without an index is a full table scan
+_SQLITE_FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?\w+(?: AS \w+)?$")
+_SQLITE_TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (?:ORDER|GROUP) BY")
+_PG_FULL_SCAN = re.compile(r"Seq Scan on \w+")
+_PG_TEMP_SORT = re.compile(r"^\s*(?:->\s*)?Sort\b")
+
+_DATABASES = {"app": get_db_app, "source": get_db_source, "target": get_db_target, "postgres": get_db_pg_pooled}
+
+
+class PlanFinding(BaseModel):
+    """Plan of one generated query and what is wrong with it."""
+    label: str
+    query: str
+    plan: List[str]
+    full_scan: bool = False
+    temp_sort: bool = False
+    suggestion: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return not (self.full_scan or self.temp_sort)
+
+
+def explain_sqlite(conn: Any, query: str, params: Sequence[Any] = ()) -> List[str]:
+    """``EXPLAIN QUERY PLAN`` detail lines of a SQLite query."""
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", tuple(params)).fetchall()]
+
+
+def explain_postgres(conn: Any, query: str) -> List[str]:
+    """Generic ``EXPLAIN`` lines of a Postgres query with ``$n`` parameters (psycopg connection).
+
+    ``GENERIC_PLAN`` (Postgres 16+) plans the query as a prepared statement
+    would, without parameter values. Sequential scans and sorts are
+    disabled for the transaction, so on small tables they are only chosen
+    when no index can serve the query.
+    """
+    with conn.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        cursor.execute(f"EXPLAIN (GENERIC_PLAN) {query}")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _numbered(query: str) -> str:
+    """Rewrite ``?`` placeholders as Postgres ``$1, $2, ...``."""
+    parts = query.split("?")
+    return "".join(part + (f"${i}" if i < len(parts) else "") for i, part in enumerate(parts, start=1))
+
+
+def analyze_plan(label: str, query: str, plan: List[str], dialect: str = "sqlite",
+                 table: Optional[str] = None, columns: Tuple[str, ...] = ()) -> PlanFinding:
+    """Flag full scans and temp sorts in a plan and suggest an index for the filter columns."""
+    scan, sort = (_SQLITE_FULL_SCAN, _SQLITE_TEMP_SORT) if dialect == "sqlite" else (_PG_FULL_SCAN, _PG_TEMP_SORT)
+    finding = PlanFinding(
+        label=label, query=query, plan=plan,
+        full_scan=any(scan.search(line) for line in plan),
+        temp_sort=any(sort.search(line) for line in plan),
+    )
+    if not finding.ok and table and columns:
+        finding.suggestion = f"Index(columns={columns!r})  -- {Index(columns=columns).ddl(table)}"
+    return finding
+
+
+def model_queries(model: _Base, table: str,
+                  filters: Iterable[Tuple[str, ...]] = (),
+                  order_by: Iterable[Tuple[str, ...]] = ()) -> List[Tuple[str, str, Tuple[str, ...]]]:
+    """Queries a model issues: id lookups, keyset pages, filtered reads.
+
+    Args:
+        model: Model instance
+        table: Table the queries run against
+        filters: Column tuples used as equality filters (``get_all`` / ``select``)
+        order_by: Column tuples used for keyset paging (``get_page``)
+
+    Returns:
+        List of (label, sql, columns the query should be indexed on)
+    """
+    names = tuple(col.split()[0] for col in model.columns)
+    queries = []
+    if "id" in names:
+        queries.append(("get", f"SELECT * FROM {table} WHERE id = ?", ("id",)))
+    for cols in filters:
+        where = " AND ".join(f"{col} = ?" for col in cols)
+        queries.append((f"get_all{cols}", f"SELECT * FROM {table} WHERE {where}", tuple(cols)))
+    for cols in order_by:
+        cols = tuple(cols) if "id" in cols else (*cols, "id")
+        queries.append((f"get_page{cols}",
+                        f"SELECT * FROM {table} WHERE ({', '.join(cols)}) > ({', '.join(['?'] * len(cols))}) "
+                        f"ORDER BY {', '.join(cols)} LIMIT ?", cols))
+    for index in model.indexes:
+        if index.where is None:
+            where = " AND ".join(f"{col} = ?" for col in index.columns)
+            queries.append((f"index {index.index_name(table)}", f"SELECT * FROM {table} WHERE {where}",
+                            index.columns))
+    return queries
+
+
+def check_model(model: _Base, filters: Iterable[Tuple[str, ...]] = (),
+                order_by: Iterable[Tuple[str, ...]] = (), db: str = "app",
+                table: Optional[str] = None) -> List[PlanFinding]:
+    """Explain a model's queries in one of the SQLite databases or in Postgres.
+
+    Args:
+        model: Model instance; its table must exist
+        filters: Column tuples used as equality filters
+        order_by: Column tuples used for keyset paging
+        db: ``app`` (``table_name``), ``source`` (``table_s``), ``target``
+            (``table_t``) or ``postgres`` (``table_name``, generic plans)
+        table: Table to check instead of the one ``db`` implies
+
+    Returns:
+        One finding per query
+    """
+    if db not in _DATABASES:
+        raise ValueError(f"Unknown database: {db}, expected one of {tuple(_DATABASES)}")
+    dialect = "postgres" if db == "postgres" else "sqlite"
+    table = table or {"app": model.table_name, "source": model.table_s, "target": model.table_t,
+                      "postgres": model.table_name}[db]
+    findings = []
+    with _DATABASES[db]() as conn:
+        for label, query, cols in model_queries(model, table, filters, order_by):
+            if dialect == "postgres":
+                query = _numbered(query)
+                plan = explain_postgres(conn, query)
+            else:
+                # parameters only matter for the plan's shape, not their values
+                plan = explain_sqlite(conn, query, [None] * query.count("?"))
+            finding = analyze_plan(label, query, plan, dialect, table, cols)
+            if not finding.ok:
+                log.warning(f"{label} on {table}: {' | '.join(plan)}")
+            findings.append(finding)
+    return findings
+
+
+def assert_indexed(model: _Base, filters: Iterable[Tuple[str, ...]] = (),
+                   order_by: Iterable[Tuple[str, ...]] = (), db: str = "app",
+                   table: Optional[str] = None) -> None:
+    """Fail with the offending plans if any of a model's queries scans or sorts without an index.
+
+    Meant to be called from a test, e.g. ``assert_indexed(Trade(), filters=[("symbol",)])``.
+
+    Raises:
+        AssertionError: Listing each bad query, its plan and a suggested index
+    """
+    bad = [f for f in check_model(model, filters, order_by, db, table) if not f.ok]
+    if bad:
+        raise AssertionError("Queries without a usable index:\n" + "\n".join(
+            f"  {f.label}: {f.query}\n    plan: {' | '.join(f.plan)}\n    fix: {f.suggestion}" for f in bad))
+
+
+# Example usage:
+if __name__ == "__main__":
+    from .base import Base
+
+    m = Base()
+    m._auto_create_app_table(m)
+    for finding in check_model(m, filters=[("is_active",)], order_by=[("updated_at",)]):
+        status = "ok" if finding.ok else "FULL SCAN" if finding.full_scan else "TEMP SORT"
+        print(f"{status:10} {finding.label}: {' | '.join(finding.plan)}")
+        if finding.suggestion:
+            print(f"{'':10} suggest {finding.suggestion}")
+    try:
+        assert_indexed(m, filters=[("is_active",)])
+    except AssertionError as e:
+        print(e)
@@ -0,0 +1,351 @@
+# file: my_n8n/model/loader.py :: 0.0.3
+# streaming CSV/JSONL loader with a bulk-load mode
+#
+#   python -m model.loader trades.csv --table _base_s --bulk --cast quantity=int price=float
+#   python -m model.loader requests.jsonl --table requests --db app
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import argparse
+import csv
+import json
+import sqlite3
+import time
+from datetime import date, datetime
+from itertools import islice
+from typing import Optional, Dict, Any, List, Iterator, Iterable, Callable, Union, Type
+
+from pydantic import BaseModel
+from loguru import logger as log
+
+from ._base import _Base, DatabaseError, TableError
+from .validation import IngestReport, Reject, validate_batch
+from connection.db_my_n8n import (get_db_app, get_db_source, get_db_target, apply_profile, db_path,
+                                  in_transaction)
+
+_DATABASES = {"app": get_db_app, "source": get_db_source, "target": get_db_target}
+
+CASTS: Dict[str, Callable[[Any], Any]] = {
+    "int": int,
+    "float": float,
+    "str": str,
+    "bool": lambda v: v if isinstance(v, bool) else str(v).strip().lower() in ("1", "true", "t", "yes", "y"),
+    "date": lambda v: date.fromisoformat(v).isoformat(),
+    "datetime": lambda v: datetime.fromisoformat(v).isoformat(),
+}
+
+
+class LoadReport(IngestReport):
+    """Outcome of loading one file."""
+    path: str
+    format: str
+    bulk: bool = False
+    index_seconds: float = 0.0
+
+
+def iter_records(path: Union[str, Path], format: Optional[str] = None,
+                 encoding: str = "utf-8") -> Iterator[Dict[str, Any]]:
+    """Stream a CSV or JSONL file as dicts, one line at a time.
+
+    CSV values are strings with empty fields as None; JSONL values keep
+    their JSON types and blank lines are skipped.
+
+    Args:
+        path: File to read
+        format: ``csv`` or ``jsonl``; inferred from the suffix when omitted
+        encoding: File encoding
+    """
+    format = format or _format_of(path)
+    with open(path, newline="" if format == "csv" else None, encoding=encoding) as f:
+        if format == "csv":
+            for record in csv.DictReader(f):
+                yield {k: (v if v != "" else None) for k, v in record.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def iter_rows(path: Union[str, Path], format: Optional[str] = None,
+              encoding: str = "utf-8") -> Iterator[List[Any]]:
+    """Stream a CSV or JSONL file as lists: first the column names, then one list per row.
+
+    Cheaper than :func:`iter_records` for loading: CSV rows come straight
+    from ``csv.reader`` without a dict per row. JSONL columns are the keys
+    of the first record; later records are read by those keys.
+    """
+    format = format or _format_of(path)
+    with open(path, newline="" if format == "csv" else None, encoding=encoding) as f:
+        if format == "csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            yield header
+            for row in reader:
+                yield [v if v != "" else None for v in row]
+        else:
+            lines = (json.loads(line) for line in f if line.strip())
+            first = next(lines, None)
+            if first is None:
+                return
+            header = list(first)
+            yield header
+            yield list(first.values())
+            for record in lines:
+                yield list(map(record.get, header))
+
+
+def _format_of(path: Union[str, Path]) -> str:
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError(f"Cannot infer format of {path}, pass format='csv' or 'jsonl'")
+
+
+class FileLoader:
+    """Stream CSV/JSONL files into a table in chunks, in constant memory.
+
+    Records are read lazily and inserted with one ``executemany`` and one
+    commit per ``chunk_size`` rows (one commit in total in bulk mode), so
+    memory stays flat for files of any size. File keys are
+    matched to the table's columns; unknown keys are ignored.
+
+    Each chunk is either validated against ``model`` (``validate=True``,
+    through ``validation.validate_batch`` with lax text coercion) or cast
+    per column with ``casts`` (a callable or a ``CASTS`` name). Records
+    that fail become rejects; the first ``max_rejects`` are kept in the
+    report, all are counted.
+
+    ``bulk=True`` loads on a dedicated connection with the ``bulk-load``
+    PRAGMA profile (in-memory journal, ``synchronous=OFF``) and drops the
+    table's plain secondary indexes for the load, recreating them once at
+    the end, which is much cheaper than maintaining them row by row.
+    UNIQUE and constraint-backed indexes are kept, so duplicates still
+    fail. Dropping, loading and recreating run in one transaction: on any
+    error everything rolls back, indexes included, and the original error
+    is raised. A crash mid-load can corrupt the database in this mode, so
+    use it for tables that can be reloaded. Triggers stay active (see
+    ``PositionView``).
+
+    Attributes:
+        table: Target table, which must exist
+        db: ``app``, ``source`` or ``target``
+        model: Pydantic model for ``validate=True``
+        casts: Column -> cast, applied when not validating
+        validate: Validate chunks against ``model``
+        bulk: Use the bulk-load connection and deferred indexes
+        chunk_size: Rows per ``executemany`` (and commit, outside bulk mode)
+        max_rejects: Rejects kept in the report
+    """
+
+    def __init__(self, table: str, db: str = "source", model: Optional[Type[BaseModel]] = None,
+                 casts: Optional[Dict[str, Union[str, Callable[[Any], Any]]]] = None,
+                 validate: bool = False, bulk: bool = False, chunk_size: int = 50_000,
+                 max_rejects: int = 1_000):
+        if db not in _DATABASES:
+            raise ValueError(f"Unknown database: {db}, expected one of {tuple(_DATABASES)}")
+        if validate and model is None:
+            raise ValueError("validate=True needs a model")
+        self.table = table
+        self.db = db
+        self.model = model
+        unknown = [cast for cast in (casts or {}).values() if isinstance(cast, str) and cast not in CASTS]
+        if unknown:
+            raise ValueError(f"Unknown casts: {unknown}, expected one of {tuple(CASTS)}")
+        self.casts = {col: CASTS[cast] if isinstance(cast, str) else cast for col, cast in (casts or {}).items()}
+        self.validate = validate
+        self.bulk = bulk
+        self.chunk_size = chunk_size
+        self.max_rejects = max_rejects
+
+    @classmethod
+    def for_model(cls, model: _Base, db: str = "source", **kwargs: Any) -> "FileLoader":
+        """Loader for a model's table in ``db`` (``table_s`` for source, ``table_t`` for target)."""
+        table = {"app": model.table_name, "source": model.table_s, "target": model.table_t}[db]
+        return cls(table, db=db, **kwargs)
+
+    # ---------------------------------------------------------------- helpers
+    def _table_columns(self, conn: sqlite3.Connection) -> List[str]:
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({self.table})")]
+        if not columns:
+            raise TableError(f"Table {self.table} does not exist in {self.db}")
+        return columns
+
+    def _deferrable_indexes(self, conn: sqlite3.Connection) -> List[tuple]:
+        """``(name, sql)`` of indexes that only speed up reads and can be rebuilt after a load.
+
+        Only non-unique ``CREATE INDEX`` indexes (origin ``c``) qualify;
+        UNIQUE indexes and those backing PRIMARY KEY/UNIQUE constraints
+        enforce data integrity during the load and are left in place.
+        """
+        plain = {row[1] for row in conn.execute(f"PRAGMA index_list({self.table})")
+                 if row[2] == 0 and row[3] == "c"}
+        return [(name, sql) for name, sql in conn.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? "
+                    "AND sql IS NOT NULL", (self.table,)) if name in plain]
+
+    def _cast(self, chunk: List[List[Any]], columns: List[str], offset: int,
+              rejects: List[Reject]) -> List[List[Any]]:
+        casts = [(j, self.casts[col]) for j, col in enumerate(columns) if col in self.casts]
+        if not casts:
+            return chunk
+        rows = []
+        for i, row in enumerate(chunk):
+            try:
+                for j, cast in casts:
+                    if row[j] is not None:
+                        row[j] = cast(row[j])
+            except (TypeError, ValueError) as e:
+                rejects.append(Reject(index=offset + i, record=dict(zip(columns, row)),
+                                      errors=[{"loc": [columns[j]], "msg": str(e), "type": "cast_error"}]))
+            else:
+                rows.append(row)
+        return rows
+
+    def _validated(self, chunk: List[List[Any]], columns: List[str], offset: int,
+                   rejects: List[Reject]) -> List[tuple]:
+        records = [dict(zip(columns, row)) for row in chunk]
+        valid, bad = validate_batch(self.model, records, strict=False, offset=offset)
+        rejects.extend(bad)
+        skip = {r.index - offset for r in bad}
+        kept = (record for i, record in enumerate(records) if i not in skip)
+        # model fields win; columns the model does not declare are taken from the file
+        return [tuple(obj.__dict__.get(col, record[col]) for col in columns)
+                for obj, record in zip(valid, kept)]
+
+    # ------------------------------------------------------------------- load
+    def load(self, path: Union[str, Path], format: Optional[str] = None) -> LoadReport:
+        """Load one file into the table.
+
+        Args:
+            path: CSV or JSONL file
+            format: ``csv`` or ``jsonl``; inferred from the suffix when omitted
+
+        Returns:
+            LoadReport with counts, rejects, timing and rows/sec
+
+        Raises:
+            TableError: If the table does not exist
+            DatabaseError: If an insert fails
+        """
+        format = format or _format_of(path)
+        report = LoadReport(table=self.table, path=str(path), format=format, bulk=self.bulk,
+                            trusted=not (self.validate or self.casts))
+        start = time.perf_counter()
+        rows = iter_rows(path, format)
+        header = next(rows, None)
+        if header is None:
+            return report
+
+        if self.bulk:
+            self._bulk_load(header, rows, report)
+        else:
+            with _DATABASES[self.db]() as conn:
+                self._load(conn, header, rows, report, commit=not in_transaction(self.db))
+
+        report.seconds = time.perf_counter() - start
+        log.info(f"Loaded {report.inserted} of {report.received} records from {path} into {self.table} "
+                 f"in {report.seconds:.2f}s ({report.rows_per_sec:,.0f} rows/sec)")
+        if report.rejected:
+            log.warning(f"Rejected {report.rejected} records from {path}")
+        return report
+
+    def _bulk_load(self, header: List[str], rows: Iterator[List[Any]], report: LoadReport) -> None:
+        """Drop plain indexes, load and recreate them in one transaction."""
+        # autocommit mode, so BEGIN/COMMIT are ours and the DDL is part of the transaction
+        conn = sqlite3.connect(db_path(self.db), isolation_level=None)
+        try:
+            apply_profile(conn, "bulk-load")
+            conn.execute("BEGIN")
+            try:
+                indexes = self._deferrable_indexes(conn)
+                for name, _ in indexes:
+                    conn.execute(f"DROP INDEX {name}")
+                self._load(conn, header, rows, report, commit=False)
+                index_start = time.perf_counter()
+                failed = []
+                for name, sql in indexes:
+                    try:
+                        conn.execute(sql)
+                    except sqlite3.Error as e:
+                        log.error(f"Failed to recreate index {name} on {self.table}: {e}")
+                        failed.append((name, e))
+                if failed:
+                    raise DatabaseError(f"Could not recreate indexes {[name for name, _ in failed]} "
+                                        f"on {self.table}: {failed[0][1]}") from failed[0][1]
+                report.index_seconds = time.perf_counter() - index_start
+                conn.execute("COMMIT")
+            except BaseException:
+                # restores the dropped indexes along with the table contents
+                conn.execute("ROLLBACK")
+                report.inserted = 0
+                raise
+        finally:
+            conn.close()
+
+    def _load(self, conn: sqlite3.Connection, header: List[str], rows: Iterator[List[Any]],
+              report: LoadReport, commit: bool = True) -> None:
+        table_columns = self._table_columns(conn)
+        keep = [j for j, col in enumerate(header) if col in table_columns]
+        columns = [header[j] for j in keep]
+        unknown = [col for col in header if col not in table_columns]
+        if not columns:
+            raise TableError(f"No columns of {report.path} match table {self.table}")
+        if unknown:
+            log.warning(f"Ignoring columns not in {self.table}: {unknown}")
+            rows = ([row[j] for j in keep] for row in rows)
+        insert = f"INSERT INTO {self.table} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})"
+        convert = self._validated if self.validate else self._cast
+
+        try:
+            while chunk := list(islice(rows, self.chunk_size)):
+                rejects: List[Reject] = []
+                good = convert(chunk, columns, report.received, rejects)
+                conn.executemany(insert, good)
+                if commit:
+                    conn.commit()
+                report.received += len(chunk)
+                report.inserted += len(good)
+                report.rejected += len(rejects)
+                report.rejects.extend(rejects[:self.max_rejects - len(report.rejects)])
+        except sqlite3.Error as e:
+            log.error(f"Error loading {report.path} into {self.table} at record {report.received}: {e}")
+            raise DatabaseError(f"Load into {self.table} failed: {e}") from e
+
+
+def load_files(paths: Iterable[Union[str, Path]], table: str, **kwargs: Any) -> List[LoadReport]:
+    """Load several files into one table with the same settings."""
+    loader = FileLoader(table, **kwargs)
+    return [loader.load(path) for path in paths]
+
+
+# Example usage:
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream CSV/JSONL files into a table")
+    parser.add_argument("paths", nargs="+", help="CSV or JSONL files")
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--db", default="source", choices=tuple(_DATABASES))
+    parser.add_argument("--format", choices=("csv", "jsonl"))
+    parser.add_argument("--bulk", action="store_true", help="bulk-load PRAGMAs and deferred indexes")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--cast", nargs="*", default=[], metavar="COLUMN=TYPE",
+                        help=f"per-column casts, TYPE one of {', '.join(CASTS)}")
+    args = parser.parse_args()
+
+    try:
+        loader = FileLoader(args.table, db=args.db, bulk=args.bulk, chunk_size=args.chunk_size,
+                            casts=dict(cast.split("=", 1) for cast in args.cast))
+        for path in args.paths:
+            report = loader.load(path, args.format)
+            print(f"{path}: {report.inserted:,}/{report.received:,} rows in {report.seconds:.2f}s "
+                  f"({report.rows_per_sec:,.0f} rows/sec, indexes {report.index_seconds:.2f}s), "
+                  f"{report.rejected} rejected")
+            for reject in report.rejects[:5]:
+                print(f"  record {reject.index}: {reject.errors}")
+    except (DatabaseError, TableError) as e:
+        log.error(f"Database operation failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,262 @@
+# file: my_n8n/model/positions.py :: 0.0.3
+# per-symbol position summary kept current by triggers on the trades table
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import math
+import time
+from typing import Optional, List, Any, Dict
+
+from pydantic import BaseModel
+from loguru import logger as log
+
+from ._base import _Base, DatabaseError, TableError
+from connection.db_my_n8n import get_db_app, get_db_source, get_db_target
+
+_DATABASES = {"app": get_db_app, "source": get_db_source, "target": get_db_target}
+
+
+class Position(BaseModel):
+    """Position of one symbol."""
+    symbol: str
+    net_quantity: float
+    buy_quantity: float
+    buy_cost: float
+    trades: int
+    last_date: Optional[str] = None
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        """Average purchase price, None before the first buy."""
+        return self.buy_cost / self.buy_quantity if self.buy_quantity else None
+
+    @property
+    def cost_basis(self) -> Optional[float]:
+        """Cost of the shares held at the average purchase price, None unless long."""
+        avg = self.avg_price
+        return self.net_quantity * avg if avg is not None and self.net_quantity > 0 else None
+
+
+class PositionView:
+    """Incrementally maintained ``symbol -> position`` summary of a trades table.
+
+    Trades have ``date, activity, symbol, quantity, price`` columns. SELL
+    rows are sells, anything else a buy. The summary table
+    ``<table>_positions`` holds, per symbol:
+
+    - ``net_quantity``: bought minus sold quantity
+    - ``buy_quantity``/``buy_cost``: quantity and ``quantity * price`` of buys
+    - ``trades``: number of trades
+    - ``last_date``: latest trade date
+
+    ``Position.avg_price`` is the average purchase price
+    (``buy_cost / buy_quantity``) and ``cost_basis`` values the shares
+    held at that price. As in average-cost accounting, sells release shares
+    at the average cost and leave the average unchanged; unlike a running
+    ledger, buys from before the position was last flat stay in the average.
+
+    AFTER INSERT/UPDATE/DELETE triggers apply each change as a delta, so
+    every writer (models, sync, ETL, plain SQL) keeps the summary current
+    and a lookup is one primary-key read instead of a scan. All columns
+    are plain sums, so a delete or update of any trade, in any order, is
+    undone exactly (a running ledger would depend on trade order);
+    ``last_date`` is recomputed on delete from an index on
+    ``(symbol, date)``.
+
+    For bulk loads, :meth:`uninstall` the triggers, load, then
+    :meth:`install` again, which rebuilds the summary in one pass.
+
+    Attributes:
+        table: Trades table
+        view: Summary table name
+        db: ``app``, ``source`` or ``target``
+    """
+
+    def __init__(self, model: _Base, table: Optional[str] = None, db: str = "source"):
+        if db not in _DATABASES:
+            raise ValueError(f"Unknown database: {db}, expected one of {tuple(_DATABASES)}")
+        self.table = table or {"app": model.table_name, "source": model.table_s, "target": model.table_t}[db]
+        self.view = f"{self.table}_positions"
+        self.db = db
+
+    def _connect(self):
+        return _DATABASES[self.db]()
+
+    def _signed(self, row: str) -> str:
+        return f"(CASE WHEN UPPER({row}.activity) = 'SELL' THEN -{row}.quantity ELSE {row}.quantity END)"
+
+    def _bought(self, row: str) -> str:
+        return f"(CASE WHEN UPPER({row}.activity) = 'SELL' THEN 0 ELSE {row}.quantity END)"
+
+    def _aggregate(self) -> str:
+        """Full re-aggregation of the trades table, in summary column order."""
+        t = self.table
+        return f"""
+            SELECT symbol, SUM({self._signed(t)}), SUM({self._bought(t)}), SUM({self._bought(t)} * price),
+                   COUNT(*), MAX(date)
+            FROM {t} GROUP BY symbol"""
+
+    def _ddl(self) -> List[str]:
+        t, v = self.table, self.view
+        add_new = f"""
+            INSERT INTO {v} (symbol, net_quantity, buy_quantity, buy_cost, trades, last_date)
+            VALUES (NEW.symbol, {self._signed('NEW')}, {self._bought('NEW')}, {self._bought('NEW')} * NEW.price,
+                    1, NEW.date)
+            ON CONFLICT (symbol) DO UPDATE SET
+                net_quantity = net_quantity + excluded.net_quantity,
+                buy_quantity = buy_quantity + excluded.buy_quantity,
+                buy_cost = buy_cost + excluded.buy_cost,
+                trades = trades + 1,
+                last_date = MAX(COALESCE(last_date, excluded.last_date), COALESCE(excluded.last_date, last_date));"""
+        remove_old = f"""
+            UPDATE {v} SET
+                net_quantity = net_quantity - {self._signed('OLD')},
+                buy_quantity = buy_quantity - {self._bought('OLD')},
+                buy_cost = buy_cost - {self._bought('OLD')} * OLD.price,
+                trades = trades - 1,
+                last_date = (SELECT MAX(date) FROM {t} WHERE symbol = OLD.symbol)
+            WHERE symbol = OLD.symbol;
+            DELETE FROM {v} WHERE symbol = OLD.symbol AND trades <= 0;"""
+        return [
+            f"""CREATE TABLE IF NOT EXISTS {v} (
+                symbol TEXT PRIMARY KEY,
+                net_quantity REAL NOT NULL,
+                buy_quantity REAL NOT NULL,
+                buy_cost REAL NOT NULL,
+                trades INTEGER NOT NULL,
+                last_date TEXT)""",
+            f"CREATE INDEX IF NOT EXISTS ix_{t}_symbol_date ON {t} (symbol, date)",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_positions_ai AFTER INSERT ON {t} BEGIN {add_new} END",
+            f"CREATE TRIGGER IF NOT EXISTS {t}_positions_ad AFTER DELETE ON {t} BEGIN {remove_old} END",
+            f"""CREATE TRIGGER IF NOT EXISTS {t}_positions_au
+                AFTER UPDATE OF symbol, activity, quantity, price, date ON {t}
+                BEGIN {remove_old} {add_new} END""",
+        ]
+
+    def install(self) -> None:
+        """Create the summary table, index and triggers, and rebuild the summary.
+
+        An existing summary and its triggers are replaced, so reinstalling
+        picks up a changed layout.
+
+        Raises:
+            DatabaseError: If the trades table is missing or DDL fails
+        """
+        try:
+            with self._connect() as conn:
+                self._drop(conn, drop_summary=True)
+                for ddl in self._ddl():
+                    conn.execute(ddl)
+                self._rebuild(conn)
+        except Exception as e:
+            log.error(f"Failed to install position view on {self.table}: {e}")
+            raise
+
+    def uninstall(self, drop_summary: bool = False) -> None:
+        """Drop the triggers (e.g. before a bulk load), optionally the summary table too."""
+        with self._connect() as conn:
+            self._drop(conn, drop_summary)
+
+    def _drop(self, conn: Any, drop_summary: bool) -> None:
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {self.table}_positions_{suffix}")
+        if drop_summary:
+            conn.execute(f"DROP TABLE IF EXISTS {self.view}")
+
+    def _rebuild(self, conn: Any) -> None:
+        conn.execute(f"DELETE FROM {self.view}")
+        conn.execute(f"INSERT INTO {self.view} (symbol, net_quantity, buy_quantity, buy_cost, trades, last_date) "
+                     f"{self._aggregate()}")
+
+    def rebuild(self) -> None:
+        """Recompute the summary from the full trades table."""
+        with self._connect() as conn:
+            self._rebuild(conn)
+
+    def get(self, symbol: str) -> Optional[Position]:
+        """Position of one symbol (primary-key lookup), None if never traded."""
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT symbol, net_quantity, buy_quantity, buy_cost, trades, last_date "
+                               f"FROM {self.view} WHERE symbol = ?", (symbol,)).fetchone()
+        return Position(**dict(row)) if row else None
+
+    def all(self) -> List[Position]:
+        """Every symbol's position, by symbol."""
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT symbol, net_quantity, buy_quantity, buy_cost, trades, last_date "
+                                f"FROM {self.view} ORDER BY symbol").fetchall()
+        return [Position(**dict(row)) for row in rows]
+
+    def verify(self, rel_tol: float = 1e-9) -> Dict[str, Any]:
+        """Compare the summary with a full re-aggregation.
+
+        Incremental float sums drift slightly from a fresh ``SUM``, so
+        quantities and costs are compared within ``rel_tol``.
+
+        Returns:
+            ``{symbol: (summary row, re-aggregated row)}`` for every mismatch
+        """
+        with self._connect() as conn:
+            expected = {row[0]: tuple(row[1:]) for row in conn.execute(self._aggregate())}
+            actual = {row[0]: tuple(row[1:]) for row in conn.execute(
+                f"SELECT symbol, net_quantity, buy_quantity, buy_cost, trades, last_date FROM {self.view}")}
+
+        def same(a: Optional[tuple], b: Optional[tuple]) -> bool:
+            return a is not None and b is not None and a[3:] == b[3:] and all(
+                math.isclose(x, y, rel_tol=rel_tol, abs_tol=1e-6) for x, y in zip(a[:3], b[:3]))
+
+        return {symbol: (actual.get(symbol), expected.get(symbol))
+                for symbol in expected.keys() | actual.keys() if not same(actual.get(symbol), expected.get(symbol))}
+
+
+# Example usage:
+if __name__ == "__main__":
+    import random
+
+    class Trade(_Base):
+        """Trade rows as stored in source.db"""
+        table_name: str = "trade"
+        columns = ("id INTEGER PRIMARY KEY", "date", "activity", "symbol", "quantity", "price")
+
+    def trade() -> tuple:
+        return (f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}", random.choice(("BUY", "SELL")),
+                random.choice(("IBM", "META", "MSFT", "AAPL")), random.randint(1, 1000),
+                round(random.uniform(10, 1000), 2))
+
+    try:
+        m = Trade()
+        m._auto_drop_source_table(m)
+        m._auto_create_source_table(m)
+        view = PositionView(m)
+        view.uninstall(drop_summary=True)
+        insert = f"INSERT INTO {m.table_s} (date, activity, symbol, quantity, price) VALUES (?, ?, ?, ?, ?)"
+
+        # bulk load without triggers, then install (rebuilds once)
+        with get_db_source() as conn:
+            conn.executemany(insert, (trade() for _ in range(200_000)))
+        view.install()
+
+        # row-level writes go through the triggers
+        with get_db_source() as conn:
+            conn.executemany(insert, (trade() for _ in range(1_000)))
+            conn.execute(f"UPDATE {m.table_s} SET quantity = quantity + 5, symbol = 'IBM' WHERE id % 97 = 0")
+            conn.execute(f"DELETE FROM {m.table_s} WHERE id % 89 = 0")
+        print(f"Mismatches after inserts/updates/deletes: {view.verify() or 'none'}")
+
+        start = time.perf_counter()
+        position = view.get("IBM")
+        lookup = time.perf_counter() - start
+        start = time.perf_counter()
+        with get_db_source() as conn:
+            conn.execute(f"SELECT SUM({view._signed(m.table_s)}), SUM({view._signed(m.table_s)} * price) "
+                         f"FROM {m.table_s} WHERE symbol = 'IBM'").fetchone()
+            conn.execute(f"SELECT symbol, SUM(quantity) FROM {m.table_s} GROUP BY symbol").fetchall()
+        scan = time.perf_counter() - start
+        print(f"IBM: {position} avg_price={position.avg_price:.2f} cost_basis={position.cost_basis}")
+        print(f"Lookup {lookup * 1000:.3f}ms vs re-aggregation {scan * 1000:.1f}ms")
+
+    except (DatabaseError, TableError) as e:
+        log.error(f"Database operation failed: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error: {e}")
@@ -0,0 +1,277 @@
+# file: my_n8n/model/query.py :: 0.0.3
+# small query builder compiling to parameterized SQL (sqlite / postgres)
+import re
+import sys
+from typing import Optional, Tuple, List, Dict, Any, Callable, Iterable, Sequence
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_COMPARISONS = {"=": "=", "==": "=", "!=": "<>", "<>": "<>", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+_AGGREGATES = {"count", "sum", "avg", "min", "max"}
+PLACEHOLDERS = {"sqlite": "?", "postgres": "%s"}
+
+# runner(sql, params) -> (column names, rows)
+Runner = Callable[[str, List[Any]], Tuple[List[str], List[Sequence[Any]]]]
+
+
+class QueryError(ValueError):
+    """Exception for invalid query construction"""
+    pass
+
+
+def _escape_like(value: str) -> str:
+    """Escape ``LIKE`` wildcards with Postgres' default escape character."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _prefix_upper_bound(prefix: str) -> Optional[str]:
+    """Smallest string greater than every string starting with ``prefix``, None if there is none.
+
+    The last character that is not the maximum code point is incremented
+    and everything after it dropped; surrogates, which cannot be encoded,
+    are skipped.
+    """
+    chars = list(prefix)
+    while chars:
+        code = ord(chars.pop()) + 1
+        if code <= sys.maxunicode:
+            if 0xD800 <= code <= 0xDFFF:
+                code = 0xE000
+            return "".join(chars) + chr(code)
+    return None
+
+
+class Query:
+    """Immutable SELECT builder.
+
+    Every builder method returns a new query, so a base query can be reused.
+    Values are always bound as parameters; identifiers are checked against
+    the known columns (or a plain-identifier pattern when none are given).
+
+    Supported filters (``where(column, op, value)``):
+
+    - comparisons ``=``, ``!=``, ``<``, ``<=``, ``>``, ``>=``
+    - ``between`` with a ``(low, high)`` pair, inclusive
+    - ``in`` / ``not in`` with an iterable
+    - ``startswith``: case-sensitive prefix match under any column
+      collation. On SQLite it compiles to a ``BINARY`` half-open range
+      ``col >= prefix AND col < next`` (``next`` is the prefix with its last
+      character incremented), which an index on the column can use unlike
+      ``LIKE``, plus an exact ``substr(col, 1, n) = prefix``. On Postgres it
+      compiles to ``LIKE 'prefix%'`` with the prefix escaped, which the
+      planner turns into an index range under the ``C`` collation or with a
+      ``text_pattern_ops`` index
+    - ``is null`` / ``is not null`` (value ignored)
+
+    Example::
+
+        q = (Query("trade_s").where("symbol", "in", ["IBM", "MSFT"])
+             .where("date", "between", ("2024-01-01", "2024-12-31"))
+             .where("quantity", ">", 100).order_by("-date").limit(10))
+        sql, params = q.compile("postgres")
+
+    Attributes:
+        table: Table name
+        columns: Known column names, used to validate identifiers
+        dialect: Default dialect for :meth:`compile`
+    """
+
+    def __init__(self, table: str, columns: Optional[Iterable[str]] = None, dialect: str = "sqlite",
+                 runner: Optional[Runner] = None):
+        if dialect not in PLACEHOLDERS:
+            raise QueryError(f"Unknown dialect: {dialect}")
+        self.columns = tuple(columns) if columns else None
+        self.table = self._check(table, table=True)
+        self.dialect = dialect
+        self._runner = runner
+        self._select: Tuple[str, ...] = ()
+        self._where: List[Tuple[str, str, Any]] = []
+        self._group_by: Tuple[str, ...] = ()
+        self._order_by: List[Tuple[str, bool]] = []
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+
+    def _check(self, name: str, table: bool = False) -> str:
+        if not _IDENTIFIER.match(name):
+            raise QueryError(f"Invalid identifier: {name!r}")
+        if not table and self.columns and name not in self.columns:
+            raise QueryError(f"Unknown column {name!r} for {self.table}")
+        return name
+
+    def _clone(self) -> "Query":
+        q = Query.__new__(Query)
+        q.__dict__.update(self.__dict__)
+        q._where = list(self._where)
+        q._order_by = list(self._order_by)
+        return q
+
+    # ------------------------------------------------------------------ builder
+    def select(self, *exprs: str) -> "Query":
+        """Choose output columns or aggregates like ``count(*)``, ``sum(quantity)``."""
+        q = self._clone()
+        checked = []
+        for expr in exprs:
+            m = re.match(r"^(\w+)\((\*|\w+)\)$", expr.replace(" ", ""))
+            if m:
+                func, arg = m.group(1).lower(), m.group(2)
+                if func not in _AGGREGATES:
+                    raise QueryError(f"Unsupported aggregate: {func}")
+                if arg != "*":
+                    self._check(arg)
+                elif func != "count":
+                    raise QueryError(f"{func}(*) is not valid")
+                checked.append(f"{func.upper()}({arg})")
+            else:
+                checked.append(self._check(expr))
+        q._select = tuple(checked)
+        return q
+
+    def where(self, column: str, op: str, value: Any = None) -> "Query":
+        """Add a condition; all conditions are joined with AND."""
+        op = op.lower().strip()
+        if op not in _COMPARISONS and op not in ("between", "in", "not in", "startswith",
+                                                  "is null", "is not null"):
+            raise QueryError(f"Unsupported operator: {op}")
+        if op == "between" and (not isinstance(value, (tuple, list)) or len(value) != 2):
+            raise QueryError("between needs a (low, high) pair")
+        if op in ("in", "not in"):
+            value = list(value)
+        q = self._clone()
+        q._where.append((self._check(column), op, value))
+        return q
+
+    def filter(self, **equals: Any) -> "Query":
+        """Shorthand for equality conditions: ``filter(symbol="IBM")``."""
+        q = self
+        for column, value in equals.items():
+            q = q.where(column, "is null") if value is None else q.where(column, "=", value)
+        return q
+
+    def group_by(self, *columns: str) -> "Query":
+        q = self._clone()
+        q._group_by = tuple(self._check(col) for col in columns)
+        return q
+
+    def order_by(self, *columns: str) -> "Query":
+        """Order by columns; prefix with ``-`` for descending."""
+        q = self._clone()
+        q._order_by = [(self._check(col.lstrip("-")), col.startswith("-")) for col in columns]
+        return q
+
+    def limit(self, n: int, offset: Optional[int] = None) -> "Query":
+        q = self._clone()
+        q._limit = int(n)
+        q._offset = int(offset) if offset is not None else None
+        return q
+
+    # ----------------------------------------------------------------- compile
+    def compile(self, dialect: Optional[str] = None) -> Tuple[str, List[Any]]:
+        """Compile to SQL text and a parameter list.
+
+        Args:
+            dialect: ``sqlite`` or ``postgres``; defaults to the query's dialect
+
+        Returns:
+            Tuple of (sql, params)
+        """
+        dialect = dialect or self.dialect
+        ph = PLACEHOLDERS[dialect]
+        params: List[Any] = []
+        conditions = []
+        for column, op, value in self._where:
+            if op in _COMPARISONS:
+                if value is None:
+                    raise QueryError(f"Use 'is null' to compare {column} with None")
+                conditions.append(f"{column} {_COMPARISONS[op]} {ph}")
+                params.append(value)
+            elif op == "between":
+                conditions.append(f"{column} BETWEEN {ph} AND {ph}")
+                params.extend(value)
+            elif op in ("in", "not in"):
+                if not value:
+                    # empty IN matches nothing, empty NOT IN matches everything
+                    conditions.append("1 = 0" if op == "in" else "1 = 1")
+                    continue
+                conditions.append(f"{column} {op.upper()} ({', '.join([ph] * len(value))})")
+                params.extend(value)
+            elif op == "startswith":
+                prefix = str(value)
+                if dialect == "postgres":
+                    conditions.append(f"{column} LIKE {ph}")
+                    params.append(_escape_like(prefix) + "%")
+                    continue
+                # BINARY: the range only brackets the prefix under code point order
+                upper = _prefix_upper_bound(prefix)
+                if upper is not None:
+                    conditions.append(f"{column} >= {ph} COLLATE BINARY AND {column} < {ph} COLLATE BINARY")
+                    params.extend((prefix, upper))
+                conditions.append(f"substr({column}, 1, {len(prefix)}) = {ph}")
+                params.append(prefix)
+            else:
+                conditions.append(f"{column} {op.upper()}")
+
+        sql = f"SELECT {', '.join(self._select) or '*'} FROM {self.table}"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if self._group_by:
+            sql += " GROUP BY " + ", ".join(self._group_by)
+        if self._order_by:
+            sql += " ORDER BY " + ", ".join(f"{col}{' DESC' if desc else ''}" for col, desc in self._order_by)
+        if self._limit is not None:
+            sql += f" LIMIT {ph}"
+            params.append(self._limit)
+            if self._offset is not None:
+                sql += f" OFFSET {ph}"
+                params.append(self._offset)
+        return sql, params
+
+    # ----------------------------------------------------------------- execute
+    def _run(self) -> Tuple[List[str], List[Sequence[Any]]]:
+        if self._runner is None:
+            raise QueryError("Query is not bound to a database; use Model.select() or compile()")
+        sql, params = self.compile()
+        return self._runner(sql, params)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Execute and return every row as a dict."""
+        names, rows = self._run()
+        return [dict(zip(names, row)) for row in rows]
+
+    def first(self) -> Optional[Dict[str, Any]]:
+        """Execute with ``LIMIT 1`` and return the row or None."""
+        rows = self.limit(1).all()
+        return rows[0] if rows else None
+
+    def scalar(self) -> Any:
+        """Execute and return the first column of the first row."""
+        _, rows = self._run()
+        return rows[0][0] if rows else None
+
+    def _aggregate(self, expr: str) -> Any:
+        q = self._clone()
+        q._order_by, q._limit, q._offset, q._group_by = [], None, None, ()
+        return q.select(expr).scalar()
+
+    def count(self) -> int:
+        """``SELECT COUNT(*)`` over the current conditions."""
+        return self._aggregate("count(*)") or 0
+
+    def sum(self, column: str) -> Any:
+        """``SELECT SUM(column)`` over the current conditions."""
+        return self._aggregate(f"sum({column})")
+
+    def __repr__(self) -> str:
+        sql, params = self.compile()
+        return f"Query({sql!r}, {params!r})"
+
+
+# Example usage:
+if __name__ == "__main__":
+    trades = (Query("trade_s", ("id", "date", "activity", "symbol", "quantity", "price"))
+              .where("symbol", "in", ["IBM", "MSFT"])
+              .where("date", "between", ("2024-01-01", "2024-12-31"))
+              .where("quantity", ">", 100)
+              .where("activity", "startswith", "BU"))
+    latest = trades.order_by("-date", "id").limit(10)
+    print(latest.compile("sqlite"))
+    print(latest.compile("postgres"))
+    print(trades.select("symbol", "sum(quantity)", "count(*)").group_by("symbol").compile())
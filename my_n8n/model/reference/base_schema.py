@@ -1,15 +1,28 @@
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import base64
+import json
+import time
 from datetime import datetime, timezone
-from typing import TypeVar, ClassVar, Optional, Any
-import psycopg
+from itertools import islice
+from typing import TypeVar, ClassVar, Optional, Any, Iterable, Iterator
 from pydantic import BaseModel, Field
 
-from my_n8n.connection.db_my_n8n import get_db_connection
+from connection.db_my_n8n import get_db_pg_pooled
+from connection.metrics import METRICS, timed_operation
+from model.query import Query
 
 T = TypeVar("T", bound="BaseSchema")
 
 
-class BaseSchema(BaseModel):
-    conn: ClassVar[psycopg.Connection] = get_db_connection()
+class SchemaBase(BaseModel):
+    """Fields and SQL building shared by ``BaseSchema`` and ``async_base.AsyncBaseSchema``.
+
+    The ``_*_query`` builders return ``(query, params)`` for one CRUD
+    statement; subclasses only decide how to execute them.
+    """
     table_name: ClassVar[str] = None  # Must be set in subclasses
     table_columns: ClassVar[tuple[str, ...]] = ()  # Define columns in subclasses
 
@@ -37,12 +50,56 @@ class BaseSchema(BaseModel):
         },
     }
 
+    @classmethod
+    def transform_record(cls, record: tuple) -> dict:
+        """Convert a database record tuple to a dictionary."""
+        return {col: record[i] for i, col in enumerate(cls.table_columns)} if record else None
+
+    @classmethod
+    def _insert_query(cls, kwargs: dict) -> tuple[str, tuple]:
+        query = f"""
+            INSERT INTO {cls.table_name} ({', '.join(cls.table_columns)})
+            VALUES ({', '.join(['%s'] * len(cls.table_columns))})
+            RETURNING {', '.join(cls.table_columns)}"""
+        return query, tuple(kwargs.get(col, None) for col in cls.table_columns)
+
+    @classmethod
+    def _select_query(cls, filters: Optional[dict] = None) -> tuple[str, tuple]:
+        filters = filters or {}
+        query = f"SELECT {', '.join(cls.table_columns)} FROM {cls.table_name}"
+        if filters:
+            query += " WHERE " + " AND ".join(f"{col} = %s" for col in filters)
+        return query, tuple(filters.values())
+
+    @classmethod
+    def _update_query(cls, id: int, kwargs: dict) -> Optional[tuple[str, tuple]]:
+        """UPDATE of the known columns in ``kwargs``, None if there are none."""
+        cols = [col for col in cls.table_columns if col in kwargs]
+        if not cols:
+            return None
+        query = f"""
+            UPDATE {cls.table_name}
+            SET {', '.join([f'{col} = %s' for col in cols])}
+            WHERE id = %s
+            RETURNING {', '.join(cls.table_columns)}"""
+        return query, tuple(kwargs[col] for col in cols) + (id,)
+
+    @classmethod
+    def _delete_query(cls, id: int) -> tuple[str, tuple]:
+        return f"DELETE FROM {cls.table_name} WHERE id = %s", (id,)
+
+
+class BaseSchema(SchemaBase):
     @classmethod
     def execute_query(cls, query: str, params: tuple = (), fetch: Optional[str] = "one"):
-        """Helper method to execute a query and fetch results."""
-        with cls.conn.cursor() as cursor:
-            cursor.execute(query, params)
-            cls.conn.commit()
+        """Helper method to execute a query and fetch results; commits on success."""
+        with get_db_pg_pooled() as conn, conn.cursor() as cursor:
+            if METRICS.enabled:
+                start = time.perf_counter()
+                cursor.execute(query, params)
+                METRICS.statement("postgres", query, time.perf_counter() - start, max(cursor.rowcount, 0))
+            else:
+                cursor.execute(query, params)
             if fetch == "one":
                 return cursor.fetchone()
             elif fetch == "all":
@@ -50,61 +107,156 @@ class BaseSchema(BaseModel):
             return None  # For operations like DELETE or UPDATE
 
     @classmethod
-    def transform_record(cls, record: tuple) -> dict:
-        """Convert a database record tuple to a dictionary."""
-        return {col: record[i] for i, col in enumerate(cls.table_columns)} if record else None
-
-    @classmethod
+    @timed_operation()
     def create_record(cls, **kwargs) -> Optional[dict]:
         """Insert a new record and return it."""
-        query = f"""
-            INSERT INTO {cls.table_name} ({', '.join(cls.table_columns)})
-            VALUES ({', '.join(['%s'] * len(cls.table_columns))})
-            RETURNING *"""
-        values = tuple(kwargs.get(col, None) for col in cls.table_columns)
-        result = cls.execute_query(query, values)
+        result = cls.execute_query(*cls._insert_query(kwargs))
         return cls.transform_record(result)
 
     @classmethod
+    @timed_operation()
     def get_record(cls, id: int) -> Optional[dict]:
         """Fetch a single record by ID."""
-        query = f"SELECT {', '.join(cls.table_columns)} FROM {cls.table_name} WHERE id = %s"
-        result = cls.execute_query(query, (id,))
+        result = cls.execute_query(*cls._select_query({"id": id}))
         return cls.transform_record(result)
 
     @classmethod
+    @timed_operation()
     def get_all_records(cls) -> list[dict]:
         """Fetch all records."""
-        query = f"SELECT {', '.join(cls.table_columns)} FROM {cls.table_name}"
-        results = cls.execute_query(query, fetch="all")
+        results = cls.execute_query(*cls._select_query(), fetch="all")
         return [cls.transform_record(record) for record in results]
 
     @classmethod
+    def iter_all_records(cls, filters: Optional[dict] = None, batch_size: int = 1_000) -> Iterator[dict]:
+        """Lazily yield records, optionally filtered, through a server-side cursor."""
+        query, params = cls._select_query(filters)
+        # a named cursor streams from the server instead of buffering the result client-side
+        with get_db_pg_pooled() as conn, conn.cursor(name=f"iter_{cls.table_name}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            while rows := cursor.fetchmany(batch_size):
+                for record in rows:
+                    yield cls.transform_record(record)
+
+    @classmethod
+    @timed_operation()
+    def get_page(cls, after: Optional[str] = None, limit: int = 100,
+                 order_by: tuple[str, ...] = ("id",), descending: bool = False, **kwargs) -> dict:
+        """Fetch one page using keyset pagination; returns items and an opaque next_cursor."""
+        if limit < 1:
+            raise ValueError(f"Page limit must be at least 1, got {limit}")
+        order_by = tuple(order_by) if "id" in order_by else (*order_by, "id")
+        conditions = [f"{col} = %s" for col in kwargs.keys()]
+        params = list(kwargs.values())
+        if after is not None:
+            values = json.loads(base64.urlsafe_b64decode(after.encode()))
+            conditions.append(f"({', '.join(order_by)}) {'<' if descending else '>'} "
+                              f"({', '.join(['%s'] * len(order_by))})")
+            params.extend(values)
+        direction = " DESC" if descending else ""
+        columns = tuple(dict.fromkeys((*cls.table_columns, *order_by)))
+        query = f"SELECT {', '.join(columns)} FROM {cls.table_name}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += f" ORDER BY {', '.join(col + direction for col in order_by)} LIMIT %s"
+        results = cls.execute_query(query, (*params, limit + 1), fetch="all")
+
+        rows = [dict(zip(columns, record)) for record in results]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = base64.urlsafe_b64encode(
+                json.dumps([last[col] for col in order_by], default=str).encode()).decode()
+        items = [{col: row[col] for col in cls.table_columns} for row in rows[:limit]]
+        return {"items": items, "next_cursor": next_cursor}
+
+    @classmethod
+    def select(cls, *exprs: str) -> Query:
+        """Start a Postgres query on this table (ranges, IN, prefix match, IS NULL, ORDER BY, LIMIT, COUNT/SUM)."""
+        def run(query: str, params: list) -> tuple[list[str], list]:
+            with get_db_pg_pooled() as conn, conn.cursor() as cursor:
+                cursor.execute(query, params)
+                return [d.name for d in cursor.description], cursor.fetchall()
+
+        query = Query(cls.table_name, ("id", *cls.table_columns), dialect="postgres", runner=run)
+        return query.select(*exprs) if exprs else query
+
+    @classmethod
+    @timed_operation()
     def update_record(cls, id: int, **kwargs) -> Optional[dict]:
         """Update a record by ID."""
-        cols = [col for col in cls.table_columns if col in kwargs]
-        if not cols:
+        update = cls._update_query(id, kwargs)
+        if update is None:
             return None
-        query = f"""
-            UPDATE {cls.table_name} 
-            SET {', '.join([f'{col} = %s' for col in cols])}
-            WHERE id = %s
-            RETURNING *"""
-        values = tuple(kwargs[col] for col in cols) + (id,)
-        result = cls.execute_query(query, values)
+        result = cls.execute_query(*update)
         return cls.transform_record(result)
 
     @classmethod
+    @timed_operation()
     def delete_record(cls, id: int) -> bool:
         """Delete a record by ID."""
-        query = f"DELETE FROM {cls.table_name} WHERE id = %s"
-        cls.execute_query(query, (id,), fetch=None)  # No fetching for DELETE
+        cls.execute_query(*cls._delete_query(id), fetch=None)  # No fetching for DELETE
         return True
 
     @classmethod
+    @timed_operation()
     def filter_records(cls, **kwargs) -> list[dict]:
         """Filter records based on criteria."""
-        conditions = " AND ".join([f"{col} = %s" for col in kwargs.keys()])
-        query = f"SELECT {', '.join(cls.table_columns)} FROM {cls.table_name} WHERE {conditions}"
-        results = cls.execute_query(query, tuple(kwargs.values()), fetch="all")
+        results = cls.execute_query(*cls._select_query(kwargs), fetch="all")
         return [cls.transform_record(record) for record in results]
+
+    @classmethod
+    @timed_operation()
+    def bulk_upsert(cls, records: Iterable[dict], conflict_keys: tuple[str, ...] = ("id",),
+                    update_columns: Optional[tuple[str, ...]] = None,
+                    chunk_size: int = 5_000) -> dict[str, int]:
+        """Insert or update records in batches inside one transaction.
+
+        Each batch is one multi-row INSERT ... ON CONFLICT DO UPDATE; the
+        ``xmax = 0`` returning column tells inserted rows from updated ones.
+        Keys repeated within a batch keep the last record. Records with a
+        NULL or missing key cannot conflict; they are inserted without the
+        key columns, so ``id`` comes from its default, in one multi-row
+        INSERT per batch and column set.
+        """
+        columns = tuple(dict.fromkeys((*conflict_keys, *cls.table_columns)))
+        if update_columns is None:
+            update_columns = tuple(col for col in columns if col not in conflict_keys and col != "created_at")
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        conflict = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+        row = "(" + ", ".join(["%s"] * len(columns)) + ")"
+        # Postgres allows at most 65535 bind parameters per statement
+        rows_per_chunk = max(1, min(chunk_size, 65535 // len(columns)))
+
+        counts = {"inserted": 0, "updated": 0}
+        it = iter(records)
+        with get_db_pg_pooled() as conn, conn.cursor() as cursor:
+            while chunk := list(islice(it, rows_per_chunk)):
+                batch: dict[tuple, dict] = {}
+                keyless: dict[tuple[str, ...], list[dict]] = {}
+                for r in chunk:
+                    key = tuple(r.get(k) for k in conflict_keys)
+                    if None in key:
+                        # a NULL key never conflicts; omit it so serial/identity defaults apply
+                        names = tuple(col for col in columns if col not in conflict_keys or r.get(col) is not None)
+                        keyless.setdefault(names, []).append(r)
+                    else:
+                        batch[key] = r
+                for names, group in keyless.items():
+                    values = "(" + ", ".join(["%s"] * len(names)) + ")"
+                    cursor.execute(f"INSERT INTO {cls.table_name} ({', '.join(names)}) "
+                                   f"VALUES {', '.join([values] * len(group))}",
+                                   [r.get(col) for r in group for col in names])
+                    counts["inserted"] += len(group)
+                if not batch:
+                    continue
+                query = f"""
+                    INSERT INTO {cls.table_name} ({', '.join(columns)})
+                    VALUES {', '.join([row] * len(batch))}
+                    ON CONFLICT ({', '.join(conflict_keys)}) {conflict}
+                    RETURNING (xmax = 0)"""
+                cursor.execute(query, [r.get(col) for r in batch.values() for col in columns])
+                for (inserted,) in cursor.fetchall():
+                    counts["inserted" if inserted else "updated"] += 1
+        return counts
@@ -0,0 +1,346 @@
+# file: my_n8n/model/sync.py :: 0.0.2
+# source -> target bulk copy
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import json
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Optional, TypeVar, Tuple, List, Dict, Any, Iterator, Iterable, Callable
+from pydantic import BaseModel
+from loguru import logger as log
+
+from ._base import _Base, DatabaseError, TableError
+from connection.db_my_n8n import get_db_source, get_db_target, get_db_pg
+
+T = TypeVar("T", bound=_Base)
+
+
+class SyncReport(BaseModel):
+    """Outcome of one sync run."""
+    source_table: str
+    target_table: str
+    backend: str
+    rows: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    watermark: Optional[Tuple[Any, Any]] = None
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Throughput of the run."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+class SyncEngine:
+    """Stream rows from a model's source table into its target table.
+
+    Rows are read from the source database with ``fetchmany`` so at most one
+    chunk is held in memory, and written with the fastest path of the target
+    backend:
+
+    - ``sqlite``: chunked ``executemany`` inside a single transaction on the
+      target database
+    - ``postgres``: one ``COPY ... FROM STDIN`` fed chunk by chunk
+
+    :meth:`run` copies the whole table; :meth:`run_incremental` only moves rows
+    changed since the previous run and upserts them, keeping a high-water mark
+    per table pair in ``sync_state`` on the target database. The mark is
+    written in the same transaction as the rows, so a failed run is retried
+    from the previous mark. Deleted source rows are not propagated.
+
+    Attributes:
+        model: Model instance whose ``table_s``/``table_t`` are synced
+        backend: Target backend, ``sqlite`` or ``postgres``
+        chunk_size: Rows per fetch/write chunk
+        columns: Columns to copy; defaults to the model columns, or every
+            source column if the model declares none
+    """
+    backends = ("sqlite", "postgres")
+    state_table = "sync_state"
+
+    def __init__(self, model: T, backend: str = "sqlite", chunk_size: int = 10_000,
+                 columns: Optional[Tuple[str, ...]] = None,
+                 source_table: Optional[str] = None, target_table: Optional[str] = None):
+        if backend not in self.backends:
+            raise ValueError(f"Unknown backend: {backend}, expected one of {self.backends}")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.model = model
+        self.backend = backend
+        self.chunk_size = chunk_size
+        self.columns = columns or tuple(col.split()[0] for col in model.columns) or None
+        self.source_table = source_table or model.table_s
+        self.target_table = target_table or model.table_t
+
+    def extract(self, conn: sqlite3.Connection, where: str = "",
+                params: tuple = ()) -> Tuple[Tuple[str, ...], Iterator[List[tuple]]]:
+        """Open a streaming read over the source table.
+
+        Args:
+            conn: Source database connection
+            where: Optional SQL appended after ``FROM`` (``WHERE``/``ORDER BY``)
+            params: Parameters for ``where``
+
+        Returns:
+            Column names and an iterator of row chunks (lists of tuples)
+        """
+        select = ", ".join(self.columns) if self.columns else "*"
+        cur = conn.cursor()
+        # plain tuples are cheaper than sqlite3.Row and accepted by both writers
+        cur.row_factory = None
+        cur.execute(f"SELECT {select} FROM {self.source_table} {where}", params)
+        columns = tuple(d[0] for d in cur.description)
+
+        def chunks() -> Iterator[List[tuple]]:
+            while True:
+                rows = cur.fetchmany(self.chunk_size)
+                if not rows:
+                    return
+                yield rows
+
+        return columns, chunks()
+
+    def _upsert_clause(self, columns: Tuple[str, ...], key: str) -> str:
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col != key)
+        return f"ON CONFLICT ({key}) DO UPDATE SET {updates}" if updates else f"ON CONFLICT ({key}) DO NOTHING"
+
+    def _load_sqlite(self, columns: Tuple[str, ...], chunks: Iterable[List[tuple]],
+                     report: SyncReport, upsert_key: Optional[str] = None,
+                     finalize: Optional[Callable[[Any], None]] = None) -> None:
+        query = (f"INSERT INTO {self.target_table} ({', '.join(columns)}) "
+                 f"VALUES ({', '.join(['?'] * len(columns))})")
+        if upsert_key:
+            query += " " + self._upsert_clause(columns, upsert_key)
+        with get_db_target() as conn:
+            # get_db_target commits once on exit, so every chunk shares one transaction
+            cur = conn.cursor()
+            for rows in chunks:
+                cur.executemany(query, rows)
+                report.rows += len(rows)
+                report.chunks += 1
+            if finalize:
+                finalize(cur)
+
+    def _load_postgres(self, columns: Tuple[str, ...], chunks: Iterable[List[tuple]],
+                       report: SyncReport, upsert_key: Optional[str] = None,
+                       finalize: Optional[Callable[[Any], None]] = None) -> None:
+        cols = ", ".join(columns)
+        table = self.target_table
+        if upsert_key:
+            # COPY cannot merge, so stage the delta and upsert it in one statement
+            table = f"_stage_{self.target_table}"
+        with get_db_pg() as conn:
+            with conn.cursor() as cur:
+                if upsert_key:
+                    cur.execute(f"CREATE TEMP TABLE {table} (LIKE {self.target_table} INCLUDING DEFAULTS) "
+                                f"ON COMMIT DROP")
+                with cur.copy(f"COPY {table} ({cols}) FROM STDIN") as copy:
+                    for rows in chunks:
+                        for row in rows:
+                            copy.write_row(row)
+                        report.rows += len(rows)
+                        report.chunks += 1
+                if upsert_key:
+                    cur.execute(f"INSERT INTO {self.target_table} ({cols}) SELECT {cols} FROM {table} "
+                                f"{self._upsert_clause(columns, upsert_key)}")
+                if finalize:
+                    finalize(cur)
+
+    def run(self) -> SyncReport:
+        """Copy every source row into the target table.
+
+        Returns:
+            SyncReport with row/chunk counts, elapsed time and rows/sec
+
+        Raises:
+            DatabaseError: If reading or writing fails; the target transaction
+                is rolled back
+        """
+        report = SyncReport(source_table=self.source_table, target_table=self.target_table,
+                            backend=self.backend)
+        start = time.perf_counter()
+        try:
+            with get_db_source() as src:
+                columns, chunks = self.extract(src)
+                load = self._load_sqlite if self.backend == "sqlite" else self._load_postgres
+                load(columns, chunks, report)
+        except Exception as e:
+            log.error(f"Sync {self.source_table} -> {self.target_table} failed: {e}")
+            raise
+        report.seconds = time.perf_counter() - start
+        log.info(f"Synced {report.rows} rows {self.source_table} -> {self.target_table} "
+                 f"in {report.seconds:.2f}s ({report.rows_per_sec:,.0f} rows/sec)")
+        return report
+
+    def _placeholder(self) -> str:
+        return "?" if self.backend == "sqlite" else "%s"
+
+    def _ensure_state_table(self) -> None:
+        ddl = (f"CREATE TABLE IF NOT EXISTS {self.state_table} ("
+               "source_table TEXT NOT NULL, target_table TEXT NOT NULL, "
+               "watermark TEXT, rows_synced INTEGER, synced_at TEXT, "
+               "PRIMARY KEY (source_table, target_table))")
+        if self.backend == "sqlite":
+            with get_db_target() as conn:
+                conn.execute(ddl)
+        else:
+            with get_db_pg() as conn:
+                conn.execute(ddl)
+
+    def get_watermark(self) -> Optional[Tuple[Any, Any]]:
+        """Read the stored high-water mark for this source/target pair.
+
+        Returns:
+            ``(updated_at, key)`` of the last synced row, or None before the first run
+        """
+        self._ensure_state_table()
+        ph = self._placeholder()
+        query = (f"SELECT watermark FROM {self.state_table} "
+                 f"WHERE source_table = {ph} AND target_table = {ph}")
+        params = (self.source_table, self.target_table)
+        if self.backend == "sqlite":
+            with get_db_target() as conn:
+                row = conn.execute(query, params).fetchone()
+        else:
+            with get_db_pg() as conn:
+                row = conn.execute(query, params).fetchone()
+        return tuple(json.loads(row[0])) if row and row[0] else None
+
+    def reset_watermark(self) -> None:
+        """Forget the stored high-water mark so the next incremental run copies everything."""
+        self._ensure_state_table()
+        ph = self._placeholder()
+        query = f"DELETE FROM {self.state_table} WHERE source_table = {ph} AND target_table = {ph}"
+        params = (self.source_table, self.target_table)
+        if self.backend == "sqlite":
+            with get_db_target() as conn:
+                conn.execute(query, params)
+        else:
+            with get_db_pg() as conn:
+                conn.execute(query, params)
+
+    def _write_watermark(self, cur: Any, report: SyncReport) -> None:
+        ph = self._placeholder()
+        cur.execute(
+            f"INSERT INTO {self.state_table} (source_table, target_table, watermark, rows_synced, synced_at) "
+            f"VALUES ({ph}, {ph}, {ph}, {ph}, {ph}) "
+            "ON CONFLICT (source_table, target_table) DO UPDATE SET "
+            "watermark = excluded.watermark, rows_synced = excluded.rows_synced, synced_at = excluded.synced_at",
+            (self.source_table, self.target_table, json.dumps(report.watermark, default=str),
+             report.rows, datetime.now(timezone.utc).isoformat()))
+
+    def run_incremental(self, key: str = "id", updated_column: str = "updated_at") -> SyncReport:
+        """Upsert only rows changed since the stored high-water mark.
+
+        Rows are extracted in ``(updated_column, key)`` order after the mark,
+        upserted into the target on ``key``, and the mark is advanced to the
+        last row in the same target transaction. With no new rows the mark is
+        left untouched.
+
+        Args:
+            key: Unique key column used as tiebreaker and upsert conflict target
+            updated_column: Monotonic change timestamp column
+
+        Returns:
+            SyncReport for the delta, with the new ``watermark``
+
+        Raises:
+            DatabaseError: If reading or writing fails; target rows and mark are rolled back
+        """
+        if self.columns and (key not in self.columns or updated_column not in self.columns):
+            raise ValueError(f"Incremental sync needs {key} and {updated_column} among the synced columns")
+        watermark = self.get_watermark()
+        report = SyncReport(source_table=self.source_table, target_table=self.target_table,
+                            backend=self.backend, watermark=watermark)
+        where, params = f"ORDER BY {updated_column}, {key}", ()
+        if watermark:
+            where = (f"WHERE {updated_column} > ? OR ({updated_column} = ? AND {key} > ?) " + where)
+            params = (watermark[0], watermark[0], watermark[1])
+
+        start = time.perf_counter()
+        try:
+            with get_db_source() as src:
+                columns, chunks = self.extract(src, where, params)
+                if updated_column not in columns or key not in columns:
+                    raise ValueError(f"{self.source_table} has no {key}/{updated_column} column")
+                ui, ki = columns.index(updated_column), columns.index(key)
+
+                def tracked() -> Iterator[List[tuple]]:
+                    for rows in chunks:
+                        report.watermark = (rows[-1][ui], rows[-1][ki])
+                        yield rows
+
+                def finalize(cur: Any) -> None:
+                    if report.rows:
+                        self._write_watermark(cur, report)
+
+                load = self._load_sqlite if self.backend == "sqlite" else self._load_postgres
+                load(columns, tracked(), report, upsert_key=key, finalize=finalize)
+        except Exception as e:
+            log.error(f"Incremental sync {self.source_table} -> {self.target_table} failed: {e}")
+            raise
+        report.seconds = time.perf_counter() - start
+        log.info(f"Incrementally synced {report.rows} rows {self.source_table} -> {self.target_table} "
+                 f"in {report.seconds:.2f}s, watermark {report.watermark}")
+        return report
+
+
+# Example usage:
+if __name__ == "__main__":
+    import random
+
+    class Trade(_Base):
+        """Trade rows as stored in source.db"""
+        table_name: str = "trade"
+        columns = ("id INTEGER PRIMARY KEY", "date", "activity", "symbol", "quantity", "price")
+
+    try:
+        m = Trade()
+        m._auto_drop_source_table(m)
+        m._auto_create_source_table(m)
+        with get_db_source() as conn:
+            conn.executemany(
+                f"INSERT INTO {m.table_s} (date, activity, symbol, quantity, price) VALUES (?, ?, ?, ?, ?)",
+                ((f"2024-01-{i % 28 + 1:02d}", random.choice(("BUY", "SELL")),
+                  random.choice(("IBM", "META", "MSFT")), random.randint(1, 1000),
+                  round(random.uniform(10, 1000), 2)) for i in range(100_000)))
+        print("Source table loaded")
+
+        m._exec_target_query(f"DROP TABLE IF EXISTS {m.table_t}")
+        m._exec_target_query(m._generate_ddl_create(m.table_t, m.columns))
+
+        report = SyncEngine(m, chunk_size=5_000).run()
+        print(f"Sync report: {report} ({report.rows_per_sec:,.0f} rows/sec)")
+
+        # Incremental sync tracks updated_at, so use a model that has it
+        class StampedTrade(Trade):
+            table_name: str = "stamped_trade"
+            columns = (*Trade.columns, "updated_at")
+
+        s = StampedTrade()
+        s._auto_drop_source_table(s)
+        s._auto_create_source_table(s)
+        s._exec_target_query(f"DROP TABLE IF EXISTS {s.table_t}")
+        s._exec_target_query(s._generate_ddl_create(s.table_t, s.columns))
+        engine = SyncEngine(s, chunk_size=5_000)
+        engine.reset_watermark()
+        insert = (f"INSERT INTO {s.table_s} (date, activity, symbol, quantity, price, updated_at) "
+                  "VALUES ('2024-01-19', 'BUY', 'IBM', ?, 124.79, ?)")
+        with get_db_source() as conn:
+            conn.executemany(insert, ((i, datetime.now(timezone.utc).isoformat()) for i in range(10_000)))
+        print(f"First run: {engine.run_incremental()}")
+
+        with get_db_source() as conn:
+            conn.execute(f"UPDATE {s.table_s} SET price = 130.0, updated_at = ? WHERE id <= 10",
+                         (datetime.now(timezone.utc).isoformat(),))
+            conn.execute(insert, (1, datetime.now(timezone.utc).isoformat()))
+        print(f"Delta run: {engine.run_incremental()}")
+        print(f"No-change run: {engine.run_incremental()}")
+
+    except (DatabaseError, TableError) as e:
+        log.error(f"Database operation failed: {e}")
+    except Exception as e:
+        log.error(f"Unexpected error: {e}")
@@ -0,0 +1,73 @@
+# file: my_n8n/model/validation.py :: 0.0.2
+# batch validation of raw records against a model with a cached TypeAdapter
+from functools import lru_cache
+from typing import Optional, Tuple, List, Dict, Any, Sequence, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+
+class Reject(BaseModel):
+    """A record that failed validation, with its position in the input."""
+    index: int
+    record: Any
+    errors: List[Dict[str, Any]]
+
+
+class IngestReport(BaseModel):
+    """Outcome of a bulk ingest."""
+    table: str
+    received: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    rejects: List[Reject] = []
+    trusted: bool = False
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.received / self.seconds if self.seconds else 0.0
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """``TypeAdapter(List[model])``, built once per model class.
+
+    Building the adapter compiles the core validator, which costs far more
+    than validating a batch; caching it is what makes batches cheap.
+    """
+    return TypeAdapter(List[model])
+
+
+def validate_batch(model: Type[BaseModel], records: Sequence[Any], strict: Optional[bool] = None,
+                   offset: int = 0) -> Tuple[List[BaseModel], List[Reject]]:
+    """Validate a batch of records in one call, collecting failures instead of raising.
+
+    The whole batch goes through the list adapter. If any record fails, the
+    error locations identify the bad indices; those become rejects and the
+    remaining records are validated again in one more call.
+
+    Args:
+        model: Pydantic model class
+        records: Raw records (dicts or objects with attributes)
+        strict: Override the model's ``strict`` setting, e.g. False for text input
+        offset: Index of the first record in the overall input, for rejects
+
+    Returns:
+        Tuple of (valid model instances in input order, rejects)
+    """
+    adapter = list_adapter(model)
+    try:
+        return adapter.validate_python(records, strict=strict), []
+    except ValidationError as e:
+        errors: Dict[int, List[Dict[str, Any]]] = {}
+        for error in e.errors(include_url=False):
+            loc = error["loc"]
+            if loc and isinstance(loc[0], int):
+                errors.setdefault(loc[0], []).append(
+                    {"loc": list(loc[1:]), "msg": error["msg"], "type": error["type"]})
+        if not errors:
+            # the input itself is not a list; nothing is row-specific
+            raise
+    rejects = [Reject(index=offset + i, record=records[i], errors=errs) for i, errs in sorted(errors.items())]
+    good = [record for i, record in enumerate(records) if i not in errors]
+    return (adapter.validate_python(good, strict=strict) if good else []), rejects
@@ -0,0 +1,264 @@
+# file: my_n8n/model/writebehind.py :: 0.0.3
+# write-behind queue: one writer thread, group commits, futures per write
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent))
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Dict, Any, List, Tuple, Type
+
+from loguru import logger as log
+
+from .base import Base
+from connection.db_my_n8n import transaction
+
+
+class QueueFullError(RuntimeError):
+    """Raised when a write cannot be queued within the timeout"""
+    pass
+
+
+_STOP = object()
+
+
+class WriteBehind:
+    """Coalesce ``create``/``update``/``delete`` calls from many threads into group commits.
+
+    Writes are queued and applied by a single writer thread, so callers no
+    longer compete for SQLite's write lock and every batch pays for one
+    commit instead of one per row. A batch is flushed when it reaches
+    ``max_batch`` writes or ``max_delay`` seconds after its first write,
+    whichever comes first. Each write runs in its own savepoint inside the
+    batch transaction, so a failing row only fails its own future.
+
+    The queue holds at most ``max_queue`` writes; when full, callers block
+    (backpressure) for up to ``put_timeout`` seconds, then get
+    :class:`QueueFullError`.
+
+    Writes return ``concurrent.futures.Future`` objects that resolve after
+    the batch commits; async code can ``await asyncio.wrap_future(f)``::
+
+        with WriteBehind(Trade) as writer:
+            futures = [writer.create(row) for row in rows]
+            ids = [f.result()["id"] for f in futures]
+
+    :meth:`close` (or leaving the ``with`` block) is required: it is what
+    flushes the queued writes. As a safety net every open writer is also
+    closed from an ``atexit`` hook, so writes accepted before a normal
+    interpreter exit are not lost with the daemon writer thread; a killed
+    process still loses whatever was queued.
+
+    Attributes:
+        model: Base subclass the writes go to
+        max_batch: Writes per group commit
+        max_delay: Seconds the first write of a batch may wait
+        max_queue: Queue capacity before callers block
+        put_timeout: Seconds a caller may block on a full queue, None to wait forever
+    """
+
+    def __init__(self, model: Type[Base], max_batch: int = 1_000, max_delay: float = 0.02,
+                 max_queue: int = 10_000, put_timeout: Optional[float] = 30.0):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        self.model = model
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.put_timeout = put_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        # guards _closed and _putting, so no write can be queued behind _STOP
+        self._state = threading.Condition()
+        self._closed = False
+        self._putting = 0
+        self._stats = {"writes": 0, "failed": 0, "batches": 0, "largest_batch": 0,
+                       "commit_ms_total": 0.0, "blocked": 0}
+        sql = model._sql()
+        self._table, self._columns = sql.table, model.columns
+        self._thread = threading.Thread(target=self._run, name=f"write-behind-{sql.table}", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------ submit
+    def _submit(self, op: str, *args: Any) -> Future:
+        with self._state:
+            if self._closed:
+                raise RuntimeError("WriteBehind is closed")
+            self._putting += 1
+        future: Future = Future()
+        item = (op, args, future)
+        try:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                with self._lock:
+                    self._stats["blocked"] += 1
+                try:
+                    self._queue.put(item, timeout=self.put_timeout)
+                except queue.Full:
+                    raise QueueFullError(f"Write queue for {self._table} full ({self.max_queue})") from None
+        finally:
+            with self._state:
+                self._putting -= 1
+                self._state.notify_all()
+        return future
+
+    def create(self, data: Dict[str, Any]) -> Future:
+        """Queue an insert; the future resolves with the created record."""
+        return self._submit("create", data)
+
+    def update(self, id: int, data: Dict[str, Any]) -> Future:
+        """Queue an update; the future resolves with the updated record."""
+        return self._submit("update", id, data)
+
+    def delete(self, id: int) -> Future:
+        """Queue a delete; the future resolves with True."""
+        return self._submit("delete", id)
+
+    # ------------------------------------------------------------------ writer
+    def _next_batch(self) -> Tuple[List[Any], bool]:
+        """Block for the first write, then gather until full or the window closes."""
+        first = self._queue.get()
+        if first is _STOP:
+            return [], True
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _apply(self, op: str, args: Tuple[Any, ...]) -> Any:
+        if op == "create":
+            return self.model.create(self._table, self._columns, args[0])
+        if op == "update":
+            return self.model.update(*args)
+        return self.model.delete(*args)
+
+    def _flush(self, batch: List[Any]) -> None:
+        start = time.perf_counter()
+        results: List[Tuple[Future, bool, Any]] = []
+        try:
+            with transaction('app'):
+                for op, args, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with transaction('app'):
+                            results.append((future, True, self._apply(op, args)))
+                    except Exception as e:
+                        results.append((future, False, e))
+        except Exception as e:
+            log.error(f"Group commit of {len(batch)} writes to {self._table} failed: {e}")
+            for _, _, future in batch:
+                # writes not reached before the failure are still pending
+                if future.running() or (not future.done() and future.set_running_or_notify_cancel()):
+                    future.set_exception(e)
+            with self._lock:
+                self._stats["failed"] += len(batch)
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        failed = 0
+        for future, ok, value in results:
+            if ok:
+                future.set_result(value)
+            else:
+                failed += 1
+                future.set_exception(value)
+        with self._lock:
+            self._stats["writes"] += len(results) - failed
+            self._stats["failed"] += failed
+            self._stats["batches"] += 1
+            self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+            self._stats["commit_ms_total"] += elapsed
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._flush(batch)
+            if stop:
+                return
+
+    # --------------------------------------------------------------- lifecycle
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting writes, flush everything queued and stop the writer thread.
+
+        Writes already being queued (possibly blocked on a full queue) are
+        let in first, so every accepted write is flushed before ``_STOP``.
+        """
+        with self._state:
+            if self._closed:
+                return
+            self._closed = True
+            self._state.wait_for(lambda: self._putting == 0)
+        atexit.unregister(self.close)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        """Writes, batches, average batch size and commit time, queue depth."""
+        with self._lock:
+            s = dict(self._stats)
+        total = s.pop("commit_ms_total")
+        return {
+            **s,
+            "queued": self._queue.qsize(),
+            "avg_batch": (s["writes"] + s["failed"]) / s["batches"] if s["batches"] else 0.0,
+            "avg_commit_ms": total / s["batches"] if s["batches"] else 0.0,
+        }
+
+    def __enter__(self) -> "WriteBehind":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+# Example usage:
+if __name__ == "__main__":
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timezone
+
+    m = Base()
+    m._auto_create_app_table(m)
+    threads, per_thread = 16, 250
+
+    def direct(_):
+        now = datetime.now(timezone.utc)
+        return [Base.create(m.table_name, m.columns, {"is_active": True, "created_at": now, "updated_at": now})
+                for _ in range(per_thread)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(direct, range(threads)))
+    direct_s = time.perf_counter() - start
+    print(f"Direct creates: {threads * per_thread} in {direct_s:.2f}s")
+
+    with WriteBehind(Base, max_batch=1_000, max_delay=0.02) as writer:
+        def queued(_):
+            now = datetime.now(timezone.utc)
+            futures = [writer.create({"is_active": True, "created_at": now, "updated_at": now})
+                       for _ in range(per_thread)]
+            return [f.result()["id"] for f in futures]
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            ids = [id for chunk in pool.map(queued, range(threads)) for id in chunk]
+        queued_s = time.perf_counter() - start
+        print(f"Write-behind creates: {len(ids)} in {queued_s:.2f}s ({direct_s / queued_s:.1f}x)")
+
+        bad = writer.update(ids[0], {"no_such_column": 1})
+        good = writer.update(ids[1], {"is_active": False})
+        print(f"Failed write isolated: {type(bad.exception()).__name__}, other write: {good.result()['is_active']}")
+        print(f"Stats: {writer.stats()}")